@@ -0,0 +1,106 @@
+# backend/app/card_cache.py
+"""
+Two-tier cache for /ai/chat replies (mostly "explain word X" cards).
+
+Key: sha256 over (model, sha256(system prompt), normalized prompt), so a
+prompt or model change starts a fresh keyspace on its own. Normalizing is
+NFKC, whitespace collapsed, casefolded.
+
+  tier 1  per-process LRU (cache.TTLCache), AI_CARD_LRU_SIZE / AI_CARD_LRU_TTL
+  tier 2  Mongo ``ai_cards``: {_id: key, reply, model, ..., expiresAt};
+          a TTL index on expiresAt drops entries after AI_CARD_TTL seconds
+
+A tier-2 hit refills tier 1. Mongo errors count as misses; the cache never
+fails a chat. Prompts longer than AI_CARD_MAX_PROMPT are not cached since
+free-form conversation rarely repeats.
+"""
+import asyncio
+import hashlib
+import os
+import re
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from .cache import TTLCache
+
+CARD_COLL = "ai_cards"
+CARD_TTL = int(os.getenv("AI_CARD_TTL", str(30 * 86400)))
+MAX_PROMPT = int(os.getenv("AI_CARD_MAX_PROMPT", "500"))
+
+_lru = TTLCache(
+    maxsize=int(os.getenv("AI_CARD_LRU_SIZE", "2000")),
+    ttl=float(os.getenv("AI_CARD_LRU_TTL", "3600")),
+)
+_counts = {"dbHits": 0, "misses": 0, "bypass": 0, "stores": 0, "skipped": 0, "errors": 0}
+
+def normalize(prompt: str) -> str:
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", prompt)).strip().casefold()
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def card_key(prompt: str, model: str, system_prompt: str) -> Optional[str]:
+    """Cache key, or None if this prompt shouldn't be cached."""
+    norm = normalize(prompt)
+    if not norm or len(norm) > MAX_PROMPT:
+        _counts["skipped"] += 1
+        return None
+    return _sha("\x00".join((model, _sha(system_prompt), norm)))
+
+async def _run(adb, db, method: str, *args, **kwargs):
+    # async driver when the app has one, otherwise the sync one off the loop
+    if adb is not None:
+        return await getattr(adb[CARD_COLL], method)(*args, **kwargs)
+    return await asyncio.to_thread(getattr(db[CARD_COLL], method), *args, **kwargs)
+
+async def get(key: str, db, adb=None) -> Optional[str]:
+    reply = _lru.get(key)
+    if reply is not None:
+        return reply
+    try:
+        # the TTL monitor runs about once a minute, so filter on expiry too
+        doc = await _run(adb, db, "find_one",
+                         {"_id": key, "expiresAt": {"$gt": datetime.now(timezone.utc)}},
+                         {"reply": 1})
+    except Exception:
+        _counts["errors"] += 1
+        doc = None
+    if not doc:
+        _counts["misses"] += 1
+        return None
+    _counts["dbHits"] += 1
+    _lru.set(key, doc["reply"])
+    return doc["reply"]
+
+async def put(key: str, reply: str, db, adb=None, **meta: Any) -> None:
+    if not reply:
+        return
+    _lru.set(key, reply)
+    now = datetime.now(timezone.utc)
+    try:
+        await _run(adb, db, "update_one", {"_id": key}, {"$set": {
+            "reply": reply, **meta, "createdAt": now,
+            "expiresAt": now + timedelta(seconds=CARD_TTL),
+        }}, upsert=True)
+        _counts["stores"] += 1
+    except Exception:
+        _counts["errors"] += 1
+
+def note_bypass() -> None:
+    _counts["bypass"] += 1
+
+def clear() -> None:
+    """Drop tier 1 only (e.g. after editing SYSTEM_PROMPT in a dev reload)."""
+    _lru.clear()
+
+def stats() -> Dict[str, Any]:
+    lru = _lru.stats()
+    lookups = lru["hits"] + lru["misses"]
+    hits = lru["hits"] + _counts["dbHits"]
+    return {
+        "memory": lru,
+        **_counts,
+        "hitRate": round(hits / lookups, 4) if lookups else 0.0,
+        "ttl": CARD_TTL,
+    }
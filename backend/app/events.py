@@ -0,0 +1,237 @@
+# backend/app/events.py
+"""
+Canonical analytics event schema and the write-behind buffer.
+
+Every writer stores the same shape::
+
+    {"sessionId": str, "kind": str, "payload": dict,
+     "ts": datetime (UTC), "createdAt": datetime (UTC)}
+
+``kind`` values posted by the frontend are the analytics kinds
+(dictionary_search, quiz_completed, ...). Events the API records itself use
+their own kinds (word_lookup, word_suggest, idiom_of_week_viewed) so they
+never double-count what the client already reports.
+
+Request handlers call ``emit(db, doc)`` instead of ``db.events.insert_one``;
+a background thread drains the buffer with ``insert_many`` every
+``EVENT_FLUSH_SEC`` seconds or as soon as ``EVENT_BATCH_SIZE`` events are
+waiting. Memory is bounded by ``EVENT_BUFFER_MAX``: when full, new events are
+dropped and counted. ``stop()`` flushes what is left on shutdown.
+
+``on_write(fn)`` registers ``fn(db, docs)`` to run after each write (batched
+or write-through) so derived counters can be maintained incrementally. On a
+partial bulk insert ``docs`` is the stored part; batches whose outcome is
+unknown are counted in ``hookSkipped`` (rebuild the counters if it grows).
+"""
+import os
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from pymongo.errors import BulkWriteError
+
+# server-written legacy {type, at, meta} events -> canonical kind
+LEGACY_TYPE_TO_KIND = {
+    "word_searched": "word_lookup",
+    "word_suggest": "word_suggest",
+    "idiom_of_week_viewed": "idiom_of_week_viewed",
+}
+# kinds recorded by the API itself; user-facing stats only count client events
+SERVER_KINDS = frozenset(LEGACY_TYPE_TO_KIND.values())
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+def parse_ts(v: Any, default: Optional[datetime] = None) -> datetime:
+    """datetime or ISO-8601 string -> aware UTC datetime (naive values are taken as UTC)."""
+    t: Optional[datetime] = None
+    if isinstance(v, datetime):
+        t = v
+    elif isinstance(v, str) and v.strip():
+        try:
+            t = datetime.fromisoformat(v.strip().replace("Z", "+00:00"))
+        except ValueError:
+            t = None
+    if t is None:
+        return default or utcnow()
+    return t.replace(tzinfo=timezone.utc) if t.tzinfo is None else t.astimezone(timezone.utc)
+
+def make_event(session_id: str, kind: str, payload: Optional[Dict[str, Any]] = None,
+               ts: Any = None) -> Dict[str, Any]:
+    now = utcnow()
+    return {
+        "sessionId": session_id,
+        "kind": kind,
+        "payload": payload or {},
+        "ts": parse_ts(ts, now) if ts is not None else now,
+        "createdAt": now,
+    }
+
+class EventBuffer:
+    def __init__(self, max_size: int = 10000, batch_size: int = 500, flush_interval: float = 1.0,
+                 collection: str = "events"):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.collection = collection
+        self._buf: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._get_db: Callable[[], Any] = lambda: None
+        self._hooks: List[Callable[[Any, List[Dict[str, Any]]], Any]] = []
+        # counters
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+        self.hook_errors = 0
+        self.hook_skipped = 0  # batches whose hooks didn't run: write failed outright
+
+    def on_write(self, fn: Callable[[Any, List[Dict[str, Any]]], Any]):
+        """Run ``fn(db, docs)`` after events are written (also usable as a decorator)."""
+        self._hooks.append(fn)
+        return fn
+
+    def _run_hooks(self, db, docs: List[Dict[str, Any]]) -> None:
+        # the events are stored already; a failing hook must not lose them
+        for fn in self._hooks:
+            try:
+                fn(db, docs)
+            except Exception:
+                self.hook_errors += 1
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, get_db: Callable[[], Any]) -> None:
+        if self.running:
+            return
+        self._get_db = get_db
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="event-writer", daemon=True)
+        self._thread.start()
+
+    def emit(self, db, doc: Dict[str, Any]) -> bool:
+        """Queue ``doc``; returns False if it was dropped because the buffer is full."""
+        if not self.running:
+            # no writer thread (scripts, tests): write through
+            db[self.collection].insert_one(doc)
+            self._run_hooks(db, [doc])
+            return True
+        with self._lock:
+            if len(self._buf) >= self.max_size:
+                self.dropped += 1
+                return False
+            self._buf.append(doc)
+            self.enqueued += 1
+            size = len(self._buf)
+        if size >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def emit_many(self, db, docs: List[Dict[str, Any]]) -> int:
+        """Queue ``docs`` together; returns how many were accepted."""
+        if not docs:
+            return 0
+        if not self.running:
+            # write through: one insert_many, hooks once on what was stored
+            try:
+                db[self.collection].insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                bad = {err.get("index") for err in e.details.get("writeErrors", [])}
+                saved = [d for i, d in enumerate(docs) if i not in bad]
+                if saved:
+                    self._run_hooks(db, saved)
+                raise
+            self._run_hooks(db, docs)
+            return len(docs)
+        with self._lock:
+            room = max(0, self.max_size - len(self._buf))
+            self._buf.extend(docs[:room])
+            self.enqueued += min(room, len(docs))
+            self.dropped += max(0, len(docs) - room)
+            size = len(self._buf)
+        if size >= self.batch_size:
+            self._wake.set()
+        return min(room, len(docs))
+
+    def flush(self) -> int:
+        """Write everything currently buffered, in batches. Returns docs written."""
+        total = 0
+        while True:
+            with self._lock:
+                if not self._buf:
+                    return total
+                n = min(self.batch_size, len(self._buf))
+                batch = [self._buf.popleft() for _ in range(n)]
+            total += self._write(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> int:
+        db = self._get_db()
+        if db is None:
+            self.failed += len(batch)
+            return 0
+        saved = batch
+        try:
+            db[self.collection].insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            # unordered: everything not listed in writeErrors was stored
+            bad = {err.get("index") for err in e.details.get("writeErrors", [])}
+            saved = [d for i, d in enumerate(batch) if i not in bad]
+            self.failed += len(batch) - len(saved)
+        except Exception:
+            # nothing known to be stored; derived counters may lag if some was
+            saved = []
+            self.failed += len(batch)
+            self.hook_skipped += 1
+        n = len(saved)
+        if saved:
+            self._run_hooks(db, saved)
+        self.written += n
+        self.flushes += 1
+        return n
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "buffered": len(self._buf),
+            "maxSize": self.max_size,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "flushes": self.flushes,
+            "hookErrors": self.hook_errors,
+            "hookSkipped": self.hook_skipped,
+        }
+
+event_buffer = EventBuffer(
+    max_size=int(os.getenv("EVENT_BUFFER_MAX", "10000")),
+    batch_size=int(os.getenv("EVENT_BATCH_SIZE", "500")),
+    flush_interval=float(os.getenv("EVENT_FLUSH_SEC", "1.0")),
+)
+
+def emit(db, doc: Dict[str, Any]) -> bool:
+    return event_buffer.emit(db, doc)
+
+def emit_many(db, docs: List[Dict[str, Any]]) -> int:
+    return event_buffer.emit_many(db, docs)
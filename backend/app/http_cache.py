@@ -0,0 +1,79 @@
+# backend/app/http_cache.py
+"""
+Response caching for read-mostly endpoints.
+
+Serialized bodies are kept in a per-worker TTL cache keyed by the endpoint,
+its parameters and a content version (dictionary import version, day, ISO
+week, ...). Each body gets a strong ETag (hash of the bytes, so every worker
+computes the same tag), ``If-None-Match`` is answered with 304, and
+``Cache-Control`` lets browsers and the CDN absorb repeat traffic.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, time as dtime, timedelta
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from .cache import TTLCache
+
+_store = TTLCache(maxsize=int(os.getenv("HTTP_CACHE_SIZE", "4096")), ttl=300.0)
+
+Entry = Tuple[bytes, str]  # (body, etag)
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+def _dumps(payload: Any) -> bytes:
+    # same encoding FastAPI's JSONResponse uses
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+def not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+def get(key: Hashable) -> Optional[Entry]:
+    return _store.get(key)
+
+def put(key: Hashable, payload: Any, ttl: float) -> Entry:
+    body = _dumps(payload)
+    entry = (body, etag_for(body))
+    if ttl > 0:
+        _store.set(key, entry, ttl=ttl)
+    return entry
+
+def respond(request: Request, entry: Entry, max_age: int) -> Response:
+    body, etag = entry
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max(0, int(max_age))}"}
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def cached_json(request: Request, key: Hashable, build: Callable[[], Any],
+                max_age: int, ttl: Optional[float] = None) -> Response:
+    """Serve ``build()`` through the cache; exceptions (e.g. 404s) are not cached."""
+    entry = get(key)
+    if entry is None:
+        entry = put(key, build(), ttl if ttl is not None else max_age)
+    return respond(request, entry, max_age)
+
+def stats():
+    return _store.stats()
+
+# ---------- expiry helpers
+def seconds_until_midnight(now: Optional[datetime] = None) -> int:
+    now = now or datetime.now()
+    nxt = datetime.combine(now.date() + timedelta(days=1), dtime.min)
+    return max(1, int((nxt - now).total_seconds()))
+
+def seconds_until_week_rollover(now: Optional[datetime] = None) -> int:
+    """Seconds until next Monday 00:00 (ISO weeks start on Monday)."""
+    now = now or datetime.now()
+    monday = now.date() + timedelta(days=7 - now.weekday())
+    return max(1, int((datetime.combine(monday, dtime.min) - now).total_seconds()))
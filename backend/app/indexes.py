@@ -0,0 +1,196 @@
+# backend/app/indexes.py
+"""
+Every index the API relies on, declared in one place.
+
+``INDEXES`` maps collection -> index specs (``{"keys": [...], **create_index
+options}``). Collections read only by ``_id`` are listed with no specs so
+they show up in reports. ``HOT_QUERIES`` are the serving query shapes; the
+explain check (scripts/manage_indexes.py --explain) asserts each one is
+answered from an index rather than a collection scan.
+
+Startup only verifies (see ``missing_indexes``); building is done by
+scripts/manage_indexes.py --apply, or at startup with DB_ENSURE_INDEXES=1.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .card_cache import CARD_COLL
+from .events import SERVER_KINDS
+from .loaders import dictionary as dict_loader
+from .recent_searches import RECENT_COLL
+from .retention import EVENT_ARCHIVE_GRACE_SEC
+from .rollups import ROLLUP_COLL
+from .term_stats import TERM_STATS_COLL
+
+INDEXES: Dict[str, List[Dict[str, Any]]] = {
+    "events": [
+        {"keys": [("sessionId", 1), ("ts", 1)]},               # summary, rollup rebuild
+        {"keys": [("sessionId", 1), ("kind", 1), ("ts", 1)]},  # one kind for a session
+        {"keys": [("ts", 1)]},                                  # retention sweep
+        # TTL: only events the archiver has exported carry archivedAt
+        {"keys": [("archivedAt", 1)], "expireAfterSeconds": EVENT_ARCHIVE_GRACE_SEC},
+    ],
+    ROLLUP_COLL: [{"keys": [("sessionId", 1), ("day", 1)], "unique": True}],
+    TERM_STATS_COLL: [
+        {"keys": [("term", 1), ("dir", 1)], "unique": True},
+        {"keys": [("dir", 1), ("lookups", -1)]},
+        {"keys": [("dir", 1), ("misses", -1)]},
+    ],
+    "wod_history": [{"keys": [("date", 1)], "unique": True}],
+    "wod_words": [{"keys": [("word", 1)]}],
+    "grammar_topics": [{"keys": [("order", 1), ("slug", 1)]}],
+    "grammar_questions": [{"keys": [("topic", 1)]}],
+    "grammar_tips": [{"keys": [("topic", 1)]}],
+    "conversations": [{"keys": [("sessionId", 1)], "unique": True}],
+    "ai_cache": [{"keys": [("term", 1), ("dir", 1), ("kind", 1)], "unique": True}],
+    CARD_COLL: [{"keys": [("expiresAt", 1)], "expireAfterSeconds": 0}],  # TTL
+    "tests": [{"keys": [("kind", 1)], "unique": True}],
+    "vocab_tests_mcq": [{"keys": [("level", 1)]}],
+    "vocab_tests_fill": [{"keys": [("level", 1)]}],
+    dict_loader.DICT_COLL: dict_loader.INDEXES,
+    # _id lookups only
+    RECENT_COLL: [],
+    "meta": [],
+    "idiom_entries": [],
+    "idiom_explanations": [],
+}
+
+# (collection, filter, sort) for each query on a request path
+HOT_QUERIES: List[Tuple[str, Dict[str, Any], Optional[List[Tuple[str, int]]]]] = [
+    ("events", {"sessionId": "probe", "ts": {"$gte": datetime.now(timezone.utc)}, "kind": {"$nin": list(SERVER_KINDS)}}, None),
+    ("events", {"sessionId": "probe", "kind": "word_lookup"}, [("ts", -1)]),
+    ("events", {"ts": {"$lt": datetime.now(timezone.utc)}, "archivedAt": {"$exists": False}}, [("ts", 1)]),
+    (ROLLUP_COLL, {"sessionId": "probe", "day": {"$gte": "2000-01-01"}}, None),
+    (TERM_STATS_COLL, {"dir": "en-so", "lookups": {"$gt": 0}}, [("lookups", -1)]),
+    (TERM_STATS_COLL, {"dir": "en-so", "misses": {"$gt": 0}}, [("misses", -1)]),
+    ("wod_history", {"date": "2000-01-01"}, None),
+    ("wod_words", {"word": "probe"}, None),
+    ("grammar_questions", {"topic": "probe"}, None),
+    ("grammar_tips", {"topic": "probe"}, None),
+    ("conversations", {"sessionId": "probe"}, None),
+    ("ai_cache", {"term": "probe", "dir": "en-so", "kind": "backfill"}, None),
+    ("tests", {"kind": "probe"}, None),
+    ("vocab_tests_mcq", {"level": "A1"}, None),
+    ("vocab_tests_fill", {"level": "A1"}, None),
+    *((dict_loader.DICT_COLL, {f: "probe"}, None) for f in dict_loader.KEY_FIELD.values()),
+    *((dict_loader.DICT_COLL, {f: dict_loader.prefix_range("pro")}, [(f, 1)])
+      for f in dict_loader.KEY_FIELD.values()),
+    (dict_loader.DICT_COLL, {"$text": {"$search": "probe"}}, None),
+    (RECENT_COLL, {"_id": "probe"}, None),
+    (CARD_COLL, {"_id": "probe"}, None),
+    ("idiom_explanations", {"_id": "probe"}, None),
+    ("meta", {"_id": "dictionary"}, None),
+]
+
+def _key(keys: Iterable) -> Tuple:
+    """Comparable key pattern; text indexes all look alike to the server."""
+    if keys == ("$text",):
+        return keys  # already normalized (index_report formats _key output)
+    keys = list(keys)
+    if any(v == "text" for _, v in keys) or any(k == "_fts" for k, _ in keys):
+        return ("$text",)
+    return tuple((k, int(v) if isinstance(v, (int, float)) else v) for k, v in keys)
+
+def _fmt(keys: Iterable) -> str:
+    k = _key(keys)
+    return "text" if k == ("$text",) else ", ".join(f"{f}:{d}" for f, d in k)
+
+def ensure_indexes(db, collections: Optional[Iterable[str]] = None) -> List[str]:
+    """Create every declared index. Returns "coll (keys): error" for failures."""
+    errors = []
+    for name in collections or INDEXES:
+        for spec in INDEXES.get(name, []):
+            opts = dict(spec)
+            keys = opts.pop("keys")
+            try:
+                db[name].create_index(keys, **opts)
+            except Exception as e:
+                errors.append(f"{name} ({_fmt(keys)}): {e}")
+    return errors
+
+def duplicate_groups(db, name: str, keys: Iterable) -> List[Dict[str, Any]]:
+    """Groups of docs sharing a value of unique ``keys``: [{_id: key values, ids: [...] newest first}]."""
+    fields = [k for k, _ in keys]
+    return list(db[name].aggregate([
+        {"$sort": {"_id": -1}},
+        {"$group": {"_id": {f.replace(".", "_"): f"${f}" for f in fields},
+                    "ids": {"$push": "$_id"}, "n": {"$sum": 1}}},
+        {"$match": {"n": {"$gt": 1}}},
+    ], allowDiskUse=True))
+
+def dedupe(db, name: str, keys: Iterable) -> int:
+    """Keep the newest doc (highest _id) per value of unique ``keys``; returns docs deleted."""
+    removed = 0
+    for g in duplicate_groups(db, name, keys):
+        removed += db[name].delete_many({"_id": {"$in": g["ids"][1:]}}).deleted_count
+    return removed
+
+def index_report(db) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Per collection: ``missing`` (declared, not built), ``mismatched`` (built
+    with different uniqueness), ``extra`` (built, not declared) and ``idle``
+    (no $indexStats accesses since the server started). The dictionary also
+    gets ``unkeyed``: documents the key_* indexes can't find yet. A missing
+    unique index gets ``duplicates`` when existing docs would make it fail.
+    """
+    report: Dict[str, Dict[str, List[str]]] = {}
+    for name, specs in INDEXES.items():
+        info = db[name].index_information()
+        have = {_key(v["key"]): (n, bool(v.get("unique"))) for n, v in info.items() if n != "_id_"}
+        want = {_key(s["keys"]): bool(s.get("unique")) for s in specs}
+        try:
+            ops = {s["name"]: s["accesses"]["ops"] for s in db[name].aggregate([{"$indexStats": {}}])}
+        except Exception:
+            ops = {}
+        report[name] = {
+            "missing": [_fmt(k) for k in want if k not in have],
+            "mismatched": [_fmt(k) for k, u in want.items() if k in have and have[k][1] != u],
+            "extra": [n for k, (n, _) in have.items() if k not in want],
+            "idle": [n for n, c in ops.items() if n != "_id_" and c == 0],
+            "duplicates": [],
+        }
+        for s in specs:
+            if s.get("unique") and _key(s["keys"]) not in have:
+                groups = duplicate_groups(db, name, s["keys"])
+                if groups:
+                    report[name]["duplicates"].append(
+                        f"{_fmt(s['keys'])}: {len(groups)} values repeated; run manage_indexes.py --dedupe")
+    n = dict_loader.unkeyed_count(db[dict_loader.DICT_COLL])
+    report[dict_loader.DICT_COLL]["unkeyed"] = (
+        [f"{n} docs without {'/'.join(dict_loader.KEY_FIELD.values())}; run import_dictionary.py --reindex"]
+        if n else [])
+    return report
+
+def missing_indexes(db) -> List[str]:
+    """Cheap startup check: "coll (keys)" for each declared index not built."""
+    out = []
+    for name, specs in INDEXES.items():
+        if not specs:
+            continue
+        have = {_key(v["key"]) for v in db[name].index_information().values()}
+        out += [f"{name} ({_fmt(s['keys'])})" for s in specs if _key(s["keys"]) not in have]
+    return out
+
+def _stages(plan: Any) -> List[str]:
+    if isinstance(plan, dict):
+        out = [plan["stage"]] if isinstance(plan.get("stage"), str) else []
+        for v in plan.values():
+            out += _stages(v)
+        return out
+    if isinstance(plan, list):
+        return [s for p in plan for s in _stages(p)]
+    return []
+
+def explain_hot_queries(db) -> List[Tuple[str, Dict[str, Any], bool, List[str]]]:
+    """(collection, filter, uses_index, winning plan stages) per HOT_QUERIES entry."""
+    out = []
+    for name, flt, sort in HOT_QUERIES:
+        cur = db[name].find(flt)
+        if sort:
+            cur = cur.sort(sort)
+        plan = cur.explain().get("queryPlanner", {}).get("winningPlan", {})
+        stages = _stages(plan)
+        indexed = "COLLSCAN" not in stages and any(
+            "IXSCAN" in s or s in ("IDHACK", "TEXT", "TEXT_MATCH") for s in stages)
+        out.append((name, flt, indexed, stages))
+    return out
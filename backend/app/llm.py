@@ -0,0 +1,199 @@
+# backend/app/llm.py
+"""
+One process-wide OpenAI client for every AI call site.
+
+The client owns a single httpx connection pool (keep-alive, bounded size),
+so calls reuse warm TLS connections instead of building a client and
+handshaking per request. Retries on 408/409/429/5xx and connection errors
+are left to the SDK (``OPENAI_MAX_RETRIES``, exponential backoff).
+
+Each call site asks for ``client(endpoint)``, which shares the pool but
+applies that endpoint's timeouts (``OPENAI_TIMEOUT_<ENDPOINT>``; read timeout
+in seconds). Set ``OPENAI_BASE_URL`` to point everything at a local stub
+(scripts/openai_stub.py) for tests and benchmarks; no real key is needed then.
+
+API handlers use ``aclient(endpoint)`` (AsyncOpenAI on its own async pool)
+inside ``limit(upstream)``, a per-upstream semaphore, so a burst of AI
+traffic waits on the event loop instead of holding threadpool threads, and
+is capped (``OPENAI_MAX_CONCURRENCY``) without touching other endpoints.
+Callers that wait longer than ``OPENAI_QUEUE_TIMEOUT`` get ``UpstreamBusy``.
+Background AI jobs are started on the server loop with ``submit(coro)``.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from typing import Any, Coroutine, Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+POOL_SIZE = int(os.getenv("OPENAI_POOL_SIZE", "20"))
+KEEPALIVE = int(os.getenv("OPENAI_KEEPALIVE", "10"))
+KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "30"))
+
+# read timeouts per endpoint: chat answers are long, backfill runs off-request
+TIMEOUTS: Dict[str, float] = {
+    "default": float(os.getenv("OPENAI_TIMEOUT", "30")),
+    "chat": float(os.getenv("OPENAI_TIMEOUT_CHAT", "60")),
+    "backfill": float(os.getenv("OPENAI_TIMEOUT_BACKFILL", "45")),
+    "idioms": float(os.getenv("OPENAI_TIMEOUT_IDIOMS", "30")),
+}
+
+# concurrent provider calls per upstream; "openai:backfill" is the share
+# background dictionary enrichment may take of the "openai" budget
+LIMITS: Dict[str, int] = {
+    "openai": int(os.getenv("OPENAI_MAX_CONCURRENCY", "16")),
+    "openai:backfill": int(os.getenv("AI_BACKFILL_WORKERS", "4")),
+}
+QUEUE_TIMEOUT = float(os.getenv("OPENAI_QUEUE_TIMEOUT", "10"))
+
+class UpstreamBusy(RuntimeError):
+    """No provider slot freed up within QUEUE_TIMEOUT."""
+
+_lock = threading.Lock()
+_client: Optional[OpenAI] = None
+_config: Optional[tuple] = None
+_views: Dict[str, OpenAI] = {}
+_aclient: Optional[AsyncOpenAI] = None
+_aconfig: Optional[tuple] = None
+_aviews: Dict[str, AsyncOpenAI] = {}
+_sems: Dict[str, asyncio.Semaphore] = {}
+_sem_loops: Dict[str, asyncio.AbstractEventLoop] = {}
+_waiting: Dict[str, int] = {}
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def api_key() -> Optional[str]:
+    key = os.getenv("OPENAI_API_KEY")
+    if not key and os.getenv("OPENAI_BASE_URL"):
+        return "stub"  # local stub servers ignore the key
+    return key
+
+def timeout(endpoint: str) -> httpx.Timeout:
+    read = TIMEOUTS.get(endpoint, TIMEOUTS["default"])
+    return httpx.Timeout(read, connect=CONNECT_TIMEOUT)
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=KEEPALIVE,
+                        keepalive_expiry=KEEPALIVE_EXPIRY)
+
+def _build(key: str, base_url: Optional[str]) -> OpenAI:
+    http = httpx.Client(limits=_pool_limits(), timeout=timeout("default"))
+    return OpenAI(api_key=key, base_url=base_url, http_client=http,
+                  max_retries=MAX_RETRIES, timeout=timeout("default"))
+
+def client(endpoint: str = "default") -> OpenAI:
+    """Shared client with ``endpoint``'s timeouts. Raises RuntimeError without a key."""
+    global _client, _config
+    key, base_url = api_key(), os.getenv("OPENAI_BASE_URL") or None
+    if not key:
+        raise RuntimeError("Missing OPENAI_API_KEY")
+    cfg = (key, base_url)
+    view = _views.get(endpoint)
+    if view is not None and cfg == _config:
+        return view
+    with _lock:
+        if _client is None or cfg != _config:
+            # first use, or the key / base URL changed (e.g. a script switched to
+            # a stub); the old pool is left to in-flight calls and GC
+            _client, _config = _build(key, base_url), cfg
+            _views.clear()
+        view = _views.get(endpoint)
+        if view is None:
+            # with_options shares the parent's httpx pool
+            view = _views[endpoint] = _client.with_options(timeout=timeout(endpoint))
+        return view
+
+def aclient(endpoint: str = "default") -> AsyncOpenAI:
+    """Async counterpart of ``client``; call from a running event loop."""
+    global _aclient, _aconfig
+    key, base_url = api_key(), os.getenv("OPENAI_BASE_URL") or None
+    if not key:
+        raise RuntimeError("Missing OPENAI_API_KEY")
+    # async connections belong to one loop; a new loop (tests) gets a new pool
+    cfg = (key, base_url, asyncio.get_running_loop())
+    if _aclient is None or cfg != _aconfig:
+        http = httpx.AsyncClient(limits=_pool_limits(), timeout=timeout("default"))
+        _aclient = AsyncOpenAI(api_key=key, base_url=base_url, http_client=http,
+                               max_retries=MAX_RETRIES, timeout=timeout("default"))
+        _aconfig = cfg
+        _aviews.clear()
+    view = _aviews.get(endpoint)
+    if view is None:
+        view = _aviews[endpoint] = _aclient.with_options(timeout=timeout(endpoint))
+    return view
+
+async def acquire(upstream: str = "openai") -> None:
+    """Take a slot for ``upstream`` (raises UpstreamBusy); pair with ``release``."""
+    loop = asyncio.get_running_loop()
+    sem = _sems.get(upstream)
+    if sem is None or _sem_loops.get(upstream) is not loop:
+        sem = _sems[upstream] = asyncio.Semaphore(LIMITS.get(upstream, LIMITS["openai"]))
+        _sem_loops[upstream] = loop
+    _waiting[upstream] = _waiting.get(upstream, 0) + 1
+    try:
+        await asyncio.wait_for(sem.acquire(), QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise UpstreamBusy(f"{upstream}: no free slot after {QUEUE_TIMEOUT:g}s")
+    finally:
+        _waiting[upstream] -= 1
+
+def release(upstream: str = "openai") -> None:
+    _sems[upstream].release()
+
+@asynccontextmanager
+async def limit(upstream: str = "openai"):
+    await acquire(upstream)
+    try:
+        yield
+    finally:
+        release(upstream)
+
+def bind_loop(loop: asyncio.AbstractEventLoop) -> None:
+    global _loop
+    _loop = loop
+
+def submit(coro: Coroutine[Any, Any, Any]) -> Optional[Future]:
+    """Run ``coro`` on the server loop from any thread; None if no loop is bound."""
+    if _loop is None or _loop.is_closed():
+        coro.close()
+        return None
+    return asyncio.run_coroutine_threadsafe(coro, _loop)
+
+async def aclose() -> None:
+    global _aclient, _aconfig
+    if _aclient is not None:
+        await _aclient.close()
+    _aclient, _aconfig = None, None
+    _aviews.clear()
+
+def close() -> None:
+    global _client, _config
+    with _lock:
+        if _client is not None:
+            _client.close()
+        _client, _config = None, None
+        _views.clear()
+
+def _client_state(c, cfg: Optional[tuple], views: Dict[str, Any]) -> Dict[str, object]:
+    return {"initialized": c is not None, "baseUrl": cfg[1] if cfg else None, "endpoints": sorted(views)}
+
+def stats() -> Dict[str, object]:
+    return {
+        # API routes use the async client; the sync one serves scripts and the
+        # backfill thread-pool fallback
+        "async": _client_state(_aclient, _aconfig, _aviews),
+        "sync": _client_state(_client, _config, _views),
+        "poolSize": POOL_SIZE,
+        "keepalive": KEEPALIVE,
+        "maxRetries": MAX_RETRIES,
+        "timeouts": TIMEOUTS,
+        "limits": {
+            name: {"max": n, "inUse": n - _sems[name]._value if name in _sems else 0,
+                   "waiting": _waiting.get(name, 0)}
+            for name, n in LIMITS.items()
+        },
+    }
@@ -0,0 +1,297 @@
+# backend/app/loaders/dictionary.py
+"""
+Normalized lookup keys for the dictionary collection.
+
+Imported rows keep their headwords under whatever column name the sheet used
+(Headword, English, EN, Word_SO, ...). Ingest collapses those aliases into two
+canonical, indexed fields -- ``key_en`` and ``key_so`` -- holding the
+lowercased/trimmed values, so the API can match with equality and range-prefix
+predicates instead of case-insensitive regexes (which can't use an index).
+
+Ingest also writes a ``text`` subdocument (glosses, usage notes, examples)
+behind a weighted text index for reverse lookup (/dictionary/search).
+
+It also builds the in-process prefix and typo-tolerant indexes that answer
+/dictionary/suggest (and the fuzzy fallback in /dictionary/lookup).
+"""
+import os
+import re
+from bisect import bisect_left
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+# allow overriding the collection name (default "dictionary")
+DICT_COLL = os.getenv("DICT_COLLECTION", "dictionary")
+
+# meta doc bumped on every import so serving processes know to rebuild
+_META_ID = "dictionary"
+
+# candidate fields per direction (covers casing/aliases)
+FIELD_CANDS: Dict[str, List[str]] = {
+    "en-so": ["Headword", "English", "headword", "english", "EN", "Word_EN", "word_en"],
+    "so-en": ["Somali", "SO", "somali", "Word_SO", "word_so"],
+}
+
+# canonical key field per direction
+KEY_FIELD: Dict[str, str] = {"en-so": "key_en", "so-en": "key_so"}
+
+# fields written by scripts/backfill_dictionary.py --target entry; AI text is
+# shown and searchable but never becomes a lookup key or headword
+AI_FILLED = "aiFilled"
+
+_WS = re.compile(r"\s+")
+_MAX_CHAR = "\U0010ffff"
+
+def norm_key(v: Any) -> str:
+    """Canonical form of a headword: trimmed, single-spaced, lowercased."""
+    if v is None:
+        return ""
+    return _WS.sub(" ", str(v)).strip().lower()
+
+def prefix_range(prefix: str) -> Dict[str, str]:
+    """Index-friendly equivalent of ``^prefix`` on a normalized key field."""
+    return {"$gte": prefix, "$lt": prefix + _MAX_CHAR}
+
+def doc_keys(doc: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Normalized keys for every alias field present in ``doc``, per direction."""
+    out: Dict[str, List[str]] = {}
+    ai = set(doc.get(AI_FILLED) or ())
+    for direction, fields in FIELD_CANDS.items():
+        keys: List[str] = []
+        for f in fields:
+            k = "" if f in ai else norm_key(doc.get(f))
+            if k and k not in keys:
+                keys.append(k)
+        out[KEY_FIELD[direction]] = keys
+    return out
+
+# ---------- full-text (reverse lookup) fields
+# canonical text field -> source columns, compared lowercased without spaces/underscores
+TEXT_SOURCES: Dict[str, set] = {
+    "somali":   {"somali", "so", "wordso", "somalitranslation"},
+    "meaning":  {"meaning", "definition", "gloss"},
+    "usage":    {"usagenote", "usage"},
+    "examples": {"example", "examples", "examplesen", "examplesso"},
+}
+TEXT_WEIGHTS: Dict[str, int] = {"somali": 10, "meaning": 8, "usage": 3, "examples": 2}
+TEXT_INDEX = "dictionary_text"
+
+def _flat(v: Any) -> List[str]:
+    if isinstance(v, (list, tuple)):
+        return [str(x).strip() for x in v if x not in (None, "") and str(x).strip()]
+    if v in (None, ""):
+        return []
+    return [str(v).strip()]
+
+def doc_text(doc: Dict[str, Any]) -> Dict[str, str]:
+    """Concatenated gloss/example text per canonical field, for the text index."""
+    parts: Dict[str, List[str]] = {f: [] for f in TEXT_SOURCES}
+    for k, v in doc.items():
+        if not isinstance(k, str):
+            continue
+        nk = k.lower().replace(" ", "").replace("_", "")
+        for field, sources in TEXT_SOURCES.items():
+            if nk in sources:
+                parts[field].extend(_flat(v))
+    return {f: "\n".join(dict.fromkeys(p)) for f, p in parts.items() if p}
+
+def derived_fields(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Everything ingest computes from a raw row: lookup keys plus search text."""
+    out: Dict[str, Any] = dict(doc_keys(doc))
+    out["text"] = doc_text(doc)
+    return out
+
+# declared here so app/indexes.py and the import script apply the same set
+INDEXES: List[Dict[str, Any]] = [
+    *({"keys": [(field, 1)]} for field in KEY_FIELD.values()),
+    {
+        "keys": [(f"text.{f}", "text") for f in TEXT_WEIGHTS],
+        "weights": {f"text.{f}": w for f, w in TEXT_WEIGHTS.items()},
+        "default_language": "none",   # Somali + English; no English-only stemming
+        "name": TEXT_INDEX,
+    },
+]
+
+def ensure_indexes(coll) -> None:
+    for spec in INDEXES:
+        opts = dict(spec)
+        coll.create_index(opts.pop("keys"), **opts)
+
+def reindex(coll, batch_size: int = 1000) -> int:
+    """Backfill keys and search text on every document. Returns docs updated."""
+    ops: List[UpdateOne] = []
+    total = 0
+    for doc in coll.find({}, {"key_en": 0, "key_so": 0, "text": 0}):  # keeps AI_FILLED
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": derived_fields(doc)}))
+        if len(ops) >= batch_size:
+            total += coll.bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        total += coll.bulk_write(ops, ordered=False).modified_count
+    return total
+
+def unkeyed_count(coll) -> int:
+    """
+    Documents without the key fields (imported before keys existed). Exact
+    lookup only queries ``key_*``, so these stay invisible until
+    ``import_dictionary.py --reindex`` runs.
+    """
+    return coll.count_documents({"$or": [{f: {"$exists": False}} for f in KEY_FIELD.values()]})
+
+# ---------- content version (written by ingest, polled by the API)
+def dictionary_version(db) -> Optional[str]:
+    doc = db.meta.find_one({"_id": _META_ID}, {"version": 1})
+    return (doc or {}).get("version")
+
+def bump_version(db) -> str:
+    version = datetime.utcnow().isoformat()
+    db.meta.update_one({"_id": _META_ID}, {"$set": {"version": version}}, upsert=True)
+    return version
+
+# ---------- in-process prefix index
+class PrefixIndex:
+    """Sorted array of normalized headwords; prefix queries via bisect."""
+
+    def __init__(self, pairs: Iterable[Tuple[str, str]]):
+        display: Dict[str, str] = {}
+        for key, text in pairs:
+            if key:
+                display.setdefault(key, text)
+        self._keys: List[str] = sorted(display)
+        self._display: List[str] = [display[k] for k in self._keys]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def complete(self, prefix: str, limit: int) -> List[str]:
+        out: List[str] = []
+        i = bisect_left(self._keys, prefix)
+        while i < len(self._keys) and len(out) < limit and self._keys[i].startswith(prefix):
+            out.append(self._display[i])
+            i += 1
+        return out
+
+# ---------- typo-tolerant index (SymSpell-style deletes)
+_FUZZY_MAX_DIST = int(os.getenv("DICT_FUZZY_MAX_DIST", "2"))
+_FUZZY_PREFIX = 7   # only deletes of the first N chars are stored (bounds memory)
+_FUZZY_DROP = re.compile(r"['\u2019`\-\s]+")
+_DOUBLE_VOWEL = re.compile(r"([aeiou])\1+")
+
+def fuzzy_key(v: Any, direction: str = "en-so") -> str:
+    """norm_key minus apostrophes/hyphens/spaces; Somali also folds doubled vowels."""
+    k = _FUZZY_DROP.sub("", norm_key(v))
+    if direction == "so-en":
+        k = _DOUBLE_VOWEL.sub(r"\1", k)
+    return k
+
+def _deletes(word: str, max_dist: int) -> set:
+    out = {word}
+    frontier = {word}
+    for _ in range(max_dist):
+        nxt = set()
+        for w in frontier:
+            if len(w) > 1:
+                for i in range(len(w)):
+                    nxt.add(w[:i] + w[i + 1:])
+        out |= nxt
+        frontier = nxt
+    return out
+
+def edit_distance(a: str, b: str, max_dist: int) -> int:
+    """Optimal-string-alignment distance; returns max_dist + 1 once exceeded."""
+    if abs(len(a) - len(b)) > max_dist:
+        return max_dist + 1
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            v = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                v = min(v, prev2[j - 2] + 1)
+            cur[j] = v
+            row_min = min(row_min, v)
+        if row_min > max_dist:
+            return max_dist + 1
+        prev2, prev = prev, cur
+    return min(prev[-1], max_dist + 1)
+
+class FuzzyIndex:
+    """
+    Precomputed delete-neighbourhood index: every headword's deletes (up to
+    ``max_dist`` chars, over its first ``_FUZZY_PREFIX`` chars) map back to
+    the word. A query only generates its own deletes and verifies the few
+    candidates they hit, so cost is independent of dictionary size.
+    """
+
+    def __init__(self, pairs: Iterable[Tuple[str, str]], direction: str = "en-so",
+                 max_dist: int = _FUZZY_MAX_DIST):
+        self.direction = direction
+        self.max_dist = max_dist
+        # one entry per distinct normalized key: (fuzzy key, norm key, display)
+        self._words: List[Tuple[str, str, str]] = []
+        seen: set = set()
+        for key, text in pairs:
+            fk = fuzzy_key(key, direction)
+            if key and fk and key not in seen:
+                seen.add(key)
+                self._words.append((fk, key, text))
+        self._deletes: Dict[str, Any] = {}  # delete -> word id, or list of ids
+        for wid, (fk, _, _) in enumerate(self._words):
+            for d in _deletes(fk[:_FUZZY_PREFIX], max_dist):
+                cur = self._deletes.get(d)
+                if cur is None:
+                    self._deletes[d] = wid
+                elif isinstance(cur, list):
+                    cur.append(wid)
+                else:
+                    self._deletes[d] = [cur, wid]
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def search(self, term: str, limit: int = 5) -> List[Tuple[int, str, str]]:
+        """Closest headwords as ``(distance, norm key, display)``, best first."""
+        fk = fuzzy_key(term, self.direction)
+        if not fk:
+            return []
+        # allow fewer edits on very short input, otherwise everything matches
+        max_dist = min(self.max_dist, max(1, len(fk) // 3))
+        ids: set = set()
+        for d in _deletes(fk[:_FUZZY_PREFIX], max_dist):
+            hit = self._deletes.get(d)
+            if hit is None:
+                continue
+            if isinstance(hit, list):
+                ids.update(hit)
+            else:
+                ids.add(hit)
+        scored = []
+        for wid in ids:
+            wfk, key, text = self._words[wid]
+            dist = edit_distance(fk, wfk, max_dist)
+            if dist <= max_dist:
+                scored.append((dist, key, text))
+        scored.sort(key=lambda t: (t[0], abs(len(t[1]) - len(term)), t[1]))
+        return scored[:limit]
+
+def build_indexes(coll) -> Tuple[Dict[str, PrefixIndex], Dict[str, FuzzyIndex]]:
+    """Prefix and fuzzy indexes per direction over every headword alias in ``coll``."""
+    proj = {f: 1 for fields in FIELD_CANDS.values() for f in fields}
+    proj["_id"] = 0
+    proj[AI_FILLED] = 1
+    pairs: Dict[str, List[Tuple[str, str]]] = {d: [] for d in FIELD_CANDS}
+    for doc in coll.find({}, proj):
+        ai = set(doc.get(AI_FILLED) or ())
+        for direction, fields in FIELD_CANDS.items():
+            for f in fields:
+                v = doc.get(f)
+                if v not in (None, "") and f not in ai:
+                    pairs[direction].append((norm_key(v), str(v).strip()))
+    prefix = {d: PrefixIndex(p) for d, p in pairs.items()}
+    fuzzy = {d: FuzzyIndex(p, d) for d, p in pairs.items()}
+    return prefix, fuzzy
@@ -1,4 +1,9 @@
+import threading
+import time
 from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from .dictionary import DICT_COLL, build_indexes, dictionary_version
 
 @dataclass
 class LoaderState:
@@ -7,10 +12,76 @@ class LoaderState:
     grammar_categories: list = field(default_factory=list)
     grammar_topics: dict = field(default_factory=dict)
     tests: dict = field(default_factory=dict)
-    dictionary: list = field(default_factory=list)
+    dictionary: dict = field(default_factory=dict)   # dir -> PrefixIndex
+    dictionary_fuzzy: dict = field(default_factory=dict)  # dir -> FuzzyIndex
+    dictionary_version: Optional[str] = None
+    content_versions: dict = field(default_factory=dict)  # kind -> meta version stamp
+
+# meta docs (``{_id: kind, version}``) stamped by the grammar/tests importers
+CONTENT_KINDS = ("grammar", "tests")
 
 loader_state = LoaderState()
 
-def bootstrap_loader_state():
-    # No-op; your endpoints that hit Mongo don't need this.
+# called after every rebuild, e.g. to drop caches derived from the old data
+_reload_hooks: List[Callable[[], None]] = []
+
+def on_dictionary_reload(fn: Callable[[], None]) -> Callable[[], None]:
+    _reload_hooks.append(fn)
+    return fn
+
+def refresh_dictionary(db, force: bool = False) -> bool:
+    """Rebuild the prefix/fuzzy indexes if the dictionary was re-imported."""
+    version = dictionary_version(db)
+    if not force and loader_state.dictionary and version == loader_state.dictionary_version:
+        return False
+    # build off to the side, then swap in one assignment so readers never see a partial index
+    prefix, fuzzy = build_indexes(db[DICT_COLL])
+    loader_state.dictionary, loader_state.dictionary_fuzzy = prefix, fuzzy
+    loader_state.dictionary_version = version
+    for fn in _reload_hooks:
+        try:
+            fn()
+        except Exception:
+            pass
+    return True
+
+def refresh_content_versions(db) -> None:
+    """Pick up re-imports; response cache keys include these versions."""
+    docs = db.meta.find({"_id": {"$in": list(CONTENT_KINDS)}}, {"version": 1})
+    loader_state.content_versions = {d["_id"]: d.get("version") for d in docs}
+
+def content_version(kind: str) -> Optional[str]:
+    return loader_state.content_versions.get(kind)
+
+def bootstrap_loader_state(db=None):
+    if db is not None:
+        try:
+            refresh_dictionary(db, force=True)
+        except Exception:
+            pass  # suggest falls back to Mongo until the refresher succeeds
+        try:
+            refresh_content_versions(db)
+        except Exception:
+            pass
     return loader_state
+
+def start_refresher(get_db: Callable[[], object], interval: float = 300.0) -> threading.Thread:
+    """Poll the dictionary and content versions every ``interval`` seconds in a daemon thread."""
+    def _loop():
+        while True:
+            time.sleep(interval)
+            db = get_db()
+            if db is None:
+                continue
+            try:
+                refresh_dictionary(db)
+            except Exception:
+                pass
+            try:
+                refresh_content_versions(db)
+            except Exception:
+                pass
+
+    t = threading.Thread(target=_loop, name="loader-refresh", daemon=True)
+    t.start()
+    return t
@@ -1,12 +1,19 @@
 # backend/app/main.py
+import asyncio
 import os
 from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import JSONResponse
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient, MongoClient
 from pymongo.errors import PyMongoError
 from dotenv import load_dotenv
 
+from app.loaders.state import bootstrap_loader_state, start_refresher
+from app.events import event_buffer
+from app.indexes import ensure_indexes, missing_indexes
+from app.loaders.dictionary import DICT_COLL, unkeyed_count
+from app import llm
+
 load_dotenv()  # harmless on Render
 
 app = FastAPI(title="Aasaasi API", version="1.0.0")
@@ -24,11 +31,24 @@ app.add_middleware(
 )
 
 # ---------- Mongo init & health ----------
+def _async_db(url: str, name: str):
+    # one async client per process: it reconnects by itself and can only be
+    # closed from the loop (_shutdown_async), so health-check reconnects reuse it
+    adb = getattr(app.state, "adb", None)
+    if adb is not None:
+        return adb.client[name]
+    return AsyncMongoClient(
+        url,
+        serverSelectionTimeoutMS=2000,
+        connectTimeoutMS=2000,
+        socketTimeoutMS=2000,
+    )[name]
+
 def _connect_db():
     url = os.getenv("MONGO_URL")
     name = os.getenv("MONGO_DB")
     if not url or not name:
-        app.state.db = None
+        app.state.db = app.state.adb = None
         app.state.db_err = "Missing MONGO_URL or MONGO_DB"
         return
     try:
@@ -40,14 +60,57 @@ def _connect_db():
         )
         client.admin.command("ping")  # force connectivity now
         app.state.db = client[name]
+        # async driver for writes made from async handlers (AI conversations);
+        # it connects lazily on the server loop
+        app.state.adb = _async_db(url, name)
         app.state.db_err = None
     except Exception as e:
-        app.state.db = None
+        app.state.db = None  # handlers check db first; adb is kept for the retry
         app.state.db_err = str(e)
 
+def _check_indexes():
+    # verify only by default; building is scripts/manage_indexes.py --apply
+    app.state.index_missing = []
+    app.state.dict_unkeyed = 0
+    db = getattr(app.state, "db", None)
+    if db is None:
+        return
+    try:
+        if os.getenv("DB_ENSURE_INDEXES", "0") == "1":
+            ensure_indexes(db)
+        app.state.index_missing = missing_indexes(db)
+        # rows imported before key_* existed miss exact lookup until --reindex
+        app.state.dict_unkeyed = unkeyed_count(db[DICT_COLL])
+    except PyMongoError as e:
+        app.state.index_missing = [f"check failed: {e}"]
+
 @app.on_event("startup")
 def _startup():
     _connect_db()
+    _check_indexes()
+    bootstrap_loader_state(app.state.db)
+    start_refresher(lambda: getattr(app.state, "db", None),
+                    interval=float(os.getenv("LOADER_REFRESH_SEC", "300")))
+    event_buffer.start(lambda: getattr(app.state, "db", None))
+
+@app.on_event("startup")
+async def _bind_loop():
+    # background AI jobs (dictionary backfill, idiom prewarm) run as tasks on the server loop
+    llm.bind_loop(asyncio.get_running_loop())
+    idioms.prewarm_current(getattr(app.state, "db", None))
+
+@app.on_event("shutdown")
+def _shutdown():
+    # write out any buffered analytics events before the worker exits
+    event_buffer.stop()
+    llm.close()
+
+@app.on_event("shutdown")
+async def _shutdown_async():
+    await llm.aclose()
+    adb = getattr(app.state, "adb", None)
+    if adb is not None:
+        await adb.client.close()
 
 @app.get("/api/health")
 def health():
@@ -57,6 +120,8 @@ def health():
         "status": "ok",
         "db": "up" if getattr(app.state, "db", None) is not None else "down",
         "err": getattr(app.state, "db_err", None),
+        "indexesMissing": getattr(app.state, "index_missing", []),
+        "dictionaryUnkeyed": getattr(app.state, "dict_unkeyed", 0),
     }
 
 @app.head("/api/health")
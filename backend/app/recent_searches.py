@@ -0,0 +1,65 @@
+# backend/app/recent_searches.py
+"""
+Per-session recent dictionary searches (collection ``recent_searches``).
+
+One small doc per session, ``{_id: sessionId, terms: [...]}``, newest first,
+deduped case-insensitively and capped at RECENT_CAP. Like term_stats it is
+folded in from ``word_lookup`` events as the event buffer writes them: one
+update per session per flush, nothing on the lookup path. Batch lookups are
+not listed.
+"""
+from typing import Any, Dict, Iterable, List
+
+from pymongo import UpdateOne
+
+from .events import event_buffer, parse_ts
+
+RECENT_COLL = "recent_searches"
+RECENT_CAP = 50
+
+def recent_ops(events: Iterable[Dict[str, Any]]) -> List[UpdateOne]:
+    by_session: Dict[Any, List[tuple]] = {}
+    for e in events:
+        if e.get("kind") != "word_lookup":
+            continue
+        p = e.get("payload") or {}
+        word = str(p.get("word") or "").strip()
+        if word and not p.get("batch"):
+            by_session.setdefault(e.get("sessionId"), []).append((parse_ts(e.get("ts")), word))
+
+    ops: List[UpdateOne] = []
+    for sid, seen in by_session.items():
+        # newest first, one entry per lowercased word
+        words: Dict[str, str] = {}
+        for _, w in sorted(seen, key=lambda x: x[0], reverse=True):
+            words.setdefault(w.lower(), w)
+        fresh = list(words.values())[:RECENT_CAP]
+        ops.append(UpdateOne(
+            {"_id": sid},
+            [{"$set": {
+                "terms": {"$slice": [
+                    {"$concatArrays": [
+                        fresh,
+                        {"$filter": {
+                            "input": {"$ifNull": ["$terms", []]},
+                            "cond": {"$not": [{"$in": [{"$toLower": "$$this"}, list(words)]}]},
+                        }},
+                    ]},
+                    RECENT_CAP,
+                ]},
+                "updatedAt": "$$NOW",
+            }}],
+            upsert=True,
+        ))
+    return ops
+
+@event_buffer.on_write
+def apply_recent(db, events: Iterable[Dict[str, Any]]) -> int:
+    ops = recent_ops(events)
+    if ops:
+        db[RECENT_COLL].bulk_write(ops, ordered=False)
+    return len(ops)
+
+def load_recent(db, session_id: str, limit: int) -> List[str]:
+    doc = db[RECENT_COLL].find_one({"_id": session_id}, {"terms": {"$slice": limit}})
+    return list((doc or {}).get("terms") or [])[:limit]
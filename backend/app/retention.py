@@ -0,0 +1,113 @@
+# backend/app/retention.py
+"""
+Retention for the raw ``events`` collection.
+
+Events older than EVENT_RETENTION_DAYS (whole UTC days) are exported to
+gzipped NDJSON under EVENT_ARCHIVE_DIR, one ``dt=YYYY-MM-DD`` directory per
+event day, and then stamped with ``archivedAt``. A TTL index on
+``archivedAt`` (declared in app/indexes.py) removes them after
+EVENT_ARCHIVE_GRACE_SEC, so nothing is deleted that is not on disk first;
+events that were never archived never expire.
+
+With ANALYTICS_SUMMARY_SOURCE=rollup the summary keeps working past the
+window, because the ``session_daily`` rollups are written at ingest and
+kept forever.
+Run scripts/archive_events.py from cron (daily is plenty).
+"""
+import gzip
+import json
+import os
+from datetime import datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+EVENT_RETENTION_DAYS = int(os.getenv("EVENT_RETENTION_DAYS", "90"))
+EVENT_ARCHIVE_DIR = os.getenv("EVENT_ARCHIVE_DIR", "archive/events")
+EVENT_ARCHIVE_GRACE_SEC = int(os.getenv("EVENT_ARCHIVE_GRACE_SEC", str(7 * 86400)))
+
+def retention_cutoff(days: Optional[int] = None, now: Optional[datetime] = None) -> datetime:
+    """Start of the oldest UTC day still kept in full."""
+    now = now or datetime.now(timezone.utc)
+    day = (now - timedelta(days=EVENT_RETENTION_DAYS if days is None else days)).date()
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+def _default(v: Any) -> Any:
+    if isinstance(v, datetime):
+        if v.tzinfo is None:
+            v = v.replace(tzinfo=timezone.utc)
+        return v.isoformat().replace("+00:00", "Z")
+    return str(v)  # ObjectId and other BSON scalars
+
+def to_ndjson(doc: Dict[str, Any]) -> str:
+    return json.dumps(doc, default=_default, ensure_ascii=False, separators=(",", ":"))
+
+class _Part:
+    """One gzip part file; only visible under its final name once closed."""
+
+    def __init__(self, out_dir: str, day: str, stamp: str, seq: int):
+        d = os.path.join(out_dir, f"dt={day}")
+        os.makedirs(d, exist_ok=True)
+        self.path = os.path.join(d, f"part-{stamp}-{seq:04d}.ndjson.gz")
+        self._tmp = self.path + ".tmp"
+        self._f = gzip.open(self._tmp, "wt", encoding="utf-8")
+        self.day = day
+        self.ids: List[Any] = []
+
+    def write(self, doc: Dict[str, Any]) -> None:
+        self._f.write(to_ndjson(doc) + "\n")
+        self.ids.append(doc["_id"])
+
+    def close(self) -> None:
+        self._f.close()
+        with open(self._tmp, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(self._tmp, self.path)
+
+def _iter_expired(db, cutoff: datetime, batch: int) -> Iterator[Dict[str, Any]]:
+    cur = db.events.find(
+        {"ts": {"$lt": cutoff}, "archivedAt": {"$exists": False}},
+    ).sort("ts", 1).batch_size(batch)
+    try:
+        yield from cur
+    finally:
+        cur.close()
+
+def archive_events(db, out_dir: str = EVENT_ARCHIVE_DIR, cutoff: Optional[datetime] = None,
+                   max_per_file: int = 100_000, batch: int = 5000, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Export events older than ``cutoff`` and mark them archived. Each part is
+    closed and fsynced before its events are marked, so an interrupted run
+    only ever re-exports (never loses) events.
+    """
+    cutoff = cutoff or retention_cutoff()
+    stats = {"events": 0, "files": 0, "marked": 0}
+    if dry_run:
+        stats["events"] = db.events.count_documents({"ts": {"$lt": cutoff}, "archivedAt": {"$exists": False}})
+        return stats
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    part: Optional[_Part] = None
+    seq = 0
+
+    def finish(p: _Part) -> None:
+        p.close()
+        stats["files"] += 1
+        now = datetime.now(timezone.utc)
+        for i in range(0, len(p.ids), batch):
+            stats["marked"] += db.events.update_many(
+                {"_id": {"$in": p.ids[i:i + batch]}}, {"$set": {"archivedAt": now}}
+            ).modified_count
+
+    for ev in _iter_expired(db, cutoff, batch):
+        ts = ev.get("ts")
+        day = ts.date().isoformat() if isinstance(ts, datetime) else "unknown"
+        if part is not None and (part.day != day or len(part.ids) >= max_per_file):
+            finish(part)
+            part = None
+        if part is None:
+            seq += 1
+            part = _Part(out_dir, day, stamp, seq)
+        part.write(ev)
+        stats["events"] += 1
+    if part is not None:
+        finish(part)
+    return stats
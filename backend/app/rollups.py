@@ -0,0 +1,107 @@
+# backend/app/rollups.py
+"""
+Per-session daily rollups of analytics events (collection ``session_daily``).
+
+One document per (sessionId, UTC day) holding everything /analytics/summary
+needs: event count, counts per kind, search term counts, time spent, quiz
+accuracy sums, the distinct words learned / grammar topics, and the first ts
+of each search term (``termFirst``, for tie order). Updated with
+``$inc``/``$addToSet``/``$min`` as events are ingested, so the summary reads at most
+``days + 1`` small documents however active the session is.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List
+
+from pymongo import UpdateOne
+
+from .events import SERVER_KINDS, parse_ts
+
+ROLLUP_COLL = "session_daily"
+
+# field names can't contain "." or start with "$" inside update paths
+def _enc(k: str) -> str:
+    return k.replace(".", "．").replace("$", "＄")
+
+def _dec(k: str) -> str:
+    return k.replace("．", ".").replace("＄", "$")
+
+def _num(v: Any, cast=float) -> Any:
+    try:
+        return cast(v)
+    except (TypeError, ValueError):
+        return cast(0)
+
+def rollup_ops(events: Iterable[Dict[str, Any]]) -> List[UpdateOne]:
+    """Fold canonical events into one upsert per (sessionId, day)."""
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for e in events:
+        kind = e.get("kind") or ""
+        if kind in SERVER_KINDS:
+            continue
+        day = parse_ts(e.get("ts")).date().isoformat()
+        key = (e.get("sessionId"), day)
+        g = groups.get(key)
+        if g is None:
+            g = groups[key] = {"inc": defaultdict(float), "words": set(), "topics": set(), "first": {}}
+        inc = g["inc"]
+        p = e.get("payload") or {}
+        inc["events"] += 1
+        inc[f"counts.{_enc(kind)}"] += 1
+        if kind == "dictionary_search":
+            term = str(p.get("term") or "").strip().lower()
+            if term:
+                inc[f"searchTerms.{_enc(term)}"] += 1
+                ts = parse_ts(e.get("ts"))
+                if term not in g["first"] or ts < g["first"][term]:
+                    g["first"][term] = ts
+        elif kind == "word_learned":
+            w = str(p.get("word") or "").strip()
+            if w:
+                g["words"].add(w)
+        elif kind == "quiz_completed":
+            inc["quizCount"] += 1
+            inc["quizAccuracySum"] += _num(p.get("accuracy", 0))
+        elif kind == "time_spent":
+            inc["timeSpentSec"] += _num(p.get("seconds", 0), int)
+        elif kind == "grammar_studied":
+            g_topic = str(p.get("topic") or "").strip()
+            if g_topic:
+                g["topics"].add(g_topic)
+
+    now = datetime.now(timezone.utc)
+    ops: List[UpdateOne] = []
+    for (sid, day), g in groups.items():
+        inc = {k: (int(v) if float(v).is_integer() and k != "quizAccuracySum" else v)
+               for k, v in g["inc"].items()}
+        update: Dict[str, Any] = {
+            "$inc": inc,
+            "$set": {"updatedAt": now},
+            "$setOnInsert": {"sessionId": sid, "day": day},
+        }
+        add: Dict[str, Any] = {}
+        if g["words"]:
+            add["wordsLearned"] = {"$each": sorted(g["words"])}
+        if g["topics"]:
+            add["grammarTopics"] = {"$each": sorted(g["topics"])}
+        if add:
+            update["$addToSet"] = add
+        if g["first"]:
+            update["$min"] = {f"termFirst.{_enc(t)}": ts for t, ts in g["first"].items()}
+        ops.append(UpdateOne({"sessionId": sid, "day": day}, update, upsert=True))
+    return ops
+
+def apply_rollups(db, events: Iterable[Dict[str, Any]], coll: str = ROLLUP_COLL) -> int:
+    ops = rollup_ops(events)
+    if ops:
+        db[coll].bulk_write(ops, ordered=False)
+    return len(ops)
+
+def load_rollups(db, session_id: str, since_day: str) -> List[Dict[str, Any]]:
+    cur = db[ROLLUP_COLL].find({"sessionId": session_id, "day": {"$gte": since_day}}, {"_id": 0})
+    docs = list(cur)
+    for d in docs:
+        d["searchTerms"] = {_dec(k): v for k, v in (d.get("searchTerms") or {}).items()}
+        d["counts"] = {_dec(k): v for k, v in (d.get("counts") or {}).items()}
+        d["termFirst"] = {_dec(k): v for k, v in (d.get("termFirst") or {}).items()}
+    return docs
@@ -1,13 +1,20 @@
 # backend/app/routers/ai.py
+import json
 import os
 import re
+
+import anyio
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Literal, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, Header, Request
+from fastapi import APIRouter, HTTPException, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+
+from .. import card_cache, llm
 
 load_dotenv()  # local dev
 
@@ -25,19 +32,24 @@ class ChatResponse(BaseModel):
 def _iso_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
-def _get_client() -> OpenAI:
-    key = os.getenv("OPENAI_API_KEY")
-    if not key:
+def _get_client(endpoint: str = "chat") -> OpenAI:
+    if not llm.api_key():
         # 401 so the UI can show a clear message
         raise HTTPException(status_code=401, detail="Missing OPENAI_API_KEY")
-    return OpenAI(api_key=key)
+    # shared pooled client (app/llm.py) with this endpoint's timeouts
+    return llm.client(endpoint)
 
 def _get_model() -> str:
     return os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
+def _get_async_client(endpoint: str = "chat") -> AsyncOpenAI:
+    if not llm.api_key():
+        raise HTTPException(status_code=401, detail="Missing OPENAI_API_KEY")
+    return llm.aclient(endpoint)
+
 # Back-compat names used by other routers (e.g., idioms.py)
-def _openai_client() -> OpenAI:
-    return _get_client()
+def _openai_client(endpoint: str = "default") -> OpenAI:
+    return _get_client(endpoint)
 
 def _model() -> str:
     return _get_model()
@@ -94,68 +106,227 @@ No prefixes, no suffixes, no code fences, no Markdown.
 Keys should be populated succinctly. Keep examples as an array of 1–3 strings.
 """
 
+# ===== chat helpers (shared by /chat and /chat/stream)
+def _chat_messages(message: str) -> list:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT.strip()},
+        {"role": "user", "content": message},
+    ]
+
+async def _conv_update(request: Request, *args, **kwargs) -> None:
+    # async driver when main.py opened one; otherwise the sync db off the loop
+    adb = getattr(request.app.state, "adb", None)
+    if adb is not None:
+        await adb.conversations.update_one(*args, **kwargs)
+    else:
+        await run_in_threadpool(request.app.state.db.conversations.update_one, *args, **kwargs)
+
+async def _log_user_message(request: Request, session_id: str, message: str) -> None:
+    now = _iso_now()
+    # create the conversation doc if needed and log the user message in one write
+    await _conv_update(
+        request,
+        {"sessionId": session_id},
+        {"$setOnInsert": {"sessionId": session_id, "createdAt": now},
+         "$push": {"messages": {"role": "user", "content": message, "ts": now}}},
+        upsert=True,
+    )
+
+async def _log_reply(request: Request, session_id: str, reply: str, **extra) -> None:
+    await _conv_update(
+        request,
+        {"sessionId": session_id},
+        {"$push": {"messages": {"role": "assistant", "content": reply, "ts": _iso_now(), **extra}}},
+    )
+
+def _clean_reply(reply: str, message: str) -> str:
+    # Safety: if the user asked for JSON but the model returned fenced blocks,
+    # unwrap ```json ... ``` or ``` ... ``` so the frontend gets plain JSON.
+    wants_json = bool(re.search(r"\b(json only|reply with json|return json)\b", message, flags=re.I))
+    if wants_json:
+        # try to extract first {...} block if fences slipped in
+        m = re.search(r"\{.*\}", reply, flags=re.S)
+        if m:
+            reply = m.group(0).strip()
+    return reply
+
+def _card_key(request: Request, message: str) -> Tuple[Optional[str], bool]:
+    """
+    (reply-cache key or None if uncacheable, bypass). Send ``X-AI-Cache:
+    bypass`` (or ``Cache-Control: no-cache``) to force a fresh answer; it
+    still replaces the cached one.
+    """
+    key = card_cache.card_key(message, _get_model(), SYSTEM_PROMPT)
+    bypass = (request.headers.get("x-ai-cache", "").lower() == "bypass"
+              or "no-cache" in request.headers.get("cache-control", "").lower())
+    if bypass and key:
+        card_cache.note_bypass()
+    return key, bypass
+
+def _cache_status(key: Optional[str], bypass: bool, hit: bool) -> str:
+    return "skip" if key is None else "bypass" if bypass else "hit" if hit else "miss"
+
+def _provider_error(e: Exception) -> HTTPException:
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, llm.UpstreamBusy):
+        return HTTPException(status_code=503, detail="AI is busy, please retry shortly")
+    msg = str(e)
+    if "Incorrect API key" in msg or "invalid_api_key" in msg or "status code: 401" in msg:
+        return HTTPException(status_code=401, detail="Invalid OpenAI API key")
+    if "insufficient_quota" in msg or "status code: 429" in msg:
+        return HTTPException(status_code=429, detail="OpenAI quota exceeded")
+    if "timed out" in msg or "Timeout" in msg or "Read timed out" in msg:
+        return HTTPException(status_code=504, detail="AI provider timeout")
+    return HTTPException(status_code=502, detail=f"AI provider error: {msg}")
+
 # ===== routes
 @router.post("/chat", response_model=ChatResponse)
-def chat(
+async def chat(
     payload: ChatRequest,
     request: Request,
+    response: Response,
     x_session_id: Optional[str] = Header(default="anon-session", convert_underscores=False),
 ):
     db = request.app.state.db
     if db is None:
         raise HTTPException(status_code=503, detail="DB not ready")
+    adb = getattr(request.app.state, "adb", None)
 
-    now = _iso_now()
-    # ensure conversation doc exists
-    db.conversations.update_one(
-        {"sessionId": x_session_id},
-        {"$setOnInsert": {"sessionId": x_session_id, "createdAt": now, "messages": []}},
-        upsert=True,
-    )
-    # log user message
-    db.conversations.update_one(
-        {"sessionId": x_session_id},
-        {"$push": {"messages": {"role": "user", "content": payload.message, "ts": now}}},
-    )
+    await _log_user_message(request, x_session_id, payload.message)
 
-    try:
-        client = _get_client()
-        resp = client.chat.completions.create(
-            model=_get_model(),
-            temperature=0.2,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT.strip()},
-                {"role": "user", "content": payload.message},
-            ],
-        )
-        reply = (resp.choices[0].message.content or "").strip()
-
-        # Safety: if the user asked for JSON but the model returned fenced blocks,
-        # unwrap ```json ... ``` or ``` ... ``` so the frontend gets plain JSON.
-        wants_json = bool(re.search(r"\b(json only|reply with json|return json)\b", payload.message, flags=re.I))
-        if wants_json:
-            # try to extract first {...} block if fences slipped in
-            m = re.search(r"\{.*\}", reply, flags=re.S)
-            if m:
-                reply = m.group(0).strip()
+    key, bypass = _card_key(request, payload.message)
+    reply = await card_cache.get(key, db, adb) if key and not bypass else None
+    response.headers["X-AI-Cache"] = _cache_status(key, bypass, reply is not None)
+    if reply is not None:
+        await _log_reply(request, x_session_id, reply, cached=True)
+        return {"reply": reply, "conversationId": x_session_id}
 
+    try:
+        client = _get_async_client("chat")
+        async with llm.limit("openai"):
+            resp = await client.chat.completions.create(
+                model=_get_model(),
+                temperature=0.2,
+                messages=_chat_messages(payload.message),
+            )
+        reply = _clean_reply((resp.choices[0].message.content or "").strip(), payload.message)
     except Exception as e:
-        msg = str(e)
-        if "Incorrect API key" in msg or "invalid_api_key" in msg or "status code: 401" in msg:
-            raise HTTPException(status_code=401, detail="Invalid OpenAI API key")
-        if "insufficient_quota" in msg or "status code: 429" in msg:
-            raise HTTPException(status_code=429, detail="OpenAI quota exceeded")
-        if "timed out" in msg or "Timeout" in msg or "Read timed out" in msg:
-            raise HTTPException(status_code=504, detail="AI provider timeout")
-        raise HTTPException(status_code=502, detail=f"AI provider error: {msg}")
-
-    # log assistant reply
-    db.conversations.update_one(
-        {"sessionId": x_session_id},
-        {"$push": {"messages": {"role": "assistant", "content": reply, "ts": _iso_now()}}},
-    )
+        raise _provider_error(e)
+
+    # store (or, on bypass, refresh) the card, then log assistant reply
+    if key:
+        await card_cache.put(key, reply, db, adb, model=_get_model())
+    await _log_reply(request, x_session_id, reply)
     return {"reply": reply, "conversationId": x_session_id}
 
+def _sse(data: dict, event: Optional[str] = None) -> str:
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def _ndjson(data: dict, event: Optional[str] = None) -> str:
+    if event:
+        data = {"event": event, **data}
+    return json.dumps(data, ensure_ascii=False) + "\n"
+
+@router.post("/chat/stream")
+async def chat_stream(
+    payload: ChatRequest,
+    request: Request,
+    format: Literal["sse", "ndjson"] = Query("sse"),
+    x_session_id: Optional[str] = Header(default="anon-session", convert_underscores=False),
+):
+    """
+    Same as /chat, but forwards tokens as the provider produces them.
+
+    SSE (default): ``data: {"delta": "..."}`` per chunk, then
+    ``event: done`` with ``{"conversationId", "reply"?}``; ``reply`` is only
+    sent when cleanup changed the text (JSON unwrapping). ``?format=ndjson``
+    sends the same objects one per line. A provider failure (including
+    auth, quota and "AI busy", which /chat returns as status codes) is sent
+    as ``event: error`` with ``{"status", "detail"}``. The reply is saved to
+    ``conversations`` when the stream ends, marked ``partial`` if it was cut
+    short. Shares /chat's reply cache: a hit is sent as one delta.
+    """
+    db = request.app.state.db
+    if db is None:
+        raise HTTPException(status_code=503, detail="DB not ready")
+    adb = getattr(request.app.state, "adb", None)
+
+    await _log_user_message(request, x_session_id, payload.message)
+
+    frame = _sse if format == "sse" else _ndjson
+    media = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    headers = {
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # don't let nginx-style proxies buffer tokens
+    }
+    key, bypass = _card_key(request, payload.message)
+    cached = await card_cache.get(key, db, adb) if key and not bypass else None
+    headers["X-AI-Cache"] = _cache_status(key, bypass, cached is not None)
+    if cached is not None:
+        await _log_reply(request, x_session_id, cached, cached=True)
+        return StreamingResponse(iter([frame({"delta": cached}),
+                                       frame({"conversationId": x_session_id}, "done")]),
+                                 media_type=media, headers=headers)
+
+    try:
+        client = _get_async_client("chat")
+    except Exception as e:
+        raise _provider_error(e)
+
+    async def events():
+        # the slot is taken here, not in the handler, so a body that never
+        # starts (client gone before the first send) can't leak it
+        parts = []
+        acquired = saved = False
+        stream = None
+        try:
+            await llm.acquire("openai")
+            acquired = True
+            stream = await client.chat.completions.create(
+                model=_get_model(),
+                temperature=0.2,
+                messages=_chat_messages(payload.message),
+                stream=True,
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield frame({"delta": delta})
+            raw = "".join(parts).strip()
+            reply = _clean_reply(raw, payload.message)
+            done = {"conversationId": x_session_id}
+            if reply != raw:
+                done["reply"] = reply
+            with anyio.CancelScope(shield=True):
+                if key:
+                    await card_cache.put(key, reply, db, adb, model=_get_model())
+                await _log_reply(request, x_session_id, reply)
+            saved = True
+            yield frame(done, "done")
+        except Exception as e:
+            err = _provider_error(e)
+            yield frame({"status": err.status_code, "detail": err.detail}, "error")
+        finally:
+            if acquired:
+                llm.release("openai")
+            # client went away or the provider failed: keep what was generated
+            # and close upstream, even though a disconnect cancelled us
+            with anyio.CancelScope(shield=True):
+                if not saved and parts:
+                    await _log_reply(request, x_session_id, "".join(parts).strip(), partial=True)
+                if stream is not None:
+                    await stream.close()
+
+    return StreamingResponse(events(), media_type=media, headers=headers)
+
+@router.get("/stats")
+def ai_stats():
+    # pool settings, per-upstream slots in use / waiting, reply-cache hit rates
+    return {**llm.stats(), "cardCache": card_cache.stats()}
+
 @router.get("/history")
 def history(
     request: Request,
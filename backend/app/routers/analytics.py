@@ -1,6 +1,12 @@
 from fastapi import APIRouter, Header, Query, Request, HTTPException, Body
-from typing import Optional, Dict, Any, List, Literal
-from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, Iterable, List, Literal
+from datetime import date, datetime, time, timedelta, timezone
+import os
+
+from .. import http_cache
+from ..events import SERVER_KINDS, event_buffer, make_event, parse_ts
+from ..rollups import apply_rollups, load_rollups
+from ..term_stats import top_terms
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
@@ -16,24 +22,16 @@ TYPE_TO_KIND = {
     "time_spent":"time_spent",
     "page_view":"page_view",
 }
-def _iso_now() -> str: 
-    return datetime.now(timezone.utc).isoformat()
 
-@router.post("/event")
-def post_event(
-    request: Request,
-    payload: Dict[str, Any] = Body(...),           # let FastAPI parse JSON
-    x_session_id: str = Header(default="anon-session"),
-):
-    db = request.app.state.db
-    if db is None:
-        raise HTTPException(503, "DB not ready")
+# max events accepted by one POST /analytics/events
+MAX_BATCH = 500
 
-    now = _iso_now()
+def _normalize_event(payload: Dict[str, Any], session_id: str) -> Dict[str, Any]:
+    """Map either payload shape ({kind, payload, ts} or {type, meta, at}) to a canonical event."""
     if "kind" in payload or "payload" in payload:
         kind = str(payload.get("kind", "")).strip() or "page_view"
         meta = payload.get("payload") or {}
-        ts = payload.get("ts") or now
+        ts = payload.get("ts")
     else:
         t = str(payload.get("type", "")).strip()
         kind = TYPE_TO_KIND.get(t, t or "page_view")
@@ -42,117 +40,313 @@ def post_event(
             meta["term"] = meta.pop("query")
         if t == "vocab_marked" and "word" not in meta and "term" in meta:
             meta["word"] = meta["term"]
-        ts = payload.get("at") or now
-
-    db.events.insert_one({
-        "sessionId": x_session_id,
-        "kind": kind,
-        "payload": meta,
-        "ts": ts,
-        "createdAt": now
-    })
-    return {"ok": True}
+        ts = payload.get("at")
 
-def _streak_from_dates(dates: List[datetime]) -> int:
-    if not dates: 
-        return 0
-    days = {d.date() for d in dates}
-    cur = datetime.now(timezone.utc).date()
-    streak = 0
-    while cur in days:
-        streak += 1
-        cur = cur.fromordinal(cur.toordinal() - 1)
-    return streak
+    return make_event(session_id, kind, meta, ts)
 
-@router.get("/summary")
-def get_summary(
+def _update_rollups(db, docs: List[Dict[str, Any]]) -> None:
+    # the raw events are already stored; a failed rollup is repaired by
+    # scripts/rebuild_session_rollups.py rather than failing the request
+    try:
+        apply_rollups(db, docs)
+    except Exception:
+        pass
+
+@router.post("/event")
+def post_event(
     request: Request,
+    payload: Dict[str, Any] = Body(...),           # let FastAPI parse JSON
     x_session_id: str = Header(default="anon-session"),
-    days: int = Query(30, ge=1, le=365),
 ):
     db = request.app.state.db
     if db is None:
         raise HTTPException(503, "DB not ready")
 
-    since = datetime.now(timezone.utc) - timedelta(days=days)
-    evs = list(db.events.find(
-        {"sessionId": x_session_id, "ts": {"$gte": since.isoformat()}},
-        {"_id": 0}
-    ))
+    doc = _normalize_event(payload, x_session_id)
+    db.events.insert_one(doc)
+    _update_rollups(db, [doc])
+    return {"ok": True}
 
-    words_searched = 0
-    quizzes: List[Dict[str, Any]] = []
-    accuracy = 0
-    quizzes_completed = 0
-    time_spent_sec = 0
-    vocab_learned: List[str] = []
-    grammar_topics: List[str] = []
-    timestamps: List[datetime] = []
-    search_terms: Dict[str, int] = {}
+@router.post("/events")
+def post_events(
+    request: Request,
+    payload: Any = Body(...),  # validated below so bad items are skipped, not a 422
+    x_session_id: str = Header(default="anon-session"),
+):
+    """
+    Batched form of /event: a JSON array of events (or {"events": [...]}),
+    each in either shape /event accepts, written with one unordered insert_many.
+    Items that aren't JSON objects are skipped and counted in ``skipped``.
+    """
+    db = request.app.state.db
+    if db is None:
+        raise HTTPException(503, "DB not ready")
+
+    items = payload.get("events") if isinstance(payload, dict) else payload
+    if not isinstance(items, list):
+        raise HTTPException(422, "Expected a list of events")
+    if len(items) > MAX_BATCH:
+        raise HTTPException(413, f"At most {MAX_BATCH} events per batch")
+
+    docs = [_normalize_event(e, x_session_id) for e in items if isinstance(e, dict)]
+    if docs:
+        db.events.insert_many(docs, ordered=False)
+        _update_rollups(db, docs)
+    return {"ok": True, "accepted": len(docs), "skipped": len(items) - len(docs)}
+
+@router.get("/buffer")
+def buffer_stats():
+    """Counters for this worker's write-behind event buffer."""
+    return event_buffer.stats()
+
+# counters move constantly; a short shared cache keeps the editor views cheap
+_TERMS_MAX_AGE = int(os.getenv("TERM_STATS_MAX_AGE", "60"))
+
+def _term_stats(request: Request, field: str, dir: str, limit: int):
+    db = request.app.state.db
+    if db is None:
+        raise HTTPException(503, "DB not ready")
 
+    def build():
+        return {"dir": dir, "items": top_terms(db, field, dir, limit)}
+
+    return http_cache.cached_json(request, ("analytics." + field, dir, limit), build, max_age=_TERMS_MAX_AGE)
+
+@router.get("/top-terms")
+def get_top_terms(
+    request: Request,
+    dir: Literal["en-so", "so-en"] = Query("en-so"),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """Most looked-up dictionary terms across all sessions."""
+    return _term_stats(request, "lookups", dir, limit)
+
+@router.get("/misses")
+def get_misses(
+    request: Request,
+    dir: Literal["en-so", "so-en"] = Query("en-so"),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """Terms whose lookups most often found nothing -- candidates to add."""
+    return _term_stats(request, "misses", dir, limit)
+
+# summary read path: "rollup" (session_daily docs), "pipeline" (server-side
+# $facet over events) or "events" (raw scan in Python). Switch to "rollup"
+# only after scripts/rebuild_session_rollups.py --drop has backfilled them.
+SUMMARY_SOURCE = os.getenv("ANALYTICS_SUMMARY_SOURCE", "events")
+
+def _streak_from_dates(dates: Iterable[Any]) -> int:
+    days = {d.date() if isinstance(d, datetime) else d for d in dates}
+    if not days:
+        return 0
+    cur = datetime.now(timezone.utc).date()
+    streak = 0
+    while cur in days:
+        streak += 1
+        cur = cur.fromordinal(cur.toordinal() - 1)
+    return streak
+
+def _new_totals() -> Dict[str, Any]:
+    return {
+        "words_searched": 0,
+        "search_terms": {},      # term -> count, first-seen order
+        "term_first": {},        # term -> earliest ts; ties in the top terms keep first-seen order
+        "vocab_learned": [],     # distinct, first-seen order
+        "quizzes": 0,
+        "accuracy_sum": 0.0,
+        "time_spent_sec": 0,
+        "grammar_topics": [],
+        "by_day": {},            # "YYYY-MM-DD" -> events
+    }
+
+def _tally_events(evs: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    t = _new_totals()
     for e in evs:
-        try:
-            t = datetime.fromisoformat(e.get("ts"))
-        except Exception:
-            t = datetime.now(timezone.utc)
-        timestamps.append(t)
+        ts = e.get("ts")
+        if not isinstance(ts, datetime):
+            ts = parse_ts(ts)
+        day = ts.date().isoformat()
+        t["by_day"][day] = t["by_day"].get(day, 0) + 1
 
         k = e.get("kind")
         p = e.get("payload", {}) or {}
 
         if k == "dictionary_search":
-            words_searched += 1
+            t["words_searched"] += 1
             term = (p.get("term") or "").strip().lower()
             if term:
-                search_terms[term] = search_terms.get(term, 0) + 1
+                t["search_terms"][term] = t["search_terms"].get(term, 0) + 1
+                if term not in t["term_first"] or ts < t["term_first"][term]:
+                    t["term_first"][term] = ts
         elif k == "word_learned":
             w = (p.get("word") or "").strip()
-            if w and w not in vocab_learned:
-                vocab_learned.append(w)
+            if w and w not in t["vocab_learned"]:
+                t["vocab_learned"].append(w)
         elif k == "quiz_completed":
-            acc = float(p.get("accuracy", 0))
-            score = int(p.get("score", 0))
-            total = int(p.get("total", 0))
-            quizzes.append({"accuracy": acc, "score": score, "total": total})
-            quizzes_completed += 1
+            t["accuracy_sum"] += float(p.get("accuracy", 0))
+            t["quizzes"] += 1
         elif k == "time_spent":
-            time_spent_sec += int(p.get("seconds", 0))
+            t["time_spent_sec"] += int(p.get("seconds", 0))
         elif k == "grammar_studied":
             g = (p.get("topic") or "").strip()
-            if g and g not in grammar_topics:
-                grammar_topics.append(g)
+            if g and g not in t["grammar_topics"]:
+                t["grammar_topics"].append(g)
+    return t
+
+def _tally_rollups(docs: Iterable[Dict[str, Any]], t: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    t = t or _new_totals()
+    for d in sorted(docs, key=lambda d: d.get("day") or ""):
+        n = int(d.get("events") or 0)
+        if n:
+            t["by_day"][d["day"]] = t["by_day"].get(d["day"], 0) + n
+        t["words_searched"] += int((d.get("counts") or {}).get("dictionary_search", 0))
+        for term, c in (d.get("searchTerms") or {}).items():
+            t["search_terms"][term] = t["search_terms"].get(term, 0) + int(c)
+        for term, ts in (d.get("termFirst") or {}).items():
+            if term not in t["term_first"] or ts < t["term_first"][term]:
+                t["term_first"][term] = ts
+        for w in d.get("wordsLearned") or []:
+            if w not in t["vocab_learned"]:
+                t["vocab_learned"].append(w)
+        t["quizzes"] += int(d.get("quizCount") or 0)
+        t["accuracy_sum"] += float(d.get("quizAccuracySum") or 0)
+        t["time_spent_sec"] += int(d.get("timeSpentSec") or 0)
+        for g in d.get("grammarTopics") or []:
+            if g not in t["grammar_topics"]:
+                t["grammar_topics"].append(g)
+    return t
+
+def _as_string(path: str) -> Dict[str, Any]:
+    return {"$convert": {"input": path, "to": "string", "onError": "", "onNull": ""}}
 
-    if quizzes:
-        accuracy = round(sum(q["accuracy"] for q in quizzes) / len(quizzes))
+def _summary_pipeline(session_id: str, since: datetime) -> List[Dict[str, Any]]:
+    """
+    Same totals as _tally_events, computed server-side; returns one small doc.
+    Terms, words and topics come back as raw strings and are normalized in
+    _tally_pipeline: $trim/$toLower don't match str.strip()/str.lower()
+    outside ASCII.
+    """
+    def when(kind: str, then: Any) -> Dict[str, Any]:
+        return {"$cond": [{"$eq": ["$kind", kind]}, then, 0]}
 
-    weekly, by_day = [], {}
+    def distinct(kind: str, field: str) -> List[Dict[str, Any]]:
+        return [
+            {"$match": {"kind": kind}},
+            {"$group": {"_id": None, "v": {"$addToSet": _as_string(field)}}},
+        ]
+
+    return [
+        {"$match": {"sessionId": session_id, "ts": {"$gte": since}, "kind": {"$nin": list(SERVER_KINDS)}}},
+        {"$facet": {
+            "totals": [{"$group": {
+                "_id": None,
+                "searched": {"$sum": when("dictionary_search", 1)},
+                "quizzes": {"$sum": when("quiz_completed", 1)},
+                "accuracy": {"$sum": when("quiz_completed", {"$convert": {
+                    "input": {"$ifNull": ["$payload.accuracy", 0]}, "to": "double", "onError": 0}})},
+                "seconds": {"$sum": when("time_spent", {"$convert": {
+                    "input": {"$ifNull": ["$payload.seconds", 0]}, "to": "long", "onError": 0}})},
+            }}],
+            "days": [{"$group": {
+                "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$ts"}},
+                "n": {"$sum": 1},
+            }}],
+            # count and first ts per raw term; folded into the top 3 in Python
+            "terms": [
+                {"$match": {"kind": "dictionary_search"}},
+                {"$group": {"_id": _as_string("$payload.term"), "n": {"$sum": 1}, "first": {"$min": "$ts"}}},
+            ],
+            "words": distinct("word_learned", "$payload.word"),
+            "topics": distinct("grammar_studied", "$payload.topic"),
+        }},
+    ]
+
+def _tally_pipeline(db, session_id: str, since: datetime) -> Dict[str, Any]:
+    res = next(db.events.aggregate(_summary_pipeline(session_id, since)), {})
+    t = _new_totals()
+    tot = (res.get("totals") or [{}])[0]
+    t["words_searched"] = int(tot.get("searched") or 0)
+    t["quizzes"] = int(tot.get("quizzes") or 0)
+    t["accuracy_sum"] = float(tot.get("accuracy") or 0)
+    t["time_spent_sec"] = int(tot.get("seconds") or 0)
+    t["by_day"] = {d["_id"]: d["n"] for d in res.get("days") or []}
+    # same normalization as _tally_events
+    for d in sorted(res.get("terms") or [], key=lambda d: d["first"]):
+        term = d["_id"].strip().lower()
+        if term:
+            t["search_terms"][term] = t["search_terms"].get(term, 0) + d["n"]
+            t["term_first"].setdefault(term, d["first"])
+    for field, facet in (("vocab_learned", "words"), ("grammar_topics", "topics")):
+        raw = ((res.get(facet) or [{}])[0]).get("v") or []
+        t[field] = list(dict.fromkeys(v.strip() for v in raw if v.strip()))
+    return t
+
+def _top_terms(counts: Dict[str, int], first: Dict[str, Any], n: int = 3) -> List[tuple]:
+    """Count desc; ties keep first-seen order, like the original stable sort."""
+    if all(k in first for k in counts):
+        return sorted(counts.items(), key=lambda x: (-x[1], first[x[0]]))[:n]
+    # rollups written before termFirst existed: dict order is first-seen already
+    return sorted(counts.items(), key=lambda x: -x[1])[:n]
+
+def _render_summary(t: Dict[str, Any]) -> Dict[str, Any]:
+    accuracy = 0
+    if t["quizzes"]:
+        accuracy = round(t["accuracy_sum"] / t["quizzes"])
+
+    weekly, by_day = [], t["by_day"]
     today = datetime.now(timezone.utc).date()
-    for t in timestamps:
-        key = t.date().isoformat()
-        by_day[key] = by_day.get(key, 0) + 1
     for i in range(6, -1, -1):
         d = (today - timedelta(days=i)).isoformat()
         weekly.append({"day": d, "events": by_day.get(d, 0)})
 
+    vocab_learned = t["vocab_learned"]
+    search_terms = t["search_terms"]
     recs: List[Dict[str, Any]] = []
     if accuracy and accuracy < 70:
         recs.append({"type": "Practice Quizzes", "items": ["Review last quiz", "Focus on weak items"], "priority": "high", "reason": f"Average accuracy {accuracy}%."})
     if vocab_learned and len(vocab_learned) < 10:
         recs.append({"type": "Build Vocabulary", "items": ["Learn 5 new words", "Review yesterday’s words"], "priority": "medium", "reason": "Grow your set."})
     if search_terms:
-        top = sorted(search_terms.items(), key=lambda x: -x[1])[:3]
+        top = _top_terms(search_terms, t["term_first"])
         recs.append({"type": "Words you looked up a lot", "items": [w for w, _ in top], "priority": "medium", "reason": "Revisit frequent lookups."})
     if not recs:
         recs.append({"type": "Getting Started", "items": ["Try a short quiz", "Open Grammar: Present Simple", "Learn 3 new words"], "priority": "low", "reason": "No activity yet."})
 
     stats = {
         "wordsLearned": len(vocab_learned),
-        "wordsSearched": words_searched,
-        "currentStreak": _streak_from_dates(timestamps),
+        "wordsSearched": t["words_searched"],
+        "currentStreak": _streak_from_dates(date.fromisoformat(d) for d, n in by_day.items() if n),
         "accuracy": accuracy,
-        "quizzesCompleted": quizzes_completed,
-        "timeSpent": round(time_spent_sec / 60),
-        "grammarTopicsCount": len(grammar_topics),
+        "quizzesCompleted": t["quizzes"],
+        "timeSpent": round(t["time_spent_sec"] / 60),
+        "grammarTopicsCount": len(t["grammar_topics"]),
     }
 
     return {"stats": stats, "weekly": weekly, "recommendations": recs}
+
+def summarize(db, session_id: str, days: int, source: str) -> Dict[str, Any]:
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    if source == "pipeline":
+        return _render_summary(_tally_pipeline(db, session_id, since))
+
+    query: Dict[str, Any] = {"sessionId": session_id, "ts": {"$gte": since}, "kind": {"$nin": list(SERVER_KINDS)}}
+    if source != "rollup":
+        return _render_summary(_tally_events(db.events.find(query, {"_id": 0})))
+
+    # rollups are whole UTC days: the partial first day comes from its events
+    next_day = datetime.combine(since.date() + timedelta(days=1), time.min, tzinfo=timezone.utc)
+    query["ts"]["$lt"] = next_day
+    t = _tally_events(db.events.find(query, {"_id": 0}))
+    return _render_summary(_tally_rollups(load_rollups(db, session_id, next_day.date().isoformat()), t))
+
+@router.get("/summary")
+def get_summary(
+    request: Request,
+    x_session_id: str = Header(default="anon-session"),
+    days: int = Query(30, ge=1, le=365),
+    source: Optional[Literal["rollup", "pipeline", "events"]] = Query(None, description="override ANALYTICS_SUMMARY_SOURCE"),
+):
+    db = request.app.state.db
+    if db is None:
+        raise HTTPException(503, "DB not ready")
+    return summarize(db, x_session_id, days, source or SUMMARY_SOURCE)
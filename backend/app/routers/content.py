@@ -4,6 +4,8 @@ from datetime import date, datetime, timezone
 from typing import Dict, Any, Optional      # <-- add Optional
 import random
 
+from .. import http_cache
+
 router = APIRouter(tags=["content"])
 
 def _iso_now() -> str:
@@ -44,49 +46,62 @@ def word_of_the_day(request: Request, date: Optional[str] = Query(None)):
 
     # --- A) specific date requested (flashback) ----------------------------
     if date:
-        hist = db.wod_history.find_one({"date": date})
-        if not hist:
-            raise HTTPException(404, f"No word recorded for {date}")
-        wdoc = db.wod_words.find_one({"_id": hist.get("wordId")}) or db.wod_words.find_one({"word": hist.get("word")})
-        if not wdoc:
-            raise HTTPException(404, "Word doc missing")
-        return {"word": {"date": date, **_norm_word(wdoc)}}
+        def build_past():
+            hist = db.wod_history.find_one({"date": date})
+            if not hist:
+                raise HTTPException(404, f"No word recorded for {date}")
+            wdoc = db.wod_words.find_one({"_id": hist.get("wordId")}) or db.wod_words.find_one({"word": hist.get("word")})
+            if not wdoc:
+                raise HTTPException(404, "Word doc missing")
+            return {"word": {"date": date, **_norm_word(wdoc)}}
+
+        # a past day's word never changes
+        return http_cache.cached_json(request, ("content.wod", date), build_past, max_age=86400)
 
     # --- B) today ----------------------------------------------------------
     today = _today()
 
-    # already chosen today?
-    hist = db.wod_history.find_one({"date": today})
-    if hist:
-        wdoc = db.wod_words.find_one({"_id": hist.get("wordId")}) or {"word": hist.get("word")}
-        return {"word": {"date": today, **_norm_word(wdoc)}}
-
-    # otherwise sample a new word (avoid repeats until we exhaust the set)
-    used_ids = {h.get("wordId") for h in db.wod_history.find({}, {"wordId": 1}) if h.get("wordId")}
-    query = {"_id": {"$nin": list(used_ids)}} if used_ids else {}
-
-    remaining = db.wod_words.count_documents(query)
-    if remaining == 0:
-        # reset the pool if we ran through everything
-        query = {}
-        remaining = db.wod_words.count_documents({})
+    def build_today():
+        # already chosen today?
+        hist = db.wod_history.find_one({"date": today})
+        if hist:
+            wdoc = db.wod_words.find_one({"_id": hist.get("wordId")}) or {"word": hist.get("word")}
+            return {"word": {"date": today, **_norm_word(wdoc)}}
+
+        # otherwise sample a new word (avoid repeats until we exhaust the set)
+        used_ids = {h.get("wordId") for h in db.wod_history.find({}, {"wordId": 1}) if h.get("wordId")}
+        query = {"_id": {"$nin": list(used_ids)}} if used_ids else {}
+
+        remaining = db.wod_words.count_documents(query)
         if remaining == 0:
-            raise HTTPException(404, "wod_words collection is empty")
-
-    skip = random.randint(0, remaining - 1)
-    cur = db.wod_words.find(query).skip(skip).limit(1)
-    choice = next(cur, None)
-    if not choice:
-        raise HTTPException(404, "No word found")
-
-    # write to wod_history (one per day)
-    db.wod_history.update_one(
-        {"date": today},
-        {"$set": {"date": today, "wordId": choice["_id"], "word": choice.get("word"), "createdAt": _iso_now()}},
-        upsert=True,
-    )
-
-    return {"word": {"date": today, **_norm_word(choice)}}
+            # reset the pool if we ran through everything
+            query = {}
+            remaining = db.wod_words.count_documents({})
+            if remaining == 0:
+                raise HTTPException(404, "wod_words collection is empty")
+
+        skip = random.randint(0, remaining - 1)
+        cur = db.wod_words.find(query).skip(skip).limit(1)
+        choice = next(cur, None)
+        if not choice:
+            raise HTTPException(404, "No word found")
+
+        # write to wod_history (one per day); $setOnInsert so a concurrent pick in
+        # another worker wins consistently instead of being overwritten
+        db.wod_history.update_one(
+            {"date": today},
+            {"$setOnInsert": {"date": today, "wordId": choice["_id"], "word": choice.get("word"), "createdAt": _iso_now()}},
+            upsert=True,
+        )
+        hist = db.wod_history.find_one({"date": today}) or {}
+        if hist.get("wordId") != choice["_id"]:
+            choice = db.wod_words.find_one({"_id": hist.get("wordId")}) or {"word": hist.get("word")}
+
+        return {"word": {"date": today, **_norm_word(choice)}}
+
+    # same word for everyone until midnight
+    return http_cache.cached_json(request, ("content.wod", today), build_today,
+                                  max_age=http_cache.seconds_until_midnight())
 
 @router.get("/content/word-of-the-day/history")
 def word_of_the_day_history(request: Request, limit: int = Query(7, ge=1, le=30)):
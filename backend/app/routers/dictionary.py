@@ -1,22 +1,23 @@
-from fastapi import APIRouter, HTTPException, Query, Request
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from pydantic import BaseModel, Field
 from typing import List, Optional, Literal, Dict, Any
 from datetime import datetime
-import re, json, os
-
-from .ai import _openai_client, _model, SYSTEM_PROMPT
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio, re, json, os, threading
+
+from .ai import _get_async_client, _openai_client, _model, SYSTEM_PROMPT
+from ..loaders.dictionary import (
+    DICT_COLL as _DICT_COLL, FIELD_CANDS as _FIELD_CANDS, KEY_FIELD as _KEY_FIELD,
+    doc_keys, norm_key, prefix_range,
+)
+from ..loaders.state import loader_state, on_dictionary_reload
+from ..cache import TTLCache
+from .. import http_cache, llm
+from ..events import emit as _emit_event, emit_many as _emit_events, make_event
+from ..recent_searches import load_recent
 
 router = APIRouter(prefix="/dictionary", tags=["dictionary"])
 
-# allow overriding the collection name (default "dictionary")
-_DICT_COLL = os.getenv("DICT_COLLECTION", "dictionary")
-
-# candidate fields per direction (covers casing/aliases)
-_FIELD_CANDS = {
-    "en-so": ["Headword", "English", "headword", "english", "EN", "Word_EN", "word_en"],
-    "so-en": ["Somali", "SO", "somali", "Word_SO", "word_so"],
-}
-
 # ---------- models
 class WordOut(BaseModel):
     word: str
@@ -31,30 +32,94 @@ class WordOut(BaseModel):
     usageNote: Optional[str] = None
     examples: List[str] = []
     ai: Optional[bool] = False
+    fuzzy: Optional[bool] = False   # matched a near spelling, not the term itself
+    pending: Optional[bool] = False  # AI enrichment is running; re-fetch later for the full entry
+
+class SearchHit(BaseModel):
+    entry: WordOut
+    score: float
+
+class SearchOut(BaseModel):
+    query: str
+    results: List[SearchHit]
+    offset: int
+    limit: int
+    hasMore: bool
+
+class BatchLookupIn(BaseModel):
+    terms: List[str] = Field(..., min_length=1, max_length=500)
+    dir: Literal["en-so", "so-en"] = "en-so"
+
+class BatchLookupItem(BaseModel):
+    term: str
+    found: bool
+    entry: Optional[WordOut] = None
+
+class BatchLookupOut(BaseModel):
+    dir: str
+    results: List[BatchLookupItem]
+    misses: List[str] = []
 
 # ---------- helpers
-def _get(doc: Dict[str, Any], *names: str) -> Optional[Any]:
+def _aliases(*names: str) -> set:
     keys = {n for n in names}
     for n in list(keys):
         keys |= {n.lower(), n.upper(), n.title(), n.replace(" ", ""), n.replace(" ", "_")}
-    for k in doc.keys():
-        norm = k.replace("_", " ")
-        if k in keys or k.replace(" ", "") in keys or norm in keys:
-            v = doc.get(k)
-            if v not in (None, ""):
-                return v
+    return keys
+
+def _key_matches(k: str, keys: set) -> bool:
+    return k in keys or k.replace(" ", "") in keys or k.replace("_", " ") in keys
+
+# output field -> alias set, resolved once (not per lookup)
+_DOC_FIELDS: Dict[str, set] = {
+    "headword":       _aliases("Headword", "English", "EN", "Word_EN", "headword", "english", "word_en"),
+    "somali":         _aliases("Somali", "SO", "Word_SO", "Somali Translation", "somali", "word_so"),
+    "part_of_speech": _aliases("Part of Speech", "POS", "partOfSpeech"),
+    "pronunciation":  _aliases("Pronunciation", "pronunciation", "Pron"),
+    "word_forms":     _aliases("Word Forms", "wordForms"),
+    "phrase":         _aliases("Phrase"),
+    "usage_note":     _aliases("Usage Note", "usageNote"),
+    "meaning":        _aliases("Meaning", "Definition", "definition"),
+    "examples_raw":   _aliases("Example", "Examples"),
+}
+
+# key layout (tuple of doc keys, in order) -> output field -> matching keys.
+# Imports produce only a handful of layouts, so after warm-up every
+# _doc_to_out is a few dict gets. Cleared wholesale if it ever grows large.
+_LAYOUT_CACHE_MAX = 512
+_layouts: Dict[tuple, Dict[str, tuple]] = {}
+
+def _accessors(doc: Dict[str, Any]) -> Dict[str, tuple]:
+    layout = tuple(doc.keys())
+    acc = _layouts.get(layout)
+    if acc is None:
+        acc = {
+            field: tuple(k for k in layout if isinstance(k, str) and _key_matches(k, keys))
+            for field, keys in _DOC_FIELDS.items()
+        }
+        if len(_layouts) >= _LAYOUT_CACHE_MAX:
+            _layouts.clear()
+        _layouts[layout] = acc
+    return acc
+
+def _pick(doc: Dict[str, Any], keys: tuple) -> Optional[Any]:
+    for k in keys:
+        v = doc.get(k)
+        if v not in (None, ""):
+            return v
     return None
 
 def _doc_to_out(doc: Dict[str, Any], direction: str) -> WordOut:
-    headword       = _get(doc, "Headword", "English", "EN", "Word_EN", "headword", "english", "word_en")
-    somali         = _get(doc, "Somali", "SO", "Word_SO", "Somali Translation", "somali", "word_so")
-    part_of_speech = _get(doc, "Part of Speech", "POS", "partOfSpeech")
-    pronunciation  = _get(doc, "Pronunciation", "pronunciation", "Pron")
-    word_forms     = _get(doc, "Word Forms", "wordForms")
-    phrase         = _get(doc, "Phrase")
-    usage_note     = _get(doc, "Usage Note", "usageNote")
-    meaning        = _get(doc, "Meaning", "Definition", "definition")
-    examples_raw   = _get(doc, "Example", "Examples")
+    acc = _accessors(doc)
+    headword       = _pick(doc, acc["headword"])
+    somali         = _pick(doc, acc["somali"])
+    part_of_speech = _pick(doc, acc["part_of_speech"])
+    pronunciation  = _pick(doc, acc["pronunciation"])
+    word_forms     = _pick(doc, acc["word_forms"])
+    phrase         = _pick(doc, acc["phrase"])
+    usage_note     = _pick(doc, acc["usage_note"])
+    meaning        = _pick(doc, acc["meaning"])
+    examples_raw   = _pick(doc, acc["examples_raw"])
 
     examples: List[str] = []
     if isinstance(examples_raw, list):
@@ -110,9 +175,7 @@ def _parse_ai_json(reply: str) -> Optional[Dict[str, Any]]:
     except Exception:
         return None
 
-def _ai_backfill(term: str, direction: str, base: WordOut) -> Optional[WordOut]:
-    client = _openai_client()
-
+def _backfill_messages(term: str, direction: str, base: WordOut) -> List[Dict[str, str]]:
     known = {}
     for k in ["word", "headword", "somaliTranslation", "meaning", "partOfSpeech",
               "pronunciation", "wordForms", "phrase", "usageNote", "examples"]:
@@ -131,12 +194,11 @@ def _ai_backfill(term: str, direction: str, base: WordOut) -> Optional[WordOut]:
         "For any field present in the known data, repeat the same value. Respond with JSON only."
     )
 
-    resp = client.chat.completions.create(
-        model=_model(), temperature=0.2,
-        messages=[{"role":"system","content":SYSTEM_PROMPT},
-                  {"role":"user","content":prompt}]
-    )
-    data = _parse_ai_json((resp.choices[0].message.content or "").strip())
+    return [{"role":"system","content":SYSTEM_PROMPT},
+            {"role":"user","content":prompt}]
+
+def _merge_backfill(base: WordOut, reply: str) -> Optional[WordOut]:
+    data = _parse_ai_json(reply.strip())
     if not data:
         return None
 
@@ -161,10 +223,145 @@ def _ai_backfill(term: str, direction: str, base: WordOut) -> Optional[WordOut]:
     except Exception:
         return None
 
+def _ai_backfill(term: str, direction: str, base: WordOut) -> Optional[WordOut]:
+    resp = _openai_client("backfill").chat.completions.create(
+        model=_model(), temperature=0.2, messages=_backfill_messages(term, direction, base),
+    )
+    return _merge_backfill(base, resp.choices[0].message.content or "")
+
+async def _ai_backfill_async(term: str, direction: str, base: WordOut) -> Optional[WordOut]:
+    client = _get_async_client("backfill")
+    # backfill gets a share of the provider budget so it can't starve chat
+    async with llm.limit("openai:backfill"), llm.limit("openai"):
+        resp = await client.chat.completions.create(
+            model=_model(), temperature=0.2, messages=_backfill_messages(term, direction, base),
+        )
+    return _merge_backfill(base, resp.choices[0].message.content or "")
+
+# browsers/CDN may reuse a resolved entry this long; the key includes the
+# dictionary version, so a re-import is picked up by the next miss
+_LOOKUP_MAX_AGE = int(os.getenv("DICT_LOOKUP_MAX_AGE", "300"))
+
+# headword behind each cached lookup body, so a hit can be logged without re-parsing it
+_cached_word = TTLCache(maxsize=int(os.getenv("HTTP_CACHE_SIZE", "4096")), ttl=float(_LOOKUP_MAX_AGE))
+
+def _log_search(request: Request, db, word: str, dir: str, found: bool, source: str,
+                backfilled: bool = False, pending: bool = False) -> None:
+    # queued only: term_stats and recent_searches are folded in when the buffer flushes
+    try:
+        _emit_event(db, make_event(_sid(request), "word_lookup", {
+            "word": word,
+            "dir": dir,
+            "found": found,
+            "source": source,
+            "backfilled": backfilled,
+            "pending": pending,
+        }))
+    except Exception:
+        pass
+
+# ---------- negative cache: (normalized term, dir) pairs known to be missing
+_misses = TTLCache(
+    maxsize=int(os.getenv("DICT_MISS_CACHE_SIZE", "50000")),
+    ttl=float(os.getenv("DICT_MISS_CACHE_TTL", "600")),
+)
+on_dictionary_reload(_misses.clear)  # a re-import may add the word
+
+# ---------- background AI backfill (single-flight per (term, dir))
+_BACKFILL_WORKERS = int(os.getenv("AI_BACKFILL_WORKERS", "4"))
+_BACKFILL_MAX_INFLIGHT = int(os.getenv("AI_BACKFILL_MAX_INFLIGHT", "64"))
+_backfill_pool = ThreadPoolExecutor(max_workers=_BACKFILL_WORKERS, thread_name_prefix="ai-backfill")
+_inflight: Dict[tuple, Future] = {}
+_inflight_lock = threading.Lock()
+# (key, dir) whose last enrichment failed or came back unusable; not retried
+# until this expires, so a popular incomplete word can't hammer the provider
+_backfill_failed = TTLCache(
+    maxsize=int(os.getenv("AI_BACKFILL_FAIL_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("AI_BACKFILL_FAIL_TTL", "900")),
+)
+
+def _save_backfill(db, key: str, direction: str, filled: WordOut) -> None:
+    db.get_collection("ai_cache").update_one(
+        {"term": key, "dir": direction, "kind": "backfill"},
+        {"$set": {"entry": filled.model_dump(exclude={"fuzzy", "pending"}), "ts": datetime.utcnow()}},
+        upsert=True,
+    )
+
+def _run_backfill(db, key: str, term: str, direction: str, base: WordOut) -> Optional[WordOut]:
+    filled = _ai_backfill(term, direction, base)
+    if filled:
+        _save_backfill(db, key, direction, filled)
+    return filled
+
+async def _run_backfill_async(db, key: str, term: str, direction: str, base: WordOut) -> Optional[WordOut]:
+    filled = await _ai_backfill_async(term, direction, base)
+    if filled:
+        await asyncio.to_thread(_save_backfill, db, key, direction, filled)
+    return filled
+
+def _schedule_backfill(db, key: str, term: str, direction: str, base: WordOut) -> bool:
+    """
+    Start (or join) the enrichment job for ``(key, direction)``. Concurrent
+    lookups of the same word share one provider call. Returns True only if a
+    job is actually running: False without a provider key, while a recent
+    failure for this word is remembered, or when the queue is full.
+
+    Under the API server the job is a coroutine on the event loop (see
+    llm.submit); without a bound loop (scripts) it falls back to the pool.
+    """
+    k = (key, direction)
+    if not llm.api_key() or _backfill_failed.get(k, False):
+        return False
+    with _inflight_lock:
+        if k in _inflight:
+            return True
+        if len(_inflight) >= _BACKFILL_MAX_INFLIGHT:
+            return False
+        fut = llm.submit(_run_backfill_async(db, key, term, direction, base))
+        if fut is None:
+            fut = _backfill_pool.submit(_run_backfill, db, key, term, direction, base)
+        _inflight[k] = fut
+
+    def _done(f: Future) -> None:
+        with _inflight_lock:
+            _inflight.pop(k, None)
+        if f.cancelled() or f.exception() is not None or f.result() is None:
+            _backfill_failed.set(k)
+
+    fut.add_done_callback(_done)
+    return True
+
+def _suggest_mongo(db, key: str, dir: str, limit: int) -> List[str]:
+    """Fallback used until the in-process prefix index has been built."""
+    coll = db[_DICT_COLL]
+    field_candidates = _FIELD_CANDS[dir]
+    kf = _KEY_FIELD[dir]
+
+    out: List[str] = []
+    seen = set()
+    proj = {f: 1 for f in field_candidates}
+    proj["_id"] = 0
+    cur = coll.find({kf: prefix_range(key)}, proj).sort(kf, 1).limit(limit * 3)
+    for d in cur:
+        # report the stored spelling of whichever alias actually matched
+        for field in field_candidates:
+            s = d.get(field)
+            if not s:
+                continue
+            s = str(s)
+            nk = norm_key(s)
+            if nk.startswith(key) and nk not in seen:
+                seen.add(nk)
+                out.append(s)
+        if len(out) >= limit:
+            break
+    return out[:limit]
+
 # ---------- endpoints
 @router.get("/lookup", response_model=WordOut)
 def lookup(
     request: Request,
+    response: Response,
     term: str = Query(..., min_length=1),
     dir: Literal["en-so", "so-en"] = Query("en-so"),
 ):
@@ -180,54 +377,113 @@ def lookup(
     out: Optional[WordOut] = None
     source = "mongo"
 
-    fields = _FIELD_CANDS["en-so" if dir == "en-so" else "so-en"]
-    exact = coll.find_one({"$or": [{f: {"$regex": f"^{re.escape(q)}$", "$options": "i"}} for f in fields]})
-    pref  = None if exact else coll.find_one({"$or": [{f: {"$regex": f"^{re.escape(q)}",  "$options": "i"}} for f in fields]})
+    key = norm_key(q)
+    kf = _KEY_FIELD[dir]
+
+    ck = ("dictionary.lookup", loader_state.dictionary_version, key, dir)
+    hit = http_cache.get(ck)
+    if hit is not None:
+        _log_search(request, db, _cached_word.get(ck) or q, dir, True, "http-cache")
+        return http_cache.respond(request, hit, _LOOKUP_MAX_AGE)
+
+    known_miss = _misses.get((key, dir), False)
+    if known_miss:
+        exact = pref = None
+    else:
+        exact = coll.find_one({kf: key})
+        pref  = None if exact else coll.find_one({kf: prefix_range(key)}, sort=[(kf, 1)])
     doc = exact or pref
+    matched_fuzzy = False
+    if not doc and not known_miss:
+        # typo fallback: closest headword from the in-process delete index
+        fz = loader_state.dictionary_fuzzy.get(dir)
+        hits = fz.search(q, limit=1) if fz is not None else []
+        if hits:
+            doc = coll.find_one({kf: hits[0][1]})
+            matched_fuzzy = doc is not None
     if doc:
         out = _doc_to_out(doc, dir)
+        if matched_fuzzy:
+            out.fuzzy = True
+            source = "mongo+fuzzy"
 
     backfilled = False
-    if out and _needs_backfill(out):
+    incomplete = bool(out and _needs_backfill(out))
+    if incomplete:
+        # never block on the provider: serve the Mongo entry now, enrich in the background
+        bkey = norm_key(out.word) or key
         try:
-            cache = db.get_collection("ai_cache")
-            cached = cache.find_one({"term": q.lower(), "dir": dir, "kind": "backfill"})
+            cached = db.get_collection("ai_cache").find_one({"term": bkey, "dir": dir, "kind": "backfill"})
             if cached and "entry" in cached:
-                filled = WordOut(**cached["entry"])
-            else:
-                filled = _ai_backfill(q, dir, out)
-                if filled:
-                    cache.update_one(
-                        {"term": q.lower(), "dir": dir, "kind": "backfill"},
-                        {"$set": {"entry": filled.model_dump(), "ts": datetime.utcnow()}},
-                        upsert=True,
-                    )
-            if filled:
-                out = filled
+                out = WordOut(**{**cached["entry"], "fuzzy": out.fuzzy})
                 backfilled = True
                 source = "mongo+ai"
+            else:
+                out.pending = _schedule_backfill(db, bkey, out.word or q, dir, out.model_copy())
         except Exception:
             pass
 
-    try:
-        db.events.insert_one({
-            "sessionId": _sid(request),
-            "type": "word_searched",
-            "at": datetime.utcnow(),
-            "meta": {
-                "word": (out.word if out else q),
-                "dir": dir,
-                "found": bool(out),
-                "source": source,
-                "backfilled": backfilled,
-            },
-        })
-    except Exception:
-        pass
+    _log_search(request, db, (out.word if out else q), dir, bool(out),
+                "miss-cache" if known_miss else source, backfilled, bool(out and out.pending))
 
     if not out:
+        if not known_miss:
+            _misses.set((key, dir))
         raise HTTPException(status_code=404, detail="Word not found")
-    return out
+    if out.pending:
+        # the enriched entry replaces this one shortly; don't let anyone cache it.
+        # Incomplete entries nobody is enriching are cached like any other.
+        response.headers["Cache-Control"] = "no-store"
+        return out
+    _cached_word.set(ck, out.word or q)
+    return http_cache.respond(request, http_cache.put(ck, out, ttl=_LOOKUP_MAX_AGE), _LOOKUP_MAX_AGE)
+
+@router.post("/lookup/batch", response_model=BatchLookupOut)
+def lookup_batch(request: Request, payload: BatchLookupIn):
+    """
+    Resolve many terms (e.g. every word in a reading passage) with one $in
+    query on the normalized keys. Exact matches only -- no prefix, fuzzy or
+    AI backfill -- so the cost stays one round trip regardless of size.
+    """
+    db = request.app.state.db
+    if db is None:
+        raise HTTPException(503, "DB not ready")
+
+    dir = payload.dir
+    kf = _KEY_FIELD[dir]
+    terms = [t.strip() for t in payload.terms if t and t.strip()]
+    keys = list(dict.fromkeys(norm_key(t) for t in terms))
+
+    by_key: Dict[str, WordOut] = {}
+    if keys:
+        for doc in db[_DICT_COLL].find({kf: {"$in": keys}}):
+            entry = _doc_to_out(doc, dir)
+            for k in doc.get(kf) or doc_keys(doc)[kf]:
+                by_key.setdefault(k, entry)
+
+    results: List[BatchLookupItem] = []
+    misses: List[str] = []
+    for t in terms:
+        entry = by_key.get(norm_key(t))
+        results.append(BatchLookupItem(term=t, found=entry is not None, entry=entry))
+        if entry is None:
+            misses.append(t)
+
+    if results:
+        sid = _sid(request)
+        try:
+            _emit_events(db, [make_event(sid, "word_lookup", {
+                "word": (r.entry.word if r.entry else r.term),
+                "dir": dir,
+                "found": r.found,
+                "source": "mongo",
+                "backfilled": False,
+                "batch": True,
+            }) for r in results])
+        except Exception:
+            pass
+
+    return BatchLookupOut(dir=dir, results=results, misses=misses)
 
 @router.get("/suggest", response_model=List[str])
 def suggest(
@@ -235,69 +491,89 @@ def suggest(
     term: str = Query(..., min_length=1),
     dir: Literal["en-so", "so-en"] = Query("en-so"),
     limit: int = Query(5, ge=1, le=20),
+    fuzzy: bool = Query(False, description="pad prefix matches with near spellings"),
 ):
     db = request.app.state.db
-    if db is None:
-        raise HTTPException(503, "DB not ready")
-
     q = term.strip()
     if not q:
         return []
+    key = norm_key(q)
 
-    coll = db[_DICT_COLL]
-    field_candidates = _FIELD_CANDS["en-so" if dir == "en-so" else "so-en"]
-
-    out: List[str] = []
-    seen = set()
-    for field in field_candidates:
-        cur = coll.find(
-            {field: {"$regex": f"^{re.escape(q)}", "$options": "i"}},
-            {field: 1, "_id": 0}
-        ).limit(limit * 3)
-        for d in cur:
-            s = d.get(field)
-            if s:
-                s = str(s)
-                if s.lower() not in seen:
-                    seen.add(s.lower())
-                    out.append(s)
+    index = loader_state.dictionary.get(dir)
+    if index is not None:
+        out = index.complete(key, limit)
+    elif db is None:
+        raise HTTPException(503, "DB not ready")
+    else:
+        out = _suggest_mongo(db, key, dir, limit)
+
+    fz = loader_state.dictionary_fuzzy.get(dir) if fuzzy else None
+    if fz is not None and len(out) < limit:
+        seen = {norm_key(s) for s in out}
+        for _, k, text in fz.search(q, limit=limit):
+            if k not in seen:
+                seen.add(k)
+                out.append(text)
             if len(out) >= limit:
                 break
-        if len(out) >= limit:
-            break
 
-    try:
-        db.events.insert_one({
-            "sessionId": _sid(request),
-            "type": "word_suggest",
-            "at": datetime.utcnow(),
-            "meta": {"word": q, "dir": dir, "found": bool(out)},
-        })
-    except Exception:
-        pass
+    if db is not None:
+        try:
+            _emit_event(db, make_event(_sid(request), "word_suggest",
+                                       {"word": q, "dir": dir, "found": bool(out), "fuzzy": fuzzy}))
+        except Exception:
+            pass
 
     return out
 
+@router.get("/search", response_model=SearchOut)
+def search(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    dir: Literal["en-so", "so-en"] = Query("en-so"),
+    offset: int = Query(0, ge=0, le=1000),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Reverse lookup: find headwords whose Somali gloss, meaning, usage note or
+    examples mention the query. Backed by the weighted ``text`` index written
+    at ingest; results ranked by text score.
+    """
+    db = request.app.state.db
+    if db is None:
+        raise HTTPException(503, "DB not ready")
+
+    text = q.strip()
+    if not text:
+        raise HTTPException(400, "Empty query")
+
+    cur = (
+        db[_DICT_COLL]
+        .find({"$text": {"$search": text}}, {"score": {"$meta": "textScore"}, "text": 0})
+        .sort([("score", {"$meta": "textScore"})])
+        .skip(offset)
+        .limit(limit + 1)   # one extra to know whether there is a next page
+    )
+    docs = list(cur)
+    results = [SearchHit(entry=_doc_to_out(d, dir), score=round(float(d.get("score") or 0), 4))
+               for d in docs[:limit]]
+    return SearchOut(query=text, results=results, offset=offset, limit=limit, hasMore=len(docs) > limit)
+
 @router.get("/recent", response_model=List[str])
 def recent(request: Request, limit: int = Query(10, ge=1, le=50)):
     db = request.app.state.db
     if db is None:
         raise HTTPException(503, "DB not ready")
 
-    sid = _sid(request)
-    cur = db.events.find({"sessionId": sid, "type": "word_searched"}, {"meta.word": 1, "_id": 0}).sort("at", -1).limit(200)
-
-    seen: set[str] = set()
-    out: List[str] = []
-    for doc in cur:
-        w = (doc.get("meta") or {}).get("word")
-        if not w:
-            continue
-        lw = w.lower()
-        if lw in seen:
-            continue
-        seen.add(lw)
-        out.append(w)
-        if len(out) >= limit:
-            break
-    return out
+    return load_recent(db, _sid(request), limit)
+
+@router.get("/stats")
+def stats():
+    """In-process cache and index counters for this worker."""
+    return {
+        "missCache": _misses.stats(),
+        "responseCache": http_cache.stats(),
+        "dictionaryVersion": loader_state.dictionary_version,
+        "prefixIndex": {d: len(i) for d, i in loader_state.dictionary.items()},
+        "fuzzyIndex": {d: len(i) for d, i in loader_state.dictionary_fuzzy.items()},
+    }
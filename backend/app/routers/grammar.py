@@ -1,24 +1,40 @@
 from fastapi import APIRouter, HTTPException, Query, Request
+import os
+
+from .. import http_cache
+from ..loaders.state import content_version
 
 router = APIRouter()
 
+# grammar content only changes on import; let browsers/CDN keep it a while.
+# Keys carry the import's version stamp, so a re-import is served on the next miss
+_MAX_AGE = int(os.getenv("GRAMMAR_CACHE_MAX_AGE", "600"))
+
 @router.get("/grammar/topics")
 def list_topics(request: Request):
     db = request.app.state.db
     if db is None:
         raise HTTPException(503, "DB not ready")
-    cur = db.grammar_topics.find({}, {"_id": 0}).sort([("order", 1), ("slug", 1)])
-    return {"topics": list(cur)}
+
+    def build():
+        cur = db.grammar_topics.find({}, {"_id": 0}).sort([("order", 1), ("slug", 1)])
+        return {"topics": list(cur)}
+
+    return http_cache.cached_json(request, ("grammar.topics", content_version("grammar")), build, max_age=_MAX_AGE)
 
 @router.get("/grammar/tips")
 def get_tips(request: Request, topic: str = Query(...)):
     db = request.app.state.db
     if db is None:
         raise HTTPException(503, "DB not ready")
-    doc = db.grammar_tips.find_one({"topic": topic}, {"_id": 0})
-    if not doc:
-        raise HTTPException(status_code=404, detail="No tips found for topic")
-    return doc
+
+    def build():
+        doc = db.grammar_tips.find_one({"topic": topic}, {"_id": 0})
+        if not doc:
+            raise HTTPException(status_code=404, detail="No tips found for topic")
+        return doc
+
+    return http_cache.cached_json(request, ("grammar.tips", content_version("grammar"), topic), build, max_age=_MAX_AGE)
 
 @router.get("/grammar/test")
 def get_test(request: Request, topic: str = Query(...)):
@@ -1,10 +1,19 @@
-from fastapi import APIRouter, HTTPException, Request, Query, Header
-from datetime import date, datetime
+from fastapi import APIRouter, HTTPException, Request, Query, Header, Response
+from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 import re  # NEW: for safely unwrapping accidental code fences
+import asyncio
+import hashlib
+import json
+import os
+
+from .. import http_cache, llm
+from ..cache import TTLCache
+from ..card_cache import normalize
+from ..events import emit as _emit_event, make_event
 
 # Reuse your OpenAI helpers & system prompt from ai.py (no duplication)
-from .ai import _openai_client, _model, SYSTEM_PROMPT  # type: ignore
+from .ai import _get_async_client, _model, SYSTEM_PROMPT  # type: ignore
 
 router = APIRouter()
 
@@ -31,46 +40,53 @@ def _week_index(today: Optional[date] = None) -> tuple[int, int]:
     iso = d.isocalendar()  # (year, week, weekday)
     return (iso[0], iso[1])  # (year, week)
 
+def _pick(col, year: int, week: int, total: int) -> Dict[str, Any]:
+    # deterministic rotation across your whole set
+    idx = (year * 53 + week) % total
+    return col.find({}, {"_id": 1, "idiom": 1, "meaning": 1, "example": 1, "somali": 1, "somaliTranslation": 1,
+                         "origin": 1, "etymology": 1, "pronunciation": 1}) \
+              .sort([("_id", 1)]).skip(idx).limit(1).next()
+
 @router.get("/idioms/current")
 def idiom_of_the_week(request: Request, x_session_id: str = Header(default="anon-session")):
     db = _db(request)
     col = db["idiom_entries"]
+    year, week = _week_index()
 
-    total = col.estimated_document_count()
-    if total == 0:
-        raise HTTPException(404, "No idioms in database")
+    def build():
+        total = col.estimated_document_count()
+        if total == 0:
+            raise HTTPException(404, "No idioms in database")
 
-    year, week = _week_index()
-    # deterministic rotation across your whole set
-    idx = (year * 53 + week) % total
+        out = _normalize(_pick(col, year, week, total))
+        out["weekLabel"] = f"Week {week}, {year}"
+        # new week (or new worker): get the explanation ready before anyone asks
+        schedule_prewarm(db, [out["idiom"]])
+        return out
 
-    doc = col.find({}, {"_id": 1, "idiom": 1, "meaning": 1, "example": 1, "somali": 1, "somaliTranslation": 1,
-                        "origin": 1, "etymology": 1, "pronunciation": 1}) \
-             .sort([("_id", 1)]).skip(idx).limit(1).next()
-    out = _normalize(doc)
-    out["weekLabel"] = f"Week {week}, {year}"
+    # same idiom for everyone until the ISO week rolls over
+    max_age = http_cache.seconds_until_week_rollover()
+    key = ("idioms.current", year, week)
+    entry = http_cache.get(key) or http_cache.put(key, build(), ttl=max_age)
+    out = json.loads(entry[0])
 
     # optional analytics
     try:
-        db["events"].insert_one({
-            "sessionId": x_session_id or "anon",
-            "type": "idiom_of_week_viewed",
-            "at": datetime.utcnow().isoformat(),
-            "meta": {"idiom": out["idiom"], "week": week, "year": year}
-        })
+        _emit_event(db, make_event(x_session_id or "anon", "idiom_of_week_viewed",
+                                   {"idiom": out["idiom"], "week": week, "year": year}))
     except Exception:
         pass
 
-    return out
+    return http_cache.respond(request, entry, max_age)
 # OLD (breaks, because ai.py isn't in app.routes)
 # from .ai import _openai_client, _model, SYSTEM_PROMPT  # type: ignore
 
 # NEW (works no matter what)
 # in backend/app/routers/idioms.py OR backend/app/routes/idioms.py
 try:
-    from app.routers.ai import _openai_client, _model, SYSTEM_PROMPT
+    from app.routers.ai import _get_async_client, _model, SYSTEM_PROMPT
 except Exception:
-    from ..routers.ai import _openai_client, _model, SYSTEM_PROMPT
+    from ..routers.ai import _get_async_client, _model, SYSTEM_PROMPT
 
 @router.get("/idioms/archive")
 def idiom_archive(
@@ -88,22 +104,18 @@ def idiom_archive(
     items = [_normalize(d) for d in cur]
     return {"items": items, "skip": skip, "limit": limit}
 
-@router.get("/idioms/explain")
-def explain_idiom(request: Request, idiom: str = Query(..., min_length=2)):
-    """
-    Uses your existing OpenAI setup to produce a friendly explanation.
-    Returns a clean Markdown card (no code fences) with fixed headings,
-    so the UI renders like the “AI Explanation” style you liked.
-    """
-    try:
-        client = _openai_client()
+# ---------- explanation cache: one persistent doc per normalized idiom
+EXPLAIN_COLL = "idiom_explanations"
+PREWARM_NEXT = os.getenv("IDIOM_PREWARM_NEXT", "1") == "1"
+
+_explained = TTLCache(maxsize=512, ttl=float(os.getenv("IDIOM_EXPLAIN_LRU_TTL", "3600")))
+_inflight: Dict[str, "asyncio.Task[str]"] = {}  # touched on the server loop only
 
-        # Ask for the exact card sections you want, letting SYSTEM_PROMPT handle voice/tone.
-        msg_user = f"""
+_EXPLAIN_TEMPLATE = """
 Create a clean Markdown “AI Explanation” card for the idiom "{idiom}".
 
 Use EXACTLY these headings and order (in English):
-# {idiom.title()}
+# {title}
 ## Simple Explanation
 <one short paragraph; very learner-friendly>
 
@@ -127,7 +139,34 @@ Rules:
 - If IPA is uncertain, give an approximate hint anyway.
 """.strip()
 
-        resp = client.chat.completions.create(
+def _idiom_key(idiom: str) -> str:
+    return normalize(idiom).strip(" .!?;:,")
+
+def _prompt_version() -> str:
+    # stored with each explanation; a prompt or model change regenerates it
+    text = "\x00".join((_model(), SYSTEM_PROMPT, _EXPLAIN_TEMPLATE))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+async def _stored_explanation(db, key: str) -> Optional[str]:
+    text = _explained.get(key)
+    if text is not None or db is None:
+        return text
+    try:
+        doc = await asyncio.to_thread(db[EXPLAIN_COLL].find_one,
+                                      {"_id": key, "version": _prompt_version()}, {"explanation": 1})
+    except Exception:
+        return None
+    if doc:
+        _explained.set(key, doc["explanation"])
+        return doc["explanation"]
+    return None
+
+async def _generate(db, idiom: str, key: str) -> str:
+    client = _get_async_client("idioms")
+    # Ask for the exact card sections you want, letting SYSTEM_PROMPT handle voice/tone.
+    msg_user = _EXPLAIN_TEMPLATE.format(idiom=idiom, title=idiom.title())
+    async with llm.limit("openai"):
+        resp = await client.chat.completions.create(
             model=_model(),
             temperature=0.3,
             messages=[
@@ -135,14 +174,108 @@ Rules:
                 {"role": "user", "content": msg_user},
             ],
         )
-        text = (resp.choices[0].message.content or "").strip()
+    text = (resp.choices[0].message.content or "").strip()
+
+    # If the model accidentally used code fences, unwrap them.
+    m = re.search(r"```(?:markdown|md)?\s*(.*?)```", text, flags=re.S | re.I)
+    if m:
+        text = m.group(1).strip()
+    if not text:
+        # never store or serve a blank card; the next request tries again
+        raise RuntimeError("empty explanation from the model")
 
-        # If the model accidentally used code fences, unwrap them.
-        m = re.search(r"```(?:markdown|md)?\s*(.*?)```", text, flags=re.S | re.I)
-        if m:
-            text = m.group(1).strip()
+    _explained.set(key, text)
+    if db is not None:
+        try:
+            await asyncio.to_thread(db[EXPLAIN_COLL].update_one, {"_id": key}, {"$set": {
+                "idiom": idiom, "explanation": text, "version": _prompt_version(),
+                "model": _model(), "createdAt": datetime.now(timezone.utc),
+            }}, upsert=True)
+        except Exception:
+            pass  # still served from memory; regenerated by the next worker that misses
+    return text
 
+def _explanation(db, idiom: str) -> "asyncio.Future[str]":
+    """
+    Join (or start) the generation for ``idiom``. It runs as its own task, so
+    concurrent misses share one provider call and a client disconnecting
+    doesn't throw the answer away.
+    """
+    key = _idiom_key(idiom)
+    task = _inflight.get(key)
+    if task is None:
+        task = _inflight[key] = asyncio.ensure_future(_generate(db, idiom, key))
+
+        def _done(t: "asyncio.Task[str]") -> None:
+            _inflight.pop(key, None)
+            if not t.cancelled():
+                t.exception()  # retrieved; the waiting request (if any) reports it
+
+        task.add_done_callback(_done)
+    return asyncio.shield(task)
+
+async def _prewarm(db, idioms: List[str]) -> None:
+    for idiom in idioms:
+        try:
+            if await _stored_explanation(db, _idiom_key(idiom)) is None:
+                await _explanation(db, idiom)
+        except Exception:
+            pass  # best effort: the first request joins a fresh attempt
+
+def schedule_prewarm(db, idioms: List[str], today: Optional[date] = None) -> None:
+    """
+    Pre-generate explanations on the server loop, off the request path. With
+    IDIOM_PREWARM_NEXT=1 (default) next week's idiom is included, so the
+    rollover itself is already warm. Callable from any thread.
+    """
+    idioms = [i for i in idioms if i]
+    if PREWARM_NEXT and db is not None:
+        try:
+            col = db["idiom_entries"]
+            total = col.estimated_document_count()
+            if total:
+                year, week = _week_index((today or date.today()) + timedelta(days=7))
+                idioms.append(_normalize(_pick(col, year, week, total))["idiom"])
+        except Exception:
+            pass
+    if idioms:
+        llm.submit(_prewarm(db, idioms))
+
+def prewarm_current(db) -> None:
+    """Startup hook: warm this week's (and next week's) idiom."""
+    if db is None:
+        return
+    try:
+        col = db["idiom_entries"]
+        total = col.estimated_document_count()
+        if total:
+            year, week = _week_index()
+            schedule_prewarm(db, [_normalize(_pick(col, year, week, total))["idiom"]])
+    except Exception:
+        pass
+
+@router.get("/idioms/explain")
+async def explain_idiom(request: Request, response: Response, idiom: str = Query(..., min_length=2)):
+    """
+    Uses your existing OpenAI setup to produce a friendly explanation.
+    Returns a clean Markdown card (no code fences) with fixed headings,
+    so the UI renders like the “AI Explanation” style you liked.
+
+    Explanations are stored per normalized idiom in ``idiom_explanations``;
+    the idiom of the week is generated in the background when the week
+    rolls over (see schedule_prewarm), so its requests are always hits.
+    """
+    db = request.app.state.db
+    text = await _stored_explanation(db, _idiom_key(idiom))
+    response.headers["X-AI-Cache"] = "miss" if text is None else "hit"
+    if text is not None:
         return {"idiom": idiom, "explanation": text}
+    try:
+        return {"idiom": idiom, "explanation": await _explanation(db, idiom)}
+    except llm.UpstreamBusy:
+        raise HTTPException(status_code=503, detail="AI is busy, please retry shortly")
+    except HTTPException:
+        raise
     except Exception as e:
         msg = str(e)
         if "invalid_api_key" in msg or "Incorrect API key" in msg or "status code: 401" in msg:
@@ -5,11 +5,14 @@ import os
 from functools import lru_cache
 from typing import Any, Dict, List, Tuple
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
 from pymongo import MongoClient
 from dotenv import load_dotenv
 
+from .. import http_cache
+from ..loaders.state import content_version
+
 load_dotenv()
 
 router = APIRouter(tags=["tests"])
@@ -21,13 +24,8 @@ def _db():
     url = os.getenv("MONGO_URL", "mongodb://127.0.0.1:27017")
     name = os.getenv("MONGO_DB", "aasaasi_db")
     client = MongoClient(url)
-    db = client[name]
-    # helpful index (one doc per kind)
-    try:
-        db.tests.create_index("kind", unique=True, background=True)
-    except Exception:
-        pass
-    return db
+    # the unique index on kind is declared in app/indexes.py
+    return client[name]
 
 # ---- Models (response + request) -------------------------------------------
 
@@ -77,11 +75,17 @@ class SubmitResponse(BaseModel):
 # ---- Routes -----------------------------------------------------------------
 
 @router.get("/tests/kinds", response_model=KindsResponse, summary="List Kinds")
-def list_kinds() -> KindsResponse:
+def list_kinds(request: Request):
     """
     Returns available test kinds and item counts.
     Never crashes if some sections/items are missing.
+    Served through the response cache (ETag / 304), keyed on the ingest's
+    version stamp, so a re-ingest is picked up by the next miss.
     """
+    return http_cache.cached_json(request, ("tests.kinds", content_version("tests")), _list_kinds,
+                                  max_age=int(os.getenv("TESTS_CACHE_MAX_AGE", "600")))
+
+def _list_kinds() -> KindsResponse:
     db = _db()
     # project only the fields we need (avoids ObjectId serialization)
     docs = list(db.tests.find({}, {"_id": 0, "kind": 1, "sections.name": 1, "sections.items": 1}))
@@ -0,0 +1,71 @@
+# backend/app/term_stats.py
+"""
+Global dictionary lookup counters (collection ``term_stats``).
+
+One document per (normalized term, dir) with running ``lookups`` and
+``misses`` (lookups answered 404) counts. The counters are folded in from
+``word_lookup`` events as the event buffer writes them, so the top-N reads
+behind /analytics/top-terms and /analytics/misses are a single index walk
+instead of a scan of ``events``. Batch lookups are not counted, matching
+the recent-searches list.
+
+scripts/rebuild_term_stats.py recomputes the collection from the events
+still retained (see app/retention.py), so afterwards the totals cover only
+that window; run it if the event buffer's ``hookSkipped`` stat is non-zero.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List
+
+from pymongo import UpdateOne
+
+from .events import event_buffer, parse_ts
+from .loaders.dictionary import norm_key
+
+TERM_STATS_COLL = "term_stats"
+
+def term_stat_ops(events: Iterable[Dict[str, Any]]) -> List[UpdateOne]:
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for e in events:
+        if e.get("kind") != "word_lookup":
+            continue
+        p = e.get("payload") or {}
+        word = str(p.get("word") or "").strip()
+        term = norm_key(word)
+        if not term or p.get("batch"):
+            continue
+        g = groups.setdefault((term, p.get("dir") or "en-so"), {"lookups": 0, "misses": 0})
+        g["lookups"] += 1
+        if p.get("found") is False:
+            g["misses"] += 1
+        ts = parse_ts(e.get("ts"))
+        if ts >= g.get("lastAt", ts):
+            g["lastAt"], g["word"] = ts, word
+
+    now = datetime.now(timezone.utc)
+    return [
+        UpdateOne(
+            {"term": term, "dir": d},
+            {
+                "$inc": {"lookups": g["lookups"], "misses": g["misses"]},
+                "$max": {"lastAt": g["lastAt"]},
+                "$set": {"word": g["word"], "updatedAt": now},
+            },
+            upsert=True,
+        )
+        for (term, d), g in groups.items()
+    ]
+
+@event_buffer.on_write
+def apply_term_stats(db, events: Iterable[Dict[str, Any]], coll: str = TERM_STATS_COLL) -> int:
+    ops = term_stat_ops(events)
+    if ops:
+        db[coll].bulk_write(ops, ordered=False)
+    return len(ops)
+
+def top_terms(db, field: str, direction: str, limit: int) -> List[Dict[str, Any]]:
+    """Highest ``field`` ("lookups" or "misses") first; served by the (dir, field) index."""
+    cur = db[TERM_STATS_COLL].find(
+        {"dir": direction, field: {"$gt": 0}},
+        {"_id": 0, "term": 1, "word": 1, "lookups": 1, "misses": 1, "lastAt": 1},
+    ).sort(field, -1).limit(limit)
+    return list(cur)
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Export events past the retention window to gzipped NDJSON and mark them for
+TTL expiry (see app/retention.py). Run daily from cron; safe to re-run.
+
+  python backend/scripts/archive_events.py [--days 90] [--out archive/events] [--dry-run]
+
+Files land in <out>/dt=YYYY-MM-DD/part-<run>-<seq>.ndjson.gz, one JSON
+event per line with ISO-8601 timestamps. Events are deleted by the TTL index
+on archivedAt (build it with manage_indexes.py --apply), never by this script.
+"""
+import argparse, os, sys
+
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.retention import (  # noqa: E402
+    EVENT_ARCHIVE_DIR, EVENT_RETENTION_DAYS, archive_events, retention_cutoff,
+)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--uri", default=os.getenv("MONGO_URL", "mongodb://127.0.0.1:27017"))
+    ap.add_argument("--db", default=os.getenv("MONGO_DB", "aasaasi_db"))
+    ap.add_argument("--days", type=int, default=EVENT_RETENTION_DAYS, help="keep this many whole UTC days")
+    ap.add_argument("--out", default=EVENT_ARCHIVE_DIR)
+    ap.add_argument("--max-per-file", type=int, default=100_000)
+    ap.add_argument("--dry-run", action="store_true", help="only count events due for archival")
+    args = ap.parse_args()
+
+    db = MongoClient(args.uri)[args.db]
+    cutoff = retention_cutoff(args.days)
+    print(f"Archiving events before {cutoff.isoformat()} to {args.out}")
+    stats = archive_events(db, args.out, cutoff, max_per_file=args.max_per_file, dry_run=args.dry_run)
+    print(f"Done. {stats}")
+
+if __name__ == "__main__":
+    main()
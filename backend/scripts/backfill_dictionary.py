@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Bulk AI backfill for the dictionary collection (run offline, not per request).
+
+Scans entries in _id order, picks the ones where
+``_needs_backfill(_doc_to_out(doc))`` is true, and runs ``_ai_backfill`` for
+them with bounded concurrency under a requests-per-minute budget. Results go
+to ``ai_cache`` (what /dictionary/lookup reads) or, with ``--target entry``,
+straight into the dictionary document.
+
+With ``--target entry`` the filled fields are listed in the document's
+``aiFilled``, so lookup keys (key_en/key_so) and the suggest index keep
+coming from the imported fields only; AI text is still full-text searchable.
+
+Progress is checkpointed after every batch, so an interrupted run picks up
+where it stopped. The checkpoint keeps the last ``_id`` with its BSON type;
+resuming also covers the _id types that sort after it. Other _id types are
+rejected. Point ``--base-url`` at a local stub server to dry-run the
+whole pipeline without the real provider.
+
+Examples:
+  python backend/scripts/backfill_dictionary.py --dir en-so --rpm 120 --concurrency 4
+  python backend/scripts/backfill_dictionary.py --base-url http://127.0.0.1:8089/v1 --limit 50
+"""
+import argparse, os, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from bson import Binary, ObjectId, json_util
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.loaders.dictionary import AI_FILLED, DICT_COLL, derived_fields, norm_key  # noqa: E402
+from app.routers.dictionary import (  # noqa: E402
+    WordOut, _ai_backfill, _doc_to_out, _is_empty, _needs_backfill, _run_backfill,
+)
+
+# WordOut field -> document field _doc_to_out reads back (see _DOC_FIELDS)
+_ENTRY_FIELDS = {
+    "somaliTranslation": "somali",
+    "meaning": "meaning",
+    "partOfSpeech": "partOfSpeech",
+    "pronunciation": "pronunciation",
+    "wordForms": "wordForms",
+    "phrase": "phrase",
+    "usageNote": "usageNote",
+    "examples": "examples",
+}
+
+class RateLimiter:
+    """Spaces calls evenly so no more than ``rpm`` start per minute."""
+
+    def __init__(self, rpm: float):
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+# _id types in the server's sort order ($type aliases)
+_ID_TYPES = ["number", "string", "object", "binData", "objectId", "bool", "date"]
+
+def _id_type(v: Any) -> str:
+    if isinstance(v, bool):
+        return "bool"
+    for t, py in (("number", (int, float)), ("string", str), ("object", dict),
+                  ("binData", (bytes, Binary)), ("objectId", ObjectId), ("date", datetime)):
+        if isinstance(v, py):
+            return t
+    raise SystemExit(f"can't checkpoint _id of type {type(v).__name__}; use --restart without resuming")
+
+def _resume_query(last_id: Any) -> Dict[str, Any]:
+    # $gt only matches its own BSON type, so add the types the scan reaches later
+    later = _ID_TYPES[_ID_TYPES.index(_id_type(last_id)) + 1:]
+    after = {"_id": {"$gt": last_id}}
+    return {"$or": [after, *({"_id": {"$type": t}} for t in later)]} if later else after
+
+def _load_checkpoint(path: str) -> Optional[Any]:
+    try:
+        with open(path) as f:
+            data = json_util.loads(f.read())
+    except (FileNotFoundError, ValueError):
+        return None
+    if "last_id" not in data:
+        return None
+    # checkpoints written before typed ids held a bare ObjectId hex string
+    return data["last_id"] if data.get("v") == 2 else ObjectId(data["last_id"])
+
+def _save_checkpoint(path: str, last_id: Any, stats: Dict[str, int]) -> None:
+    _id_type(last_id)  # fail before writing a checkpoint we couldn't resume from
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(json_util.dumps({"v": 2, "last_id": last_id, "stats": stats,
+                                 "at": datetime.utcnow().isoformat()}))
+    os.replace(tmp, path)
+
+def _write_entry(coll, doc: Dict[str, Any], base: WordOut, filled: WordOut) -> None:
+    upd: Dict[str, Any] = {}
+    for src, dst in _ENTRY_FIELDS.items():
+        if _is_empty(getattr(base, src)) or (src == "examples" and not base.examples):
+            v = getattr(filled, src)
+            if not _is_empty(v) and v != []:
+                upd[dst] = v
+    if not upd:
+        return
+    upd[AI_FILLED] = sorted(set(doc.get(AI_FILLED) or ()) | set(upd))
+    upd["aiFilledAt"] = datetime.utcnow()
+    # keys skip the AI_FILLED fields; the search text includes them
+    upd.update(derived_fields({**doc, **upd}))
+    coll.update_one({"_id": doc["_id"]}, {"$set": upd})
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--uri", default=os.getenv("MONGO_URL", "mongodb://127.0.0.1:27017"))
+    ap.add_argument("--db", default=os.getenv("MONGO_DB", "aasaasi_db"))
+    ap.add_argument("--collection", default=DICT_COLL)
+    ap.add_argument("--dir", choices=["en-so", "so-en"], default="en-so")
+    ap.add_argument("--target", choices=["cache", "entry"], default="cache",
+                    help="write to ai_cache (default) or into the dictionary document")
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--rpm", type=float, default=60, help="provider requests per minute (0 = unlimited)")
+    ap.add_argument("--batch", type=int, default=50, help="entries per checkpoint")
+    ap.add_argument("--limit", type=int, default=0, help="stop after N provider calls (0 = all)")
+    ap.add_argument("--checkpoint", default="backfill_dictionary.checkpoint.json")
+    ap.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    ap.add_argument("--base-url", help="OpenAI-compatible endpoint, e.g. a local stub server")
+    ap.add_argument("--dry-run", action="store_true", help="only count entries that need backfill")
+    args = ap.parse_args()
+
+    if args.base_url:
+        os.environ["OPENAI_BASE_URL"] = args.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+    db = MongoClient(args.uri)[args.db]
+    coll = db[args.collection]
+    cached = set()
+    if args.target == "cache":
+        cached = {d["term"] for d in db.ai_cache.find({"dir": args.dir, "kind": "backfill"}, {"term": 1})}
+
+    last_id = None if args.restart else _load_checkpoint(args.checkpoint)
+    query = _resume_query(last_id) if last_id is not None else {}
+    if last_id is not None:
+        print(f"Resuming after _id {last_id}")
+
+    limiter = RateLimiter(args.rpm)
+    stats = {"scanned": 0, "needed": 0, "filled": 0, "failed": 0}
+    lock = threading.Lock()
+
+    def work(doc: Dict[str, Any], key: str, base: WordOut) -> None:
+        limiter.acquire()
+        try:
+            if args.target == "cache":
+                filled = _run_backfill(db, key, base.word, args.dir, base)
+            else:
+                filled = _ai_backfill(base.word, args.dir, base)
+                if filled:
+                    _write_entry(coll, doc, base, filled)
+            ok = filled is not None
+        except Exception as e:
+            print(f"  ! {base.word}: {e}")
+            ok = False
+        with lock:
+            stats["filled" if ok else "failed"] += 1
+
+    pool = ThreadPoolExecutor(max_workers=max(1, args.concurrency))
+    batch = []
+    done = False
+    cur = coll.find(query).sort("_id", 1)
+    try:
+        for doc in cur:
+            stats["scanned"] += 1
+            base = _doc_to_out(doc, args.dir)
+            key = norm_key(base.word)
+            if base.word and _needs_backfill(base) and key not in cached:
+                stats["needed"] += 1
+                cached.add(key)
+                batch.append((doc, key, base))
+                if args.limit and stats["needed"] >= args.limit:
+                    done = True
+            if args.dry_run:
+                continue
+            if len(batch) >= args.batch or done:
+                # finish the whole batch before advancing the checkpoint
+                list(pool.map(lambda t: work(*t), batch))
+                batch = []
+                _save_checkpoint(args.checkpoint, doc["_id"], stats)
+                print(f"  {stats}")
+            if done:
+                break
+        else:
+            if batch and not args.dry_run:
+                list(pool.map(lambda t: work(*t), batch))
+            if stats["scanned"] and not args.dry_run:
+                _save_checkpoint(args.checkpoint, doc["_id"], stats)
+    finally:
+        cur.close()
+        pool.shutdown(wait=True)
+
+    print(f"Done. {stats}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Time-to-first-token for /ai/chat vs /ai/chat/stream against a running API.
+
+For /ai/chat the first byte is the whole answer; for the stream it is the
+first delta. Start the API against the stub to get repeatable numbers:
+
+  python backend/scripts/openai_stub.py --latency 0.3 --token-delay 0.03 &
+  OPENAI_BASE_URL=http://127.0.0.1:8089/v1 uvicorn app.main:app --port 8000 &
+  python backend/scripts/bench_chat_ttft.py --api http://127.0.0.1:8000 -n 20
+"""
+import argparse, statistics, time
+
+import httpx
+
+def measure(client: httpx.Client, url: str, message: str):
+    t0 = time.perf_counter()
+    first = None
+    with client.stream("POST", url, json={"message": message}, headers={"x_session_id": "bench-ttft"}) as r:
+        r.raise_for_status()
+        for chunk in r.iter_bytes():
+            if first is None and chunk.strip():
+                first = time.perf_counter() - t0
+    return first * 1000, (time.perf_counter() - t0) * 1000
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--api", default="http://127.0.0.1:8000")
+    ap.add_argument("-n", type=int, default=20)
+    ap.add_argument("--message", default='Explain the word "house".')
+    args = ap.parse_args()
+
+    print(f"{'endpoint':<18} {'ttft p50':>9} {'ttft max':>9} {'total p50':>10}")
+    with httpx.Client(timeout=120) as client:
+        for path in ("/api/ai/chat", "/api/ai/chat/stream"):
+            ttft, total = zip(*(measure(client, args.api + path, args.message) for _ in range(args.n)))
+            print(f"{path:<18} {statistics.median(ttft):>9.0f} {max(ttft):>9.0f} {statistics.median(total):>10.0f}")
+
+if __name__ == "__main__":
+    main()
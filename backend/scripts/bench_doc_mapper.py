@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-call alias resolution (_get) vs the layout-compiled
+accessors behind _doc_to_out.
+
+Uses the document shapes our loaders write: import_dictionary.py rows,
+the older row_to_doc mapping, and raw spreadsheet headers (as kept by the
+Excel ingest tools).
+
+  python backend/scripts/bench_doc_mapper.py [-n 20000]
+"""
+import argparse, os, sys, timeit
+from datetime import datetime
+
+from bson import ObjectId
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.routers.dictionary import _DOC_FIELDS, _accessors, _aliases, _key_matches, _pick, _doc_to_out  # noqa: E402
+
+SAMPLES = {
+    "import_dictionary": {
+        "_id": ObjectId(), "english": "abandon", "pronunciation": "/əˈbændən/", "pos": "verb",
+        "wordForms": "abandons, abandoned", "usageNote": "formal", "somali": "ka tag",
+        "examples_en": ["They abandoned the car."], "source": "dict.xlsx",
+        "key_en": ["abandon"], "key_so": ["ka tag"],
+        "updatedAt": datetime.utcnow(), "createdAt": datetime.utcnow(),
+    },
+    "row_to_doc": {
+        "_id": ObjectId(), "english": "abandon", "somali": "ka tag", "partOfSpeech": "verb",
+        "pronunciation": "/əˈbændən/", "wordForms": "abandons", "phrase": None, "usageNote": "formal",
+        "definition": "to leave behind", "examples": ["They abandoned the car."],
+    },
+    "excel_headers": {
+        "_id": ObjectId(), "Headword": "abandon", "Pronunciation": "/əˈbændən/",
+        "Part of Speech": "verb", "Word Forms": "abandons", "Phrase": "", "Usage Note": "formal",
+        "Meaning": "ka tag", "Example": "They abandoned the car.; She abandoned hope.",
+    },
+}
+
+_NAMES = {
+    "headword":       ("Headword", "English", "EN", "Word_EN", "headword", "english", "word_en"),
+    "somali":         ("Somali", "SO", "Word_SO", "Somali Translation", "somali", "word_so"),
+    "part_of_speech": ("Part of Speech", "POS", "partOfSpeech"),
+    "pronunciation":  ("Pronunciation", "pronunciation", "Pron"),
+    "word_forms":     ("Word Forms", "wordForms"),
+    "phrase":         ("Phrase",),
+    "usage_note":     ("Usage Note", "usageNote"),
+    "meaning":        ("Meaning", "Definition", "definition"),
+    "examples_raw":   ("Example", "Examples"),
+}
+
+# the per-call resolver _doc_to_out used before layouts were compiled
+def _get(doc, *names):
+    keys = _aliases(*names)
+    for k in doc.keys():
+        if _key_matches(k, keys):
+            v = doc.get(k)
+            if v not in (None, ""):
+                return v
+    return None
+
+def legacy(doc):
+    return {f: _get(doc, *names) for f, names in _NAMES.items()}
+
+def compiled(doc):
+    acc = _accessors(doc)
+    return {f: _pick(doc, acc[f]) for f in _DOC_FIELDS}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", type=int, default=20000)
+    args = ap.parse_args()
+
+    print(f"{'layout':<18} {'legacy us':>10} {'compiled us':>12} {'speedup':>8} {'_doc_to_out us':>15}")
+    for name, doc in SAMPLES.items():
+        assert legacy(doc) == compiled(doc), name
+        t_old = timeit.timeit(lambda: legacy(doc), number=args.n) / args.n * 1e6
+        t_new = timeit.timeit(lambda: compiled(doc), number=args.n) / args.n * 1e6
+        t_out = timeit.timeit(lambda: _doc_to_out(doc, "en-so"), number=args.n) / args.n * 1e6
+        print(f"{name:<18} {t_old:>10.2f} {t_new:>12.2f} {t_old / t_new:>7.1f}x {t_out:>15.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: a new OpenAI client per call (the old _get_client) vs the shared
+pooled client in app/llm.py, against the local stub (openai_stub.py) or any
+OpenAI-compatible ``--base-url``.
+
+Over plain HTTP on localhost this mostly shows connection setup and client
+construction; against the real HTTPS endpoint every fresh client also pays a
+TLS handshake, so the gap grows.
+
+  python backend/scripts/bench_llm_client.py [-n 200] [--concurrency 8] [--latency 0.05]
+"""
+import argparse, os, statistics, sys, time
+from concurrent.futures import ThreadPoolExecutor
+
+from openai import OpenAI
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from openai_stub import serve  # noqa: E402
+
+def run(make_client, n: int, concurrency: int):
+    msgs = [{"role": "user", "content": 'Explain "house".'}]
+
+    def call(_):
+        t0 = time.perf_counter()
+        make_client().chat.completions.create(model="stub", messages=msgs)
+        return (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        ms = sorted(pool.map(call, range(n)))
+    return time.perf_counter() - t0, ms
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--latency", type=float, default=0.05, help="stub latency in seconds")
+    ap.add_argument("--base-url", help="use this endpoint instead of starting the stub")
+    args = ap.parse_args()
+
+    url = args.base_url
+    if not url:
+        _, url = serve(latency=args.latency)
+    os.environ["OPENAI_BASE_URL"] = url
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    from app import llm  # noqa: E402  (reads the env above)
+
+    key = os.environ["OPENAI_API_KEY"]
+    cases = {
+        "per-call": lambda: OpenAI(api_key=key, base_url=url),
+        "shared": lambda: llm.client("chat"),
+    }
+    print(f"{args.n} calls, concurrency {args.concurrency}, endpoint {url}")
+    print(f"{'client':<10} {'total s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, make in cases.items():
+        run(make, min(10, args.n), args.concurrency)  # warm up
+        total, ms = run(make, args.n, args.concurrency)
+        p95 = ms[int(len(ms) * 0.95) - 1]
+        print(f"{name:<10} {total:>8.2f} {statistics.median(ms):>8.1f} {p95:>8.1f}")
+
+if __name__ == "__main__":
+    main()
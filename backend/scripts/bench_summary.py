@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark the /analytics/summary read paths on a seeded events collection:
+
+  events    find() + the Python loop (_tally_events)
+  pipeline  $match + $facet aggregation (_summary_pipeline)
+  rollup    session_daily documents (_tally_rollups)
+
+Seeds ``--events`` canonical events (default 1M) over ``--sessions`` sessions
+and ``--span`` days into a scratch database, then times each path for a
+sample of sessions and checks that events and pipeline render the same
+summary. Never point ``--db`` at the serving database: it is dropped first.
+
+  python backend/scripts/bench_summary.py [--events 1000000] [--sessions 200] [--skip-seed]
+"""
+import argparse, os, random, statistics, sys, time
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ASCENDING, MongoClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.rollups import ROLLUP_COLL, apply_rollups  # noqa: E402
+from app.routers.analytics import summarize  # noqa: E402
+
+KINDS = [
+    ("page_view", 40), ("dictionary_search", 30), ("time_spent", 12),
+    ("word_learned", 8), ("quiz_completed", 6), ("grammar_studied", 4),
+]
+TERMS = ["house", "water", "book", "family", "school", "market", "aqal", "biyo", "buug", "qoys"]
+TOPICS = ["Present Simple", "Past Simple", "Articles", "Plurals", "Pronouns"]
+
+def _payload(rng: random.Random, kind: str):
+    if kind == "dictionary_search":
+        return {"term": rng.choice(TERMS).title() if rng.random() < 0.2 else rng.choice(TERMS)}
+    if kind == "word_learned":
+        return {"word": f"word{rng.randrange(500)}"}
+    if kind == "quiz_completed":
+        return {"accuracy": rng.randrange(30, 101), "score": 7, "total": 10}
+    if kind == "time_spent":
+        return {"seconds": rng.randrange(10, 600)}
+    if kind == "grammar_studied":
+        return {"topic": rng.choice(TOPICS)}
+    return {"page": "/dictionary"}
+
+def seed(db, n: int, sessions: int, span: int, batch: int, rng: random.Random) -> None:
+    db.events.drop()
+    db[ROLLUP_COLL].drop()
+    db.events.create_index([("sessionId", ASCENDING), ("ts", ASCENDING)])
+    db[ROLLUP_COLL].create_index([("sessionId", ASCENDING), ("day", ASCENDING)], unique=True)
+    kinds, weights = zip(*KINDS)
+    now = datetime.now(timezone.utc)
+    done = 0
+    while done < n:
+        docs = []
+        for _ in range(min(batch, n - done)):
+            kind = rng.choices(kinds, weights)[0]
+            ts = now - timedelta(seconds=rng.randrange(span * 86400))
+            docs.append({"sessionId": f"bench-{rng.randrange(sessions)}", "kind": kind,
+                         "payload": _payload(rng, kind), "ts": ts, "createdAt": ts})
+        db.events.insert_many(docs, ordered=False)
+        apply_rollups(db, docs)
+        done += len(docs)
+        print(f"  seeded {done}/{n}", end="\r")
+    print()
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--uri", default=os.getenv("MONGO_URL", "mongodb://127.0.0.1:27017"))
+    ap.add_argument("--db", default="aasaasi_bench")
+    ap.add_argument("--events", type=int, default=1_000_000)
+    ap.add_argument("--sessions", type=int, default=200)
+    ap.add_argument("--span", type=int, default=60, help="days of history to spread events over")
+    ap.add_argument("--days", type=int, default=30, help="summary window")
+    ap.add_argument("--sample", type=int, default=20, help="sessions to time")
+    ap.add_argument("--batch", type=int, default=10000)
+    ap.add_argument("--skip-seed", action="store_true", help="reuse the existing scratch data")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    db = MongoClient(args.uri)[args.db]
+    if not args.skip_seed:
+        t0 = time.perf_counter()
+        seed(db, args.events, args.sessions, args.span, args.batch, rng)
+        print(f"Seeded {args.events} events in {time.perf_counter() - t0:.1f}s")
+
+    sids = [f"bench-{i}" for i in rng.sample(range(args.sessions), min(args.sample, args.sessions))]
+    timings = {"events": [], "pipeline": [], "rollup": []}
+    mismatches = 0
+    for sid in sids:
+        out = {}
+        for source in timings:
+            t0 = time.perf_counter()
+            out[source] = summarize(db, sid, args.days, source)
+            timings[source].append((time.perf_counter() - t0) * 1000)
+        if out["events"] != out["pipeline"]:
+            mismatches += 1
+            print(f"  ! {sid}: pipeline differs from events")
+
+    per_session = args.events / max(1, args.sessions) * min(args.days, args.span) / args.span
+    print(f"~{per_session:.0f} events per session in the window, {len(sids)} sessions timed")
+    print(f"{'source':<10} {'p50 ms':>9} {'max ms':>9}")
+    for source, ms in timings.items():
+        print(f"{source:<10} {statistics.median(ms):>9.1f} {max(ms):>9.1f}")
+    print("pipeline output matches events" if not mismatches else f"{mismatches} mismatching sessions")
+
+if __name__ == "__main__":
+    main()
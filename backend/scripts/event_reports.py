@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Reports over the columnar event dataset written by export_events.py.
+
+  dau        distinct sessions and events per day
+  retention  share of each first-seen cohort active N periods later
+  quiz       quiz accuracy by level, plus missed answers per level
+
+Only the columns a report needs are read, and all aggregation is
+vectorized in pandas/NumPy. Quiz events carry no level of their own today;
+``level`` falls back to the quiz name, then the grammar topic. Proficiency
+tests list the level of each missed question in ``weak_grammar``, which
+gives the per-level misses table.
+
+  python backend/scripts/event_reports.py dau --dataset exports/events
+  python backend/scripts/event_reports.py retention --period week --periods 8
+  python backend/scripts/event_reports.py all --since 2025-08-01 --csv reports/
+"""
+import argparse, os
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+FORMAT = {"parquet": "parquet", "arrow": "ipc"}
+
+def load(path: str, fmt: str, columns: List[str], since: Optional[str], until: Optional[str]) -> pd.DataFrame:
+    dataset = ds.dataset(path, format=FORMAT[fmt], partitioning="hive")
+    flt = None
+    if since:
+        flt = ds.field("day") >= since
+    if until:
+        f = ds.field("day") < until
+        flt = f if flt is None else flt & f
+    return dataset.to_table(columns=columns, filter=flt).to_pandas()
+
+def dau(df: pd.DataFrame) -> pd.DataFrame:
+    out = df.groupby("day").agg(dau=("session_id", "nunique"), events=("session_id", "size"))
+    return out.sort_index()
+
+def retention(df: pd.DataFrame, period: str = "week", periods: int = 8) -> pd.DataFrame:
+    days = pd.to_datetime(df["day"]).to_numpy().astype("datetime64[D]").astype(np.int64)
+    # Monday-aligned weeks: 1970-01-01 was a Thursday
+    idx = (days + 3) // 7 if period == "week" else days
+    act = pd.DataFrame({"s": df["session_id"].to_numpy(), "p": idx}).dropna().drop_duplicates()
+    act["cohort"] = act.groupby("s")["p"].transform("min")
+    act["offset"] = act["p"] - act["cohort"]
+    act = act[act["offset"] < periods]
+
+    counts = act.groupby(["cohort", "offset"])["s"].nunique().unstack(fill_value=0)
+    rates = counts.div(counts[0], axis=0).round(3)
+    start = counts.index.to_numpy() * 7 - 3 if period == "week" else counts.index.to_numpy()
+    rates.index = pd.Index(start.astype("datetime64[D]").astype(str), name=f"cohort_{period}")
+    rates.insert(0, "size", counts[0].to_numpy())
+    return rates
+
+def quiz(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    q = df[df["kind"] == "quiz_completed"]
+    level = q["level"].fillna(q["quiz"]).fillna(q["topic"]).fillna("unknown")
+    by_level = q.groupby(level)["accuracy"].agg(quizzes="size", mean="mean", median="median")
+    by_level.index.name = "level"
+
+    missed = q["weak_grammar"].explode().dropna()
+    misses = missed.value_counts().rename("missed").to_frame()
+    misses["share"] = (misses["missed"] / misses["missed"].sum()).round(3)
+    misses.index.name = "level"
+    return {"quiz_accuracy": by_level.round(1), "quiz_missed_by_level": misses}
+
+COLUMNS = {
+    "dau": ["day", "session_id"],
+    "retention": ["day", "session_id"],
+    "quiz": ["kind", "quiz", "topic", "level", "accuracy", "weak_grammar"],
+}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("report", choices=[*COLUMNS, "all"])
+    ap.add_argument("--dataset", default="exports/events")
+    ap.add_argument("--format", choices=sorted(FORMAT), default="parquet")
+    ap.add_argument("--since", help="YYYY-MM-DD, inclusive")
+    ap.add_argument("--until", help="YYYY-MM-DD, exclusive")
+    ap.add_argument("--period", choices=["day", "week"], default="week", help="retention cohort size")
+    ap.add_argument("--periods", type=int, default=8, help="retention columns")
+    ap.add_argument("--csv", help="also write each table to this directory")
+    args = ap.parse_args()
+
+    names = list(COLUMNS) if args.report == "all" else [args.report]
+    cols = sorted({c for n in names for c in COLUMNS[n]})
+    df = load(args.dataset, args.format, cols, args.since, args.until)
+
+    tables: Dict[str, pd.DataFrame] = {}
+    if "dau" in names:
+        tables["dau"] = dau(df)
+    if "retention" in names:
+        tables["retention"] = retention(df, args.period, args.periods)
+    if "quiz" in names:
+        tables.update(quiz(df))
+
+    pd.set_option("display.width", 160)
+    for name, t in tables.items():
+        print(f"\n== {name}\n{t.to_string()}")
+        if args.csv:
+            os.makedirs(args.csv, exist_ok=True)
+            t.to_csv(os.path.join(args.csv, f"{name}.csv"))
+
+if __name__ == "__main__":
+    main()
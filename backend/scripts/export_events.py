@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Export events into a day-partitioned columnar dataset for offline analysis.
+
+Reads the ``events`` collection, or NDJSON files (Mongo extended-JSON dumps
+such as public/data/events.json, or the gzipped archives written by
+archive_events.py), and writes Parquet (default) or Arrow IPC files under
+``<out>/day=YYYY-MM-DD/``. Events are streamed and written ``--chunk`` rows
+at a time, so memory stays flat however large the input is. Legacy
+{type, at, meta} documents are normalized on the way out.
+
+Columns: event_id, session_id, kind, ts (UTC), the commonly analysed payload
+fields (word, dir, found, quiz, topic, level, accuracy, seconds,
+weak_grammar) and the full payload as JSON. event_reports.py reads the
+result; nothing here touches the serving path.
+
+  python backend/scripts/export_events.py --out exports/events
+  python backend/scripts/export_events.py --ndjson public/data/events.json --out exports/events
+  python backend/scripts/export_events.py --ndjson 'archive/events/dt=*/*.ndjson.gz' --format arrow --out exports/events
+"""
+import argparse, glob, gzip, os, sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+from bson import json_util
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.events import LEGACY_TYPE_TO_KIND, parse_ts  # noqa: E402
+
+SCHEMA = pa.schema([
+    ("event_id", pa.string()),
+    ("session_id", pa.string()),
+    ("kind", pa.string()),
+    ("ts", pa.timestamp("us", tz="UTC")),
+    ("word", pa.string()),
+    ("dir", pa.string()),
+    ("found", pa.bool_()),
+    ("quiz", pa.string()),
+    ("topic", pa.string()),
+    ("level", pa.string()),
+    ("accuracy", pa.float64()),
+    ("seconds", pa.float64()),
+    ("weak_grammar", pa.list_(pa.string())),
+    ("payload", pa.string()),
+    ("day", pa.string()),
+])
+PARTITIONING = ds.partitioning(pa.schema([("day", pa.string())]), flavor="hive")
+EXT = {"parquet": "parquet", "arrow": "arrow"}
+FORMAT = {"parquet": "parquet", "arrow": "ipc"}
+
+def _str(v: Any) -> Optional[str]:
+    if v is None or isinstance(v, (dict, list)):
+        return None
+    s = str(v).strip()
+    return s or None
+
+def _float(v: Any) -> Optional[float]:
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+def to_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """One event document (canonical or legacy) -> one flat row."""
+    if "kind" in doc:
+        kind = str(doc.get("kind") or "")
+        payload = doc.get("payload") or {}
+        ts = parse_ts(doc.get("ts"))
+    else:
+        t = str(doc.get("type") or "")
+        kind = LEGACY_TYPE_TO_KIND.get(t, t)
+        payload = doc.get("meta") or {}
+        ts = parse_ts(doc.get("at"))
+    found = payload.get("found")
+    weak = payload.get("weak_grammar")
+    return {
+        "event_id": _str(doc.get("_id")),
+        "session_id": _str(doc.get("sessionId")),
+        "kind": kind,
+        "ts": ts,
+        "word": _str(payload.get("word") or payload.get("term") or payload.get("query")),
+        "dir": _str(payload.get("dir")),
+        "found": found if isinstance(found, bool) else None,
+        "quiz": _str(payload.get("name")),
+        "topic": _str(payload.get("topic")),
+        "level": _str(payload.get("level")),
+        "accuracy": _float(payload.get("accuracy", payload.get("scorePct"))),
+        "seconds": _float(payload.get("seconds")),
+        "weak_grammar": [str(x) for x in weak] if isinstance(weak, list) else None,
+        "payload": json_util.dumps(payload),
+        "day": ts.date().isoformat(),
+    }
+
+def iter_mongo(uri: str, db: str, since: Optional[datetime], until: Optional[datetime],
+               batch: int) -> Iterator[Dict[str, Any]]:
+    q: Dict[str, Any] = {}
+    if since or until:
+        q["ts"] = {k: v for k, v in (("$gte", since), ("$lt", until)) if v}
+    cur = MongoClient(uri)[db].events.find(q).batch_size(batch)
+    try:
+        yield from cur
+    finally:
+        cur.close()
+
+def iter_ndjson(patterns: List[str]) -> Iterator[Dict[str, Any]]:
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            opener = gzip.open if path.endswith(".gz") else open
+            with opener(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json_util.loads(line)
+
+def write_chunk(rows: List[Dict[str, Any]], out: str, fmt: str, run: str, seq: int) -> None:
+    cols = {name: [r[name] for r in rows] for name in SCHEMA.names}
+    ds.write_dataset(
+        pa.Table.from_pydict(cols, schema=SCHEMA), out,
+        format=FORMAT[fmt],
+        partitioning=PARTITIONING,
+        basename_template=f"part-{run}-{seq:05d}-{{i}}.{EXT[fmt]}",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+def _day(v: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(v).replace(tzinfo=timezone.utc) if v else None
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--uri", default=os.getenv("MONGO_URL", "mongodb://127.0.0.1:27017"))
+    ap.add_argument("--db", default=os.getenv("MONGO_DB", "aasaasi_db"))
+    ap.add_argument("--ndjson", nargs="+", help="read these files / globs instead of Mongo")
+    ap.add_argument("--out", default="exports/events")
+    ap.add_argument("--format", choices=sorted(FORMAT), default="parquet")
+    ap.add_argument("--chunk", type=int, default=50_000, help="rows held in memory per write")
+    ap.add_argument("--since", help="YYYY-MM-DD, inclusive")
+    ap.add_argument("--until", help="YYYY-MM-DD, exclusive")
+    args = ap.parse_args()
+
+    since, until = _day(args.since), _day(args.until)
+    if args.ndjson:
+        source = iter_ndjson(args.ndjson)
+    else:
+        source = iter_mongo(args.uri, args.db, since, until, args.chunk)
+
+    run = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    rows: List[Dict[str, Any]] = []
+    seq = total = skipped = 0
+    for doc in source:
+        try:
+            row = to_row(doc)
+        except Exception:
+            skipped += 1
+            continue
+        if (since and row["ts"] < since) or (until and row["ts"] >= until):
+            continue
+        rows.append(row)
+        if len(rows) >= args.chunk:
+            write_chunk(rows, args.out, args.format, run, seq)
+            seq += 1
+            total += len(rows)
+            rows = []
+            print(f"  wrote {total}")
+    if rows:
+        write_chunk(rows, args.out, args.format, run, seq)
+        total += len(rows)
+
+    print(f"Done. Rows: {total}, skipped: {skipped}, dataset: {args.out} ({args.format})")
+
+if __name__ == "__main__":
+    main()
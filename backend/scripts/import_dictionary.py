@@ -5,12 +5,15 @@ Load Aasaasi bilingual dictionary from Excel/ODS into MongoDB.
 Expected columns (case-insensitive, spaces ok):
 Headword | Pronunciation | Part of Sppech | Word Forms | Phrase | Usage Note | Meaning | Example
 """
-import argparse, os, re
+import argparse, os, re, sys
 from datetime import datetime
 from typing import List, Dict, Any
 import pandas as pd
 from pymongo import MongoClient
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.loaders.dictionary import bump_version, derived_fields, ensure_indexes, norm_key, reindex  # noqa: E402
+
 COL_MAP = {
     "headword": "Headword",
     "pronunciation": "Pronunciation",
@@ -67,6 +70,7 @@ def load_rows(path: str) -> List[Dict[str, Any]]:
         }
         # drop empties
         doc = {k:v for k,v in doc.items() if (v or v == 0)}
+        doc.update(derived_fields(doc))
         rows.append(doc)
     return rows
 
@@ -75,13 +79,21 @@ def main():
     ap.add_argument("--uri", default="mongodb://127.0.0.1:27017")
     ap.add_argument("--db", default="aasaasi")
     ap.add_argument("--collection", default="dictionary")
-    ap.add_argument("files", nargs="+")
+    ap.add_argument("--reindex", action="store_true",
+                    help="backfill lookup keys and search text on documents already in the collection")
+    ap.add_argument("files", nargs="*")
     args = ap.parse_args()
+    if not args.files and not args.reindex:
+        ap.error("no input files (pass files and/or --reindex)")
 
     client = MongoClient(args.uri)
     col = client[args.db][args.collection]
     col.create_index("english")
     col.create_index("somali")
+    ensure_indexes(col)
+    if args.reindex:
+        # run first so upserts below match rows imported before keys existed
+        print(f"Reindexed {reindex(col)} existing documents")
 
     total = 0
     for p in args.files:
@@ -90,12 +102,14 @@ def main():
             now = datetime.utcnow()
             d["updatedAt"] = now
             col.update_one(
-                {"english": {"$regex": f"^{re.escape(d['english'])}$", "$options": "i"}},
+                {"key_en": norm_key(d["english"])},
                 {"$set": d, "$setOnInsert": {"createdAt": now}},
                 upsert=True
             )
             total += 1
         print(f"Imported {len(docs)} rows from {os.path.basename(p)}")
+    # tell running API workers to rebuild their in-memory suggest index
+    bump_version(client[args.db])
     print(f"Done. Upserts: {total}")
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Apply and audit the indexes declared in app/indexes.py.
+
+  python backend/scripts/manage_indexes.py            # report missing / extra / idle
+  python backend/scripts/manage_indexes.py --apply    # build whatever is missing
+  python backend/scripts/manage_indexes.py --explain  # assert hot queries use an index
+  python backend/scripts/manage_indexes.py --dedupe --apply
+
+A unique index (conversations.sessionId, tests.kind, ...) can't be built
+while duplicates exist; the report lists them under "duplicates". --dedupe
+keeps the newest doc (highest _id) per key and deletes the others before
+--apply builds the index. Back up first if the older copies matter.
+
+Extra indexes are only reported, never dropped. "idle" comes from
+$indexStats and counts accesses since the server last started, so read it
+on a server that has seen real traffic. --explain exits non-zero if any hot
+query would scan the collection.
+"""
+import argparse, os, sys
+
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.indexes import INDEXES, dedupe, ensure_indexes, explain_hot_queries, index_report  # noqa: E402
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--uri", default=os.getenv("MONGO_URL", "mongodb://127.0.0.1:27017"))
+    ap.add_argument("--db", default=os.getenv("MONGO_DB", "aasaasi_db"))
+    ap.add_argument("--apply", action="store_true", help="create missing indexes")
+    ap.add_argument("--explain", action="store_true", help="check hot queries with explain()")
+    ap.add_argument("--dedupe", action="store_true", help="delete all but the newest doc per unique key")
+    ap.add_argument("--collection", action="append", choices=sorted(INDEXES), help="limit --apply/--dedupe (repeatable)")
+    args = ap.parse_args()
+
+    db = MongoClient(args.uri)[args.db]
+    failed = False
+
+    if args.dedupe:
+        for name in args.collection or INDEXES:
+            for spec in INDEXES[name]:
+                if spec.get("unique"):
+                    n = dedupe(db, name, spec["keys"])
+                    if n:
+                        print(f"  removed {n} duplicate docs from {name}")
+
+    if args.apply:
+        errors = ensure_indexes(db, args.collection)
+        for e in errors:
+            print(f"  ! {e}")
+        failed |= bool(errors)
+        print(f"Applied indexes ({len(errors)} failed)")
+
+    for name, r in index_report(db).items():
+        issues = [f"{k}: {', '.join(v)}" for k, v in r.items() if v]
+        print(f"{name:<20} {'ok' if not issues else '; '.join(issues)}")
+        failed |= bool(r["missing"] or r["mismatched"] or r["duplicates"] or r.get("unkeyed"))
+
+    if args.explain:
+        print()
+        for name, flt, indexed, stages in explain_hot_queries(db):
+            print(f"{'IXSCAN' if indexed else 'SCAN!':<7} {name:<20} {list(flt)} -> {' > '.join(stages)}")
+            failed |= not indexed
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
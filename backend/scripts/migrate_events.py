@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+One-off: convert the ``events`` collection to the canonical schema.
+
+Two shapes exist in older data (compare public/data/events.json):
+
+  analytics/idioms:  {sessionId, kind, payload, ts: "ISO string", createdAt: "ISO string"}
+  dictionary:        {sessionId, type, at: datetime, meta}
+
+Both become {sessionId, kind, payload, ts: datetime, createdAt: datetime}
+(see app/events.py). Legacy ``type`` values map through LEGACY_TYPE_TO_KIND.
+Idempotent: only documents still in an old shape are touched, so it can be
+re-run or interrupted safely.
+
+  python backend/scripts/migrate_events.py [--uri ...] [--db ...] [--dry-run]
+"""
+import argparse, os, sys
+from typing import Any, Dict, List
+
+from pymongo import MongoClient, UpdateOne
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.events import LEGACY_TYPE_TO_KIND, parse_ts  # noqa: E402
+
+LEGACY_QUERY = {"$or": [
+    {"type": {"$exists": True}},
+    {"ts": {"$type": "string"}},
+    {"createdAt": {"$type": "string"}},
+]}
+
+def convert(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the update ({$set, $unset}) that brings ``doc`` to the canonical shape."""
+    set_: Dict[str, Any] = {}
+    unset: Dict[str, str] = {}
+    if "type" in doc and "kind" not in doc:
+        t = str(doc.get("type") or "")
+        set_["kind"] = LEGACY_TYPE_TO_KIND.get(t, t or "page_view")
+        set_["payload"] = doc.get("meta") or {}
+        ts = parse_ts(doc.get("at"))
+        set_["ts"] = ts
+        set_["createdAt"] = ts
+        unset.update({"type": "", "at": "", "meta": ""})
+    else:
+        ts = parse_ts(doc.get("ts"))
+        set_["ts"] = ts
+        set_["createdAt"] = parse_ts(doc.get("createdAt"), ts)
+        if "type" in doc:
+            unset["type"] = ""
+    upd: Dict[str, Any] = {"$set": set_}
+    if unset:
+        upd["$unset"] = unset
+    return upd
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--uri", default=os.getenv("MONGO_URL", "mongodb://127.0.0.1:27017"))
+    ap.add_argument("--db", default=os.getenv("MONGO_DB", "aasaasi_db"))
+    ap.add_argument("--batch", type=int, default=1000)
+    ap.add_argument("--dry-run", action="store_true")
+    args = ap.parse_args()
+
+    coll = MongoClient(args.uri)[args.db].events
+    if args.dry_run:
+        print(f"Events in a legacy shape: {coll.count_documents(LEGACY_QUERY)}")
+        return
+
+    ops: List[UpdateOne] = []
+    total = 0
+    for doc in coll.find(LEGACY_QUERY, {"kind": 1, "type": 1, "at": 1, "meta": 1, "ts": 1, "createdAt": 1}):
+        ops.append(UpdateOne({"_id": doc["_id"]}, convert(doc)))
+        if len(ops) >= args.batch:
+            total += coll.bulk_write(ops, ordered=False).modified_count
+            ops = []
+            print(f"  converted {total}")
+    if ops:
+        total += coll.bulk_write(ops, ordered=False).modified_count
+    print(f"Done. Events converted: {total}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+One-off: build the per-session ``recent_searches`` docs from the events log.
+
+/dictionary/recent used to scan lookup events (kind=word_lookup) for the
+session and dedupe in Python; it now reads one capped list per session that
+the event buffer keeps up to date (app/recent_searches.py). This replays
+the existing events (newest first, case-insensitive dedup, capped) so old
+sessions keep their history.
+Safe to re-run: events are still written, so the result is authoritative.
+Run migrate_events.py first so legacy {type, at, meta} lookups are included.
+
+  python backend/scripts/migrate_recent_searches.py [--uri ...] [--db ...]
+"""
+import argparse, os, sys
+from datetime import datetime
+from typing import List, Optional
+
+from pymongo import MongoClient, UpdateOne
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.recent_searches import RECENT_CAP, RECENT_COLL  # noqa: E402
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--uri", default=os.getenv("MONGO_URL", "mongodb://127.0.0.1:27017"))
+    ap.add_argument("--db", default=os.getenv("MONGO_DB", "aasaasi_db"))
+    ap.add_argument("--batch", type=int, default=500)
+    args = ap.parse_args()
+
+    db = MongoClient(args.uri)[args.db]
+    cur = db.events.find(
+        {"kind": "word_lookup", "payload.batch": {"$ne": True}},
+        {"_id": 0, "sessionId": 1, "payload.word": 1},
+    ).sort([("sessionId", 1), ("ts", -1)]).batch_size(5000)
+
+    ops: List[UpdateOne] = []
+    sessions = 0
+    sid: Optional[str] = None
+    terms: List[str] = []
+    seen: set = set()
+
+    def flush_session():
+        nonlocal sessions
+        if sid is not None and terms:
+            ops.append(UpdateOne({"_id": sid},
+                                 {"$set": {"terms": terms, "updatedAt": datetime.utcnow()}},
+                                 upsert=True))
+            sessions += 1
+
+    for ev in cur:
+        if ev.get("sessionId") != sid:
+            flush_session()
+            sid, terms, seen = ev.get("sessionId"), [], set()
+            if len(ops) >= args.batch:
+                db[RECENT_COLL].bulk_write(ops, ordered=False)
+                ops = []
+        if len(terms) >= RECENT_CAP:
+            continue
+        w = (ev.get("payload") or {}).get("word")
+        if not w or w.lower() in seen:
+            continue
+        seen.add(w.lower())
+        terms.append(w)
+    flush_session()
+    if ops:
+        db[RECENT_COLL].bulk_write(ops, ordered=False)
+
+    print(f"Done. Sessions migrated: {sessions}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Minimal OpenAI-compatible stub for tests and benchmarks.
+
+Answers POST /v1/chat/completions with a canned reply after ``--latency``
+seconds: strict JSON when the prompt asks for JSON (dictionary backfill),
+otherwise a Markdown card. ``"stream": true`` is answered as server-sent
+events, one chunk per word every ``--token-delay`` seconds; without it the
+reply arrives whole after the same total time.
+
+  python backend/scripts/openai_stub.py --port 8089 --latency 0.3
+  OPENAI_BASE_URL=http://127.0.0.1:8089/v1 uvicorn app.main:app
+
+``serve()`` runs it on a background thread for in-process benchmarks.
+"""
+import argparse, json, re, threading, time, uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+
+def _reply(messages: List[Dict[str, Any]]) -> str:
+    prompt = str((messages or [{}])[-1].get("content") or "")
+    m = re.search(r'"([^"]{1,80})"', prompt)
+    word = m.group(1) if m else prompt.strip()[:40] or "word"
+    if re.search(r"\bjson\b", prompt, flags=re.I):
+        return json.dumps({
+            "word": word, "headword": word, "pronunciation": f"/{word}/", "partOfSpeech": "noun",
+            "wordForms": word, "phrase": "", "usageNote": "stub", "meaning": f"meaning of {word}",
+            "somaliTranslation": f"{word} (so)", "examples": [f"This is {word}."],
+        })
+    return (f"# {word.title()}\n## Simple Explanation\nA stub explanation of {word}.\n\n"
+            f"## Somali Translation\n{word} (so)\n\n## Example Sentences\n1. This is {word}.\n")
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    latency = 0.0
+    token_delay = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, code: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        n = int(self.headers.get("Content-Length") or 0)
+        req = json.loads(self.rfile.read(n) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self._send_json(404, {"error": {"message": "not found"}})
+        time.sleep(self.latency)
+        text = _reply(req.get("messages") or [])
+        base = {"id": f"chatcmpl-{uuid.uuid4().hex[:12]}", "created": int(time.time()),
+                "model": req.get("model") or "stub"}
+        pieces = re.findall(r"\S+\s*", text)
+        if not req.get("stream"):
+            time.sleep(self.token_delay * len(pieces))  # same generation time, delivered at once
+            return self._send_json(200, {
+                **base, "object": "chat.completion",
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": text}}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for piece in pieces:
+            chunk = {**base, "object": "chat.completion.chunk",
+                     "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(self.token_delay)
+        done = {**base, "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        self.wfile.write(f"data: {json.dumps(done)}\n\ndata: [DONE]\n\n".encode())
+        self.close_connection = True
+
+def serve(port: int = 0, latency: float = 0.0, token_delay: float = 0.0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start on a daemon thread; returns (server, base_url). Port 0 picks a free one."""
+    handler = type("Handler", (_Handler,), {"latency": latency, "token_delay": token_delay})
+    srv = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, name="openai-stub", daemon=True).start()
+    return srv, f"http://127.0.0.1:{srv.server_address[1]}/v1"
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--latency", type=float, default=0.3, help="seconds before the reply / first token")
+    ap.add_argument("--token-delay", type=float, default=0.02, help="seconds between streamed chunks")
+    args = ap.parse_args()
+    srv, url = serve(args.port, args.latency, args.token_delay)
+    print(f"OpenAI stub on {url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        srv.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Rebuild the ``session_daily`` rollups behind /analytics/summary from the
+events log.
+
+The API keeps the rollups current as events arrive; run this once after
+deploying them (and after migrate_events.py), or to repair drift if a rollup
+write failed. ``--drop`` recomputes every session; without it, only
+sessions passed with ``--session`` are recomputed.
+
+Every day from the oldest unarchived event on is rebuilt, whatever
+EVENT_RETENTION_DAYS is. Older days keep their live rollups, since their
+raw events are archived (app/retention.py) or already expired.
+
+Live counters are never deleted while the API is writing them. The replay
+goes into ``session_daily_rebuild``. Events ingested meanwhile are caught up
+by ``_id``. Then the staging docs replace the live ones: with ``--drop``
+the collection is renamed over ``session_daily``; with ``--session`` each
+doc is replaced in place. Only events flushed between the last catch-up
+and that swap (milliseconds) can be missed; a rerun repairs them.
+
+  python backend/scripts/rebuild_session_rollups.py --drop [--uri ...] [--db ...]
+  python backend/scripts/rebuild_session_rollups.py --session s1 --session s2
+"""
+import argparse, os, sys
+from datetime import datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from bson import ObjectId
+from pymongo import ASCENDING, MongoClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.events import SERVER_KINDS  # noqa: E402
+from app.rollups import ROLLUP_COLL, apply_rollups  # noqa: E402
+
+STAGING_COLL = ROLLUP_COLL + "_rebuild"
+SLACK = timedelta(seconds=30)  # ObjectIds come from many clients' clocks
+
+def _first_day(db) -> Optional[datetime]:
+    """Start of the UTC day of the oldest event that hasn't been archived (archival is by whole day)."""
+    doc = next(db.events.find({"archivedAt": {"$exists": False}}, {"ts": 1}).sort("ts", ASCENDING).limit(1), None)
+    if doc is None:
+        return None
+    ts = doc["ts"] if doc["ts"].tzinfo else doc["ts"].replace(tzinfo=timezone.utc)
+    return datetime.combine(ts.date(), time.min, tzinfo=timezone.utc)
+
+def _replay(db, query: Dict[str, Any], batch: int, since: datetime, recent: Set[Any]) -> int:
+    """Fold matching events into staging; remembers _ids created after ``since``."""
+    cur = db.events.find(query, {"sessionId": 1, "kind": 1, "payload": 1, "ts": 1}).batch_size(batch)
+    buf: List[Dict[str, Any]] = []
+    events = 0
+    for ev in cur:
+        if ev["_id"] in recent:
+            continue  # already folded by an earlier pass
+        if isinstance(ev["_id"], ObjectId) and ev["_id"].generation_time >= since:
+            recent.add(ev["_id"])
+        buf.append(ev)
+        if len(buf) >= batch:
+            apply_rollups(db, buf, STAGING_COLL)
+            events += len(buf)
+            buf = []
+            print(f"  folded {events} events")
+    if buf:
+        apply_rollups(db, buf, STAGING_COLL)
+        events += len(buf)
+    return events
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--uri", default=os.getenv("MONGO_URL", "mongodb://127.0.0.1:27017"))
+    ap.add_argument("--db", default=os.getenv("MONGO_DB", "aasaasi_db"))
+    ap.add_argument("--batch", type=int, default=5000, help="events folded per bulk write")
+    ap.add_argument("--drop", action="store_true", help="rebuild every session")
+    ap.add_argument("--session", action="append", default=[], help="rebuild only this session (repeatable)")
+    args = ap.parse_args()
+
+    if not args.drop and not args.session:
+        ap.error("pass --drop or at least one --session")
+
+    db = MongoClient(args.uri)[args.db]
+    first = _first_day(db)
+    if first is None:
+        print("No unarchived events; rollups left as they are.")
+        return
+    first_day = first.date().isoformat()
+    print(f"Rebuilding days from {first_day}")
+
+    db[STAGING_COLL].drop()
+    db[STAGING_COLL].create_index([("sessionId", ASCENDING), ("day", ASCENDING)], unique=True)
+
+    started = datetime.now(timezone.utc) - SLACK
+    query: Dict[str, Any] = {"kind": {"$nin": list(SERVER_KINDS)}, "ts": {"$gte": first}}
+    if args.session:
+        query["sessionId"] = {"$in": args.session}
+    recent: Set[Any] = set()
+    events = _replay(db, query, args.batch, started, recent)
+    # catch up with what arrived during the replay until a pass finds (almost) nothing
+    for _ in range(5):
+        n = _replay(db, {**query, "_id": {"$gte": ObjectId.from_datetime(started)}}, args.batch, started, recent)
+        events += n
+        if n < 100:
+            break
+
+    live, staging = db[ROLLUP_COLL], db[STAGING_COLL]
+    if args.drop:
+        # older days only exist as rollups: carry them over as they are now
+        buf: List[Dict[str, Any]] = []
+        for doc in live.find({"day": {"$lt": first_day}}):
+            buf.append(doc)
+            if len(buf) >= args.batch:
+                staging.insert_many(buf, ordered=False)
+                buf = []
+        if buf:
+            staging.insert_many(buf, ordered=False)
+        staging.rename(ROLLUP_COLL, dropTarget=True)
+    else:
+        keep = set()
+        for doc in staging.find({}, {"_id": 0}):
+            live.replace_one({"sessionId": doc["sessionId"], "day": doc["day"]}, doc, upsert=True)
+            keep.add((doc["sessionId"], doc["day"]))
+        # rebuilt days with no events left are drift
+        for doc in live.find({"sessionId": {"$in": args.session}, "day": {"$gte": first_day}}, {"sessionId": 1, "day": 1}):
+            if (doc["sessionId"], doc["day"]) not in keep:
+                live.delete_one({"_id": doc["_id"]})
+        staging.drop()
+
+    print(f"Done. Events: {events}, rollup docs: {db[ROLLUP_COLL].estimated_document_count()}")
+
+if __name__ == "__main__":
+    main()
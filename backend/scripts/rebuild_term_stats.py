@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Recompute ``term_stats`` (behind /analytics/top-terms and /analytics/misses)
+from the word_lookup events still in the ``events`` collection.
+
+The API keeps the counters current as it writes events; run this once after
+deploying them, or to repair drift (e.g. a non-zero ``hookSkipped``).
+
+Totals only cover the events still retained. Lookups that were archived
+and expired (app/retention.py) are not in the collection, so after a
+rebuild the counts start over from the retention window.
+
+The live counters are not touched during the replay. It goes into
+``term_stats_rebuild``, catches up on events written meanwhile (by
+``_id``) and is then renamed over ``term_stats``. Only lookups flushed
+between the last catch-up and the rename (milliseconds) can be missed.
+
+  python backend/scripts/rebuild_term_stats.py [--uri ...] [--db ...]
+"""
+import argparse, os, sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Set
+
+from bson import ObjectId
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.indexes import INDEXES  # noqa: E402
+from app.term_stats import TERM_STATS_COLL, apply_term_stats  # noqa: E402
+
+STAGING_COLL = TERM_STATS_COLL + "_rebuild"
+SLACK = timedelta(seconds=30)  # ObjectIds come from many clients' clocks
+
+def _replay(db, query: Dict[str, Any], batch: int, since: datetime, recent: Set[Any]) -> int:
+    """Fold matching events into staging; remembers _ids created after ``since``."""
+    cur = db.events.find(
+        query, {"kind": 1, "payload.word": 1, "payload.dir": 1, "payload.found": 1, "ts": 1},
+    ).batch_size(batch)
+    buf: List[Dict[str, Any]] = []
+    events = 0
+    for ev in cur:
+        if ev["_id"] in recent:
+            continue  # already folded by an earlier pass
+        if isinstance(ev["_id"], ObjectId) and ev["_id"].generation_time >= since:
+            recent.add(ev["_id"])
+        buf.append(ev)
+        if len(buf) >= batch:
+            apply_term_stats(db, buf, STAGING_COLL)
+            events += len(buf)
+            buf = []
+            print(f"  folded {events} events")
+    if buf:
+        apply_term_stats(db, buf, STAGING_COLL)
+        events += len(buf)
+    return events
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--uri", default=os.getenv("MONGO_URL", "mongodb://127.0.0.1:27017"))
+    ap.add_argument("--db", default=os.getenv("MONGO_DB", "aasaasi_db"))
+    ap.add_argument("--batch", type=int, default=5000, help="events folded per bulk write")
+    args = ap.parse_args()
+
+    db = MongoClient(args.uri)[args.db]
+    staging = db[STAGING_COLL]
+    staging.drop()
+    for spec in INDEXES[TERM_STATS_COLL]:
+        opts = dict(spec)
+        staging.create_index(opts.pop("keys"), **opts)
+
+    started = datetime.now(timezone.utc) - SLACK
+    query: Dict[str, Any] = {"kind": "word_lookup", "payload.batch": {"$ne": True}}
+    recent: Set[Any] = set()
+    events = _replay(db, query, args.batch, started, recent)
+    # catch up with what arrived during the replay until a pass finds (almost) nothing
+    for _ in range(5):
+        n = _replay(db, {**query, "_id": {"$gte": ObjectId.from_datetime(started)}}, args.batch, started, recent)
+        events += n
+        if n < 100:
+            break
+    staging.rename(TERM_STATS_COLL, dropTarget=True)
+
+    print(f"Done. Events: {events}, terms: {db[TERM_STATS_COLL].estimated_document_count()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# backend/tests/conftest.py
+# run from backend/:  pip install -r requirements-dev.txt && python -m pytest -q tests
+import os, sys
+
+import mongomock
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))                          # app
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "scripts"))  # openai_stub
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().db
+
+@pytest.fixture
+def mongo_db():
+    """Scratch database on a real mongod (MONGO_TEST_URL); skipped when none is reachable."""
+    from pymongo import MongoClient
+    from pymongo.errors import PyMongoError
+    client = MongoClient(os.getenv("MONGO_TEST_URL", "mongodb://localhost:27017"),
+                         serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        client.close()
+        pytest.skip("no mongod reachable")
+    name = f"test_{os.getpid()}"
+    client.drop_database(name)
+    yield client[name]
+    client.drop_database(name)
+    client.close()
+
+@pytest.fixture
+def openai_stub(monkeypatch):
+    """Local OpenAI-compatible server (scripts/openai_stub.py); yields its base URL."""
+    from openai_stub import serve
+    srv, url = serve(latency=0.0, token_delay=0.02)
+    monkeypatch.setenv("OPENAI_BASE_URL", url)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    yield url
+    srv.shutdown()
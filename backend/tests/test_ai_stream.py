@@ -0,0 +1,81 @@
+# backend/tests/test_ai_stream.py
+import anyio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app import llm
+from app.routers import ai
+
+BYPASS = [(b"x-ai-cache", b"bypass")]  # keep the reply cache out of these tests
+
+def _app(db):
+    app = FastAPI()
+    app.state.db = db
+    app.state.adb = None
+    app.include_router(ai.router, prefix="/api")
+    return app
+
+def _request(app):
+    return Request({"type": "http", "app": app, "method": "POST", "path": "/api/ai/chat/stream",
+                    "headers": BYPASS, "query_string": b""})
+
+def _in_use():
+    return llm.stats()["limits"]["openai"]["inUse"]
+
+async def _open(db, sid):
+    return await ai.chat_stream(ai.ChatRequest(message='Explain "house"'), _request(_app(db)),
+                                format="sse", x_session_id=sid)
+
+def _messages(db, sid):
+    return db.conversations.find_one({"sessionId": sid})["messages"]
+
+def test_completed_stream_releases_slot_and_saves_reply(db, openai_stub):
+    c = TestClient(_app(db))
+    r = c.post("/api/ai/chat/stream", json={"message": 'Explain "house"'},
+               headers={"x_session_id": "s1", "X-AI-Cache": "bypass"})
+    assert r.status_code == 200
+    assert "event: done" in r.text
+    assert _in_use() == 0
+    assert llm.stats()["async"]["initialized"] and "chat" in llm.stats()["async"]["endpoints"]
+    last = _messages(db, "s1")[-1]
+    assert last["role"] == "assistant" and "partial" not in last
+
+def test_body_never_started_holds_no_slot(db, openai_stub):
+    async def main():
+        resp = await _open(db, "s2")
+        assert _in_use() == 0
+        await resp.body_iterator.aclose()
+        assert _in_use() == 0
+    anyio.run(main)
+
+def test_disconnect_mid_stream_saves_partial_and_releases(db, openai_stub):
+    async def main():
+        resp = await _open(db, "s3")
+        got = []
+
+        async def consume():
+            async for frame in resp.body_iterator:
+                got.append(frame)
+
+        # what Starlette does when the client goes away: cancel the body task
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(consume)
+            while len(got) < 2:
+                await anyio.sleep(0.005)
+            assert _in_use() == 1
+            tg.cancel_scope.cancel()
+        assert _in_use() == 0
+
+    anyio.run(main)
+    last = _messages(db, "s3")[-1]
+    assert last["role"] == "assistant" and last["partial"] is True and last["content"]
+
+def test_provider_error_is_sent_as_event_and_releases(db, monkeypatch, openai_stub):
+    monkeypatch.setenv("OPENAI_BASE_URL", "http://127.0.0.1:1/v1")
+    monkeypatch.setattr(llm, "MAX_RETRIES", 0)
+    c = TestClient(_app(db))
+    r = c.post("/api/ai/chat/stream", json={"message": "x"},
+               headers={"x_session_id": "s4", "X-AI-Cache": "bypass"})
+    assert "event: error" in r.text
+    assert _in_use() == 0
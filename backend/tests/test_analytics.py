@@ -0,0 +1,132 @@
+# backend/tests/test_analytics.py
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import analytics
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.state.db = db
+    app.include_router(analytics.router, prefix="/api")
+    return TestClient(app)
+
+def test_batch_skips_items_that_are_not_objects(client, db):
+    r = client.post("/api/analytics/events", headers={"x-session-id": "s1"},
+                    json=[{"kind": "page_view"}, "oops", 3, {"type": "word_searched", "meta": {"query": "x"}}])
+    assert r.status_code == 200
+    assert r.json() == {"ok": True, "accepted": 2, "skipped": 2}
+    assert db.events.count_documents({"sessionId": "s1"}) == 2
+
+def test_batch_envelope_and_bad_body(client):
+    assert client.post("/api/analytics/events", json={"events": [{"kind": "page_view"}]}).json()["accepted"] == 1
+    assert client.post("/api/analytics/events", json="nope").status_code == 422
+
+def _store(db, events):
+    from app.rollups import ROLLUP_COLL, rollup_ops
+    db.events.insert_many(events)
+    # same updates apply_rollups sends, one at a time
+    for op in rollup_ops(events):
+        db[ROLLUP_COLL].update_one(op._filter, op._doc, upsert=op._upsert)
+
+def test_rollup_and_events_summaries_match(db):
+    from datetime import timedelta
+    from app.events import make_event, utcnow
+
+    now = utcnow()
+    terms = ["zebra", "mango", "house", "apple", "house", "kiwi"]
+    events = [make_event("s1", "dictionary_search", {"term": t}, now - timedelta(hours=30 - i))
+              for i, t in enumerate(terms)]
+    events += [
+        make_event("s1", "word_learned", {"word": "house"}, now - timedelta(days=1)),
+        make_event("s1", "word_learned", {"word": "house"}, now),
+        make_event("s1", "quiz_completed", {"accuracy": 60}, now),
+        make_event("s1", "quiz_completed", {"accuracy": 75}, now - timedelta(days=2)),
+        make_event("s1", "time_spent", {"seconds": 300}, now),
+        make_event("s1", "grammar_studied", {"topic": "present simple"}, now),
+        make_event("s1", "word_lookup", {"word": "house"}, now),  # server kind: not counted
+    ]
+    _store(db, events)
+
+    by_events = analytics.summarize(db, "s1", 30, "events")
+    by_rollup = analytics.summarize(db, "s1", 30, "rollup")
+    assert by_rollup == by_events
+    looked_up = next(r for r in by_events["recommendations"] if r["type"] == "Words you looked up a lot")
+    assert looked_up["items"] == ["house", "zebra", "mango"]  # ties keep first-seen order
+    assert by_events["stats"]["quizzesCompleted"] == 2 and by_events["stats"]["wordsLearned"] == 1
+
+def _baseline_top(events):
+    # the original get_summary: count in event order, stable sort on -count
+    counts = {}
+    for e in sorted(events, key=lambda e: e["ts"]):
+        if e["kind"] == "dictionary_search":
+            term = (e["payload"].get("term") or "").strip().lower()
+            if term:
+                counts[term] = counts.get(term, 0) + 1
+    return [w for w, _ in sorted(counts.items(), key=lambda x: -x[1])[:3]]
+
+def test_pipeline_matches_baseline_on_ties_and_non_ascii(mongo_db):
+    from datetime import timedelta
+    from app.events import make_event, utcnow
+    from app.rollups import apply_rollups
+
+    now = utcnow()
+    terms = ["  Ökonomie ", "zebra", "\u00a0Caano\u00a0", "ÖKONOMIE", "İstanbul", "zebra",
+             "caano", "\u2003", "apple", "İSTANBUL"]
+    events = [make_event("s1", "dictionary_search", {"term": t}, now - timedelta(hours=30 - i))
+              for i, t in enumerate(terms)]
+    events += [make_event("s1", "word_learned", {"word": w}, now) for w in ("Hüis", " Hüis\u00a0", "bar")]
+    mongo_db.events.insert_many([dict(e) for e in events])
+    apply_rollups(mongo_db, events)
+
+    expected = _baseline_top(events)
+    by_events = analytics.summarize(mongo_db, "s1", 30, "events")
+    for source in ("pipeline", "rollup"):
+        got = analytics.summarize(mongo_db, "s1", 30, source)
+        looked_up = next(r for r in got["recommendations"] if r["type"] == "Words you looked up a lot")
+        assert looked_up["items"] == expected, source
+        assert got["stats"] == by_events["stats"], source
+
+def test_rollup_summary_bounds_the_first_day(db):
+    from datetime import timedelta
+    from app.events import make_event, utcnow
+
+    now = utcnow()
+    since = now - timedelta(days=2)
+    events = [
+        make_event("s1", "dictionary_search", {"term": "early"}, since - timedelta(seconds=1)),
+        make_event("s1", "dictionary_search", {"term": "inside"}, since + timedelta(seconds=1)),
+        make_event("s1", "dictionary_search", {"term": "today"}, now),
+    ]
+    _store(db, events)
+
+    by_rollup = analytics.summarize(db, "s1", 2, "rollup")
+    assert by_rollup["stats"]["wordsSearched"] == 2  # "early" is before the window, same day or not
+    assert by_rollup == analytics.summarize(db, "s1", 2, "events")
+
+def test_rebuild_rollups_swaps_in_full_range(mongo_db, monkeypatch):
+    import rebuild_session_rollups
+    from datetime import timedelta
+    from app.events import make_event, utcnow
+    from app.rollups import ROLLUP_COLL
+
+    old = utcnow() - timedelta(days=200)  # past EVENT_RETENTION_DAYS, never archived
+    mongo_db.events.insert_many([
+        make_event("s1", "dictionary_search", {"term": "old"}, old),
+        make_event("s1", "dictionary_search", {"term": "new"}, utcnow()),
+    ])
+    # drifted live counter and an archived-only day that must survive
+    mongo_db[ROLLUP_COLL].insert_many([
+        {"sessionId": "s1", "day": old.date().isoformat(), "events": 99},
+        {"sessionId": "s1", "day": (old - timedelta(days=10)).date().isoformat(), "events": 3},
+    ])
+    host, port = mongo_db.client.address
+    monkeypatch.setattr("sys.argv", ["x", "--drop", "--uri", f"mongodb://{host}:{port}", "--db", mongo_db.name])
+    rebuild_session_rollups.main()
+
+    days = {d["day"]: d["events"] for d in mongo_db[ROLLUP_COLL].find({"sessionId": "s1"})}
+    assert days[old.date().isoformat()] == 1
+    assert days[(old - timedelta(days=10)).date().isoformat()] == 3
+    assert sum(days.values()) == 5
+    assert analytics.summarize(mongo_db, "s1", 365, "rollup")["stats"]["wordsSearched"] == 2
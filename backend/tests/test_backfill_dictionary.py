@@ -0,0 +1,42 @@
+# backend/tests/test_backfill_dictionary.py
+import pytest
+from bson import ObjectId
+
+import backfill_dictionary as bf
+from app.loaders.dictionary import DICT_COLL, build_indexes, derived_fields, reindex
+from app.routers.dictionary import WordOut, _doc_to_out
+
+def test_ai_text_never_becomes_a_lookup_key(db):
+    row = {"Headword": "river", "Meaning": "a large stream of water"}
+    db[DICT_COLL].insert_one({**row, **derived_fields(row)})
+    doc = db[DICT_COLL].find_one()
+    base = _doc_to_out(doc, "en-so")
+    bf._write_entry(db[DICT_COLL], doc, base, WordOut(**{**base.model_dump(), "somaliTranslation": "webi"}))
+
+    doc = db[DICT_COLL].find_one()
+    assert doc["somali"] == "webi" and doc["aiFilled"] == ["somali"]
+    assert doc["key_so"] == [] and doc["key_en"] == ["river"]
+    assert "webi" in doc["text"]["somali"]  # still searchable
+    assert derived_fields(doc)["key_so"] == []  # and a --reindex keeps it that way
+    prefix, _ = build_indexes(db[DICT_COLL])
+    assert len(prefix["so-en"]) == 0
+
+@pytest.mark.parametrize("last_id", [ObjectId(), "abandon", 42])
+def test_checkpoint_keeps_the_id_type(tmp_path, last_id):
+    path = str(tmp_path / "cp.json")
+    bf._save_checkpoint(path, last_id, {"scanned": 1})
+    assert bf._load_checkpoint(path) == last_id
+    assert type(bf._load_checkpoint(path)) is type(last_id)
+
+def test_resume_covers_later_id_types(db):
+    db.c.insert_many([{"_id": 1}, {"_id": 2}, {"_id": "a"}, {"_id": "b"}, {"_id": ObjectId()}])
+    assert [d["_id"] for d in db.c.find(bf._resume_query(1)).sort("_id", 1)][:3] == [2, "a", "b"]
+    assert len(list(db.c.find(bf._resume_query("a")))) == 2
+    with pytest.raises(SystemExit):
+        bf._resume_query(1.5j)
+
+def test_old_checkpoints_still_load(tmp_path):
+    path = tmp_path / "cp.json"
+    oid = ObjectId()
+    path.write_text('{"last_id": "%s", "stats": {}}' % oid)
+    assert bf._load_checkpoint(str(path)) == oid
@@ -0,0 +1,82 @@
+# backend/tests/test_dictionary_lookup.py
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import http_cache
+from app.loaders.dictionary import DICT_COLL, derived_fields
+from app.loaders.state import refresh_dictionary
+from app.routers import dictionary
+
+FULL = {"Headword": "house", "Somali": "guri", "PartOfSpeech": "noun", "Pronunciation": "/haʊs/",
+        "WordForms": "houses", "Phrase": "full house", "UsageNote": "common", "Meaning": "a building to live in",
+        "Examples": ["This is my house."]}
+PARTIAL = {"Headword": "river", "Somali": "webi", "Meaning": "a large stream of water"}
+
+@pytest.fixture
+def client(db, monkeypatch):
+    for doc in (FULL, PARTIAL):
+        db[DICT_COLL].insert_one({**doc, **derived_fields(doc)})
+    db.meta.insert_one({"_id": "dictionary", "version": "v1"})
+    refresh_dictionary(db, force=True)
+    for cache in (http_cache._store, dictionary._misses, dictionary._backfill_failed):
+        cache.clear()
+    dictionary._inflight.clear()
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
+    app = FastAPI()
+    app.state.db = db
+    app.include_router(dictionary.router, prefix="/api")
+    return TestClient(app)
+
+def _lookup(client, term):
+    return client.get("/api/dictionary/lookup", params={"term": term, "dir": "en-so"})
+
+def test_exact_hit_is_cached_and_revalidates(client):
+    r = _lookup(client, "  House ")
+    assert r.status_code == 200 and r.json()["word"] == "house"
+    assert http_cache.stats()["size"] == 1
+    r2 = client.get("/api/dictionary/lookup", params={"term": "house"},
+                    headers={"If-None-Match": r.headers["etag"]})
+    assert r2.status_code == 304
+
+def test_fuzzy_match_is_flagged(client):
+    r = _lookup(client, "hause")
+    assert r.status_code == 200
+    assert r.json()["word"] == "house" and r.json()["fuzzy"] is True
+
+def test_miss_is_remembered(client):
+    assert _lookup(client, "qqqzzz").status_code == 404
+    assert dictionary._misses.get((dictionary.norm_key("qqqzzz"), "en-so"), False)
+    assert _lookup(client, "qqqzzz").status_code == 404
+
+def test_incomplete_entry_without_provider_is_not_pending(client):
+    r = _lookup(client, "river")
+    assert r.status_code == 200
+    assert r.json()["pending"] is False
+    assert "no-store" not in r.headers.get("cache-control", "")
+    assert not dictionary._inflight
+
+def test_failed_backfill_is_not_retried(client, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    calls = []
+
+    def failing(db, key, term, direction, base):
+        calls.append(term)
+        raise RuntimeError("provider down")
+
+    monkeypatch.setattr(dictionary, "_run_backfill", failing)
+    monkeypatch.setattr(dictionary.llm, "submit", lambda coro: coro.close())  # use the pool path
+    r = _lookup(client, "river")
+    assert r.json()["pending"] is True
+    assert r.headers["cache-control"] == "no-store"
+    deadline = time.monotonic() + 5
+    while not dictionary._backfill_failed.get(("river", "en-so"), False):  # job runs on the pool
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    r = _lookup(client, "river")
+    assert r.json()["pending"] is False
+    assert calls == ["river"]
@@ -0,0 +1,43 @@
+# backend/tests/test_event_buffer.py
+from app.events import EventBuffer, make_event
+
+def _buffer(db, seen):
+    buf = EventBuffer(batch_size=10)
+    buf._get_db = lambda: db
+    buf.on_write(lambda _db, docs: seen.extend(d["_id"] for d in docs))
+    return buf
+
+def test_hooks_run_on_the_whole_batch(db):
+    seen = []
+    buf = _buffer(db, seen)
+    docs = [dict(make_event("s", "quiz_completed"), _id=i) for i in range(3)]
+    assert buf._write(docs) == 3
+    assert seen == [0, 1, 2]
+
+def test_partial_insert_runs_hooks_on_stored_docs(db):
+    db.events.insert_one({"_id": 1})
+    seen = []
+    buf = _buffer(db, seen)
+    docs = [dict(make_event("s", "quiz_completed"), _id=i) for i in range(3)]
+    assert buf._write(docs) == 2
+    assert seen == [0, 2]
+    assert buf.stats()["failed"] == 1 and buf.stats()["written"] == 2
+
+def test_failed_write_runs_no_hooks(db):
+    seen = []
+    buf = _buffer(None, seen)
+    assert buf._write([make_event("s", "quiz_completed")]) == 0
+    assert seen == [] and buf.failed == 1
+
+def test_emit_many_writes_through_once(db, monkeypatch):
+    seen, calls = [], []
+    buf = _buffer(db, seen)
+    buf.on_write(lambda _db, docs: calls.append(len(docs)))
+    inserts = []
+    real = type(db.events).insert_many
+    monkeypatch.setattr(type(db.events), "insert_many",
+                        lambda self, docs, **kw: inserts.append(len(docs)) or real(self, docs, **kw))
+    docs = [dict(make_event("s", "word_lookup"), _id=i) for i in range(4)]
+    assert buf.emit_many(db, docs) == 4
+    assert inserts == [4] and calls == [4] and seen == [0, 1, 2, 3]
+    assert db.events.count_documents({}) == 4
@@ -0,0 +1,29 @@
+# backend/tests/test_grammar_cache.py
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import http_cache
+from app.loaders.state import refresh_content_versions
+from app.routers import grammar
+
+def test_reimport_turns_over_cached_topics(db):
+    http_cache._store.clear()
+    db.grammar_topics.insert_one({"slug": "present-simple", "order": 1})
+    db.meta.insert_one({"_id": "grammar", "version": "v1"})
+    refresh_content_versions(db)
+    app = FastAPI()
+    app.state.db = db
+    app.include_router(grammar.router, prefix="/api")
+    client = TestClient(app)
+
+    first = client.get("/api/grammar/topics")
+    assert [t["slug"] for t in first.json()["topics"]] == ["present-simple"]
+
+    # re-import: new content, new stamp
+    db.grammar_topics.insert_one({"slug": "past-simple", "order": 2})
+    assert len(client.get("/api/grammar/topics").json()["topics"]) == 1  # cached until the refresher runs
+    db.meta.update_one({"_id": "grammar"}, {"$set": {"version": "v2"}})
+    refresh_content_versions(db)
+    second = client.get("/api/grammar/topics", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert [t["slug"] for t in second.json()["topics"]] == ["present-simple", "past-simple"]
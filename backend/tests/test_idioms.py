@@ -0,0 +1,35 @@
+# backend/tests/test_idioms.py
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import idioms
+
+class _Blank:
+    """Async client whose completions come back as whitespace / an empty fence."""
+    def __init__(self, content):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self._content = content
+
+    async def _create(self, **kwargs):
+        self.calls += 1
+        msg = SimpleNamespace(content=self._content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=msg)])
+
+def test_blank_explanation_is_never_stored(db, monkeypatch):
+    idioms._explained.clear()
+    app = FastAPI()
+    app.state.db = db
+    app.include_router(idioms.router, prefix="/api")
+    client = TestClient(app)
+
+    for content in ("  \n ", "```markdown\n  \n```"):
+        fake = _Blank(content)
+        monkeypatch.setattr(idioms, "_get_async_client", lambda name: fake)
+        for _ in range(2):
+            r = client.get("/api/idioms/explain", params={"idiom": "break a leg"})
+            assert r.status_code == 500 and r.headers.get("X-AI-Cache") != "hit"
+        assert fake.calls == 2  # retried, not served from a cached blank
+    assert db[idioms.EXPLAIN_COLL].count_documents({}) == 0
@@ -0,0 +1,44 @@
+# backend/tests/test_indexes.py
+from app.indexes import index_report
+from app.loaders.dictionary import DICT_COLL, derived_fields, reindex, unkeyed_count
+
+def test_unkeyed_dictionary_docs_are_reported(db):
+    keyed = {"Headword": "house", "Somali": "guri"}
+    db[DICT_COLL].insert_one({**keyed, **derived_fields(keyed)})
+    db[DICT_COLL].insert_one({"Headword": "river", "Somali": "webi"})  # legacy import
+    assert unkeyed_count(db[DICT_COLL]) == 1
+    assert "1 docs without key_en/key_so" in index_report(db)[DICT_COLL]["unkeyed"][0]
+
+class _BulkResult:
+    def __init__(self, n):
+        self.modified_count = n
+
+def _bulk_write(self, ops, ordered=True):
+    # mongomock's bulk_write predates pymongo's UpdateOne signature; apply the same updates
+    for op in ops:
+        self.update_one(op._filter, op._doc)
+    return _BulkResult(len(ops))
+
+def test_reindex_clears_the_warning(db, monkeypatch):
+    db[DICT_COLL].insert_one({"Headword": "river", "Somali": "webi"})
+    monkeypatch.setattr(type(db[DICT_COLL]), "bulk_write", _bulk_write)
+    reindex(db[DICT_COLL])
+    assert unkeyed_count(db[DICT_COLL]) == 0
+    assert index_report(db)[DICT_COLL]["unkeyed"] == []
+
+def test_duplicates_block_unique_index_until_deduped(db):
+    from app.indexes import dedupe
+    db.tests.insert_many([{"kind": "placement", "v": 1}, {"kind": "placement", "v": 2}, {"kind": "final"}])
+    assert index_report(db)["tests"]["duplicates"] == ["kind:1: 1 values repeated; run manage_indexes.py --dedupe"]
+    assert dedupe(db, "tests", [("kind", 1)]) == 1
+    assert db.tests.find_one({"kind": "placement"})["v"] == 2  # newest kept
+    assert index_report(db)["tests"]["duplicates"] == []
+
+def test_hot_queries_use_indexes(mongo_db):
+    from app.indexes import INDEXES, ensure_indexes, explain_hot_queries
+    assert ensure_indexes(mongo_db) == []
+    for name in INDEXES:  # a query on a collection that doesn't exist plans as EOF
+        if name not in mongo_db.list_collection_names():
+            mongo_db.create_collection(name)
+    scans = [(name, list(flt), stages) for name, flt, indexed, stages in explain_hot_queries(mongo_db) if not indexed]
+    assert scans == []
@@ -0,0 +1,29 @@
+# backend/tests/test_recent_searches.py
+from datetime import timedelta
+
+from app.events import make_event, utcnow
+from app.recent_searches import RECENT_CAP, apply_recent, load_recent, recent_ops
+
+def _lookups(sid, words, start, batch=False):
+    return [make_event(sid, "word_lookup", {"word": w, "batch": batch}, start + timedelta(seconds=i))
+            for i, w in enumerate(words)]
+
+def test_one_op_per_session_newest_first():
+    now = utcnow()
+    events = _lookups("s1", ["house", "River", "HOUSE"], now) + _lookups("s2", ["kiwi"], now)
+    events += _lookups("s1", ["ignored"], now, batch=True)
+    events.append(make_event("s1", "dictionary_search", {"term": "client"}, now))
+    ops = {op._filter["_id"]: op for op in recent_ops(events)}
+    assert set(ops) == {"s1", "s2"}
+    fresh = ops["s1"]._doc[0]["$set"]["terms"]["$slice"][0]["$concatArrays"][0]
+    assert fresh == ["HOUSE", "River"]
+
+def test_flushes_merge_into_capped_list(mongo_db):
+    now = utcnow()
+    apply_recent(mongo_db, _lookups("s1", ["house", "river"], now))
+    apply_recent(mongo_db, _lookups("s1", ["kiwi", "House"], now + timedelta(minutes=1)))
+    assert load_recent(mongo_db, "s1", 10) == ["House", "kiwi", "river"]
+
+    apply_recent(mongo_db, _lookups("s1", [f"w{i}" for i in range(RECENT_CAP + 5)], now + timedelta(minutes=2)))
+    terms = load_recent(mongo_db, "s1", RECENT_CAP + 10)
+    assert len(terms) == RECENT_CAP and terms[0] == f"w{RECENT_CAP + 4}"
@@ -0,0 +1,55 @@
+# backend/tests/test_term_stats.py
+from app.events import EventBuffer, make_event
+from app.term_stats import term_stat_ops
+
+def _lookup(i, word, found=True):
+    return dict(make_event("s", "word_lookup", {"word": word, "dir": "en-so", "found": found}), _id=i)
+
+def test_counters_follow_the_stored_events_of_a_partial_batch(db):
+    db.events.insert_one({"_id": 2})  # makes one insert in the batch fail
+    ops = []
+    buf = EventBuffer()
+    buf._get_db = lambda: db
+    buf.on_write(lambda _db, docs: ops.extend(term_stat_ops(docs)))
+
+    batch = [_lookup(0, "House"), _lookup(1, "house ", found=False), _lookup(2, "house"), _lookup(3, "tree")]
+    assert buf._write(batch) == 3
+
+    inc = {op._filter["term"]: op._doc["$inc"] for op in ops}
+    stored = db.events.count_documents({"kind": "word_lookup"})
+    assert sum(v["lookups"] for v in inc.values()) == stored == 3
+    assert inc["house"] == {"lookups": 2, "misses": 1}
+
+class _Down:
+    def insert_many(self, docs, ordered=True):
+        raise TimeoutError("connection lost mid-write")
+
+def test_unknown_outcome_is_counted():
+    buf = EventBuffer()
+    buf._get_db = lambda: {"events": _Down()}
+    buf._write([_lookup(0, "house")])
+    assert buf.stats()["hookSkipped"] == 1
+
+def test_batch_lookups_and_other_kinds_are_ignored():
+    events = [dict(_lookup(0, "house"), payload={"word": "house", "batch": True}),
+              make_event("s", "quiz_completed", {"word": "house"})]
+    assert term_stat_ops(events) == []
+
+def test_rebuild_swaps_in_recomputed_counters(mongo_db, monkeypatch):
+    import rebuild_term_stats
+    from app.events import make_event
+    from app.term_stats import TERM_STATS_COLL
+
+    mongo_db.events.insert_many([
+        make_event("s1", "word_lookup", {"word": "House", "dir": "en-so", "found": True}),
+        make_event("s1", "word_lookup", {"word": "house", "dir": "en-so", "found": False}),
+        make_event("s1", "word_lookup", {"word": "kiwi", "dir": "en-so", "batch": True}),
+    ])
+    mongo_db[TERM_STATS_COLL].insert_one({"term": "house", "dir": "en-so", "lookups": 99, "misses": 0})
+    host, port = mongo_db.client.address
+    monkeypatch.setattr("sys.argv", ["x", "--uri", f"mongodb://{host}:{port}", "--db", mongo_db.name])
+    rebuild_term_stats.main()
+
+    docs = list(mongo_db[TERM_STATS_COLL].find({}, {"_id": 0, "term": 1, "lookups": 1, "misses": 1}))
+    assert docs == [{"term": "house", "lookups": 2, "misses": 1}]
+    assert "term_stats_rebuild" not in mongo_db.list_collection_names()
@@ -2,6 +2,7 @@
 import os
 import sys
 import re
+from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
@@ -459,6 +460,8 @@ def main():
     load_vocab_tests(db)
     load_idiom_tests(db)
     load_english_test(db)
+    # new version stamp: the API's /tests response cache turns over (app/loaders/state.py)
+    db.meta.update_one({"_id": "tests"}, {"$set": {"version": datetime.utcnow().isoformat()}}, upsert=True)
     print("Done.")
 
 
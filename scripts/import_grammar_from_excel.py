@@ -1,6 +1,7 @@
 # scripts/import_grammar_from_excel.py
 # Python 3.9+, pandas + openpyxl + pymongo
 import argparse, re, unicodedata
+from datetime import datetime
 import pandas as pd
 from pymongo import MongoClient
 
@@ -123,6 +124,8 @@ def main():
         db.grammar_topics.insert_many(topics)
     if questions:
         db.grammar_questions.insert_many(questions)
+    # new version stamp: the API's grammar response cache turns over
+    db.meta.update_one({"_id": "grammar"}, {"$set": {"version": datetime.utcnow().isoformat()}}, upsert=True)
 
     print(f"Imported topics: {len(topics)}, questions: {len(questions)}")
 